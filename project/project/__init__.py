@@ -1,7 +1,8 @@
 """Snake package."""
 from .dir import Dir
+from .engine import Engine, EngineState
 from .fruit import Fruit
 from .snake import Snake
 from .tile import Tile
 
-__all__ = ["Dir", "Fruit", "Snake", "Tile"]
+__all__ = ["Dir", "Engine", "EngineState", "Fruit", "Snake", "Tile"]
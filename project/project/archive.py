@@ -0,0 +1,190 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import typing
+
+# First party
+from .exceptions import ReplayError, SnakeError
+from .replay import Replay, iter_replays
+
+# An archive is made of two append-only files: the replays, concatenated, and
+# an index with one fixed-width entry per replay.
+INDEX_SUFFIX = ".idx"
+INDEX_ENTRY = struct.Struct("<QIQiI") # offset, length, seed, score, ticks
+
+class IndexEntry(typing.NamedTuple):
+    """Where a replay is in the archive, with its main results."""
+
+    offset: int
+    length: int
+    seed: int
+    score: int
+    ticks: int
+
+class ReplayArchive:
+    """Writer appending replays to an archive."""
+
+    def __init__(self, filename: str) -> None:
+        """Open an archive for writing, creating it if needed."""
+        self._data = open(filename, "ab") # noqa: SIM115
+        self._index = open(filename + INDEX_SUFFIX, "ab") # noqa: SIM115
+
+    def __enter__(self) -> typing.Self:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Exit context."""
+        self.close()
+
+    def append(self, replay: Replay) -> None:
+        """Append a replay."""
+        self.append_bytes(replay.to_bytes(), seed = replay.seed,
+                          score = replay.score, ticks = replay.ticks)
+
+    def append_bytes(self, data: bytes, *, seed: int, score: int,
+                     ticks: int) -> None:
+        """Append an already encoded replay."""
+        offset = self._data.tell()
+        self._data.write(data)
+        self._index.write(INDEX_ENTRY.pack(offset, len(data), seed, score,
+                                           ticks))
+
+    def flush(self) -> None:
+        """Write buffered replays to disk."""
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        """Close the archive."""
+        self._data.close()
+        self._index.close()
+
+class ArchiveReader:
+    """
+    Read-only access to an archive, memory-mapped.
+
+    Any replay is reached through the index without reading the others, and
+    queries on results only read the index.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Open an archive for reading."""
+        self._data = self._map(filename)
+        self._index = self._map(filename + INDEX_SUFFIX)
+        if len(self._index) % INDEX_ENTRY.size:
+            msg = f"Corrupted archive index {filename}{INDEX_SUFFIX}."
+            raise ReplayError(msg)
+
+    @staticmethod
+    def _map(filename: str) -> mmap.mmap | bytes:
+        """Map a whole file in memory (empty files cannot be mapped)."""
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+    def __enter__(self) -> typing.Self:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Exit context."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the files."""
+        for m in (self._data, self._index):
+            if isinstance(m, mmap.mmap):
+                m.close()
+
+    def __len__(self) -> int:
+        """Number of replays."""
+        return len(self._index) // INDEX_ENTRY.size
+
+    def entry(self, i: int) -> IndexEntry:
+        """Index entry of a replay."""
+        if not 0 <= i < len(self):
+            msg = f"No replay {i} in the archive."
+            raise IndexError(msg)
+        return IndexEntry._make(INDEX_ENTRY.unpack_from(self._index,
+                                                        i * INDEX_ENTRY.size))
+
+    def entries(self) -> typing.Iterator[IndexEntry]:
+        """Iterate over all index entries."""
+        return map(IndexEntry._make, INDEX_ENTRY.iter_unpack(self._index))
+
+    def raw(self, i: int) -> memoryview:
+        """Encoded replay, as a view on the mapped file (no copy)."""
+        e = self.entry(i)
+        return memoryview(self._data)[e.offset:e.offset + e.length]
+
+    def replay(self, i: int) -> Replay:
+        """Decode a replay."""
+        return Replay.from_bytes(self.raw(i))
+
+    def top(self, k: int) -> list[int]:
+        """Indexes of the k replays with the best scores, best first."""
+        return [i for _, i in heapq.nlargest(
+            k, ((e.score, i) for i, e in enumerate(self.entries())))]
+
+    def select(self, predicate: typing.Callable[[IndexEntry], bool],
+               ) -> list[int]:
+        """Indexes of the replays whose index entry matches a predicate."""
+        return [i for i, e in enumerate(self.entries()) if predicate(e)]
+
+def main() -> None:
+    """Entry point of snake-archive."""
+    parser = argparse.ArgumentParser(
+            description = "Build and query archives of Snake replays.")
+    sub = parser.add_subparsers(dest = "command", required = True)
+    add = sub.add_parser("add", help="Append replay files to an archive.")
+    add.add_argument("archive")
+    add.add_argument("files", nargs = "+")
+    top = sub.add_parser("top", help="List the best games.")
+    top.add_argument("archive")
+    top.add_argument("-k", type = int, default = 100)
+    short = sub.add_parser("short", help="List the games shorter than a"
+                           " number of ticks.")
+    short.add_argument("archive")
+    short.add_argument("ticks", type = int)
+    check = sub.add_parser("check", help="Play a game again and check it.")
+    check.add_argument("archive")
+    check.add_argument("index", type = int)
+    args = parser.parse_args()
+
+    try:
+        match args.command:
+            case "add":
+                with ReplayArchive(args.archive) as archive:
+                    for filename in args.files:
+                        with open(filename, "rb") as f:
+                            for replay in iter_replays(f.read()):
+                                archive.append(replay)
+            case "top" | "short":
+                with ArchiveReader(args.archive) as reader:
+                    indexes = (reader.top(args.k) if args.command == "top"
+                               else reader.select(
+                                   lambda e: e.ticks < args.ticks))
+                    for i in indexes:
+                        e = reader.entry(i)
+                        print(f"{i} seed={e.seed} score={e.score}"
+                              f" ticks={e.ticks}")
+            case "check":
+                with ArchiveReader(args.archive) as reader:
+                    replay = reader.replay(args.index)
+                    state = replay.play()
+                    ok = (state.score == replay.score
+                          and state.tick == replay.ticks)
+                    print(f"{args.index} seed={replay.seed} ticks={state.tick}"
+                          f" score={state.score} {'OK' if ok else 'MISMATCH'}")
+                    if not ok:
+                        raise SystemExit(1)
+    except (OSError, IndexError, SnakeError) as e:
+        print(f"Error: {e}")
+        raise SystemExit(1) from e
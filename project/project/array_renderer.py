@@ -0,0 +1,101 @@
+# ruff: noqa: D100,S311
+
+# Third party
+import numpy as np
+import pygame
+
+# First party
+from .board import Board
+from .camera import Camera
+
+# Maximum number of distinct colors on the board
+MAX_COLORS = 256
+
+class ArrayRenderer:
+    """
+    Draw the board from a grid of color indexes.
+
+    The grid, of shape (view_cols, view_lines), holds the cells in the view
+    of the camera. It is updated with the cells changed since the last frame,
+    written to a surface of one pixel per cell and scaled to the tile size in
+    a single call. Drawing cost hardly depends on the number of occupied
+    cells, and not at all on the size of the board. The grid is filled again
+    when the camera moves.
+    """
+
+    def __init__(self, board: Board, screen: pygame.Surface,
+                 tile_size: int, camera: Camera | None = None) -> None:
+        """Object initialization. Without camera, the whole board is drawn."""
+        self._board = board
+        board.track_changes = True # The grid is updated from the changes
+        self._screen = screen
+        if camera is None:
+            camera = Camera(board.nb_cols, board.nb_lines, board.nb_cols,
+                            board.nb_lines)
+        self._camera = camera
+        view = (camera.view_cols, camera.view_lines)
+        self._size = (view[0] * tile_size, view[1] * tile_size)
+        self._palette: list[tuple[int, int, int]] = []
+        self._palette_index: dict[tuple[int, int, int], int] = {}
+        self._colors: np.ndarray | None = None # Palette as an array
+
+        # Background color of each cell of the view, black if there is no
+        # background, and current color of each cell
+        self._black = self._color_index(pygame.Color("black"))
+        self._background = np.empty(view, dtype = np.uint8)
+        self._grid = np.empty(view, dtype = np.uint8)
+        self._origin: tuple[int, int] | None = None # View in the grid
+
+        self._small = pygame.Surface(view, 0, 32)
+
+    def _color_index(self, color: pygame.Color) -> int:
+        """Get the palette index of a color, adding it if needed."""
+        rgb = tuple(pygame.Color(color))[:3]
+        i = self._palette_index.get(rgb)
+        if i is None:
+            if len(self._palette) >= MAX_COLORS:
+                msg = f"Cannot draw more than {MAX_COLORS} colors."
+                raise ValueError(msg)
+            i = len(self._palette)
+            self._palette.append(rgb)
+            self._palette_index[rgb] = i
+            self._colors = None
+        return i
+
+    def _fill(self) -> None:
+        """Fill the grid with the cells in the view of the camera."""
+        x0, y0, x1, y1 = area = self._camera.area
+        self._background.fill(self._black)
+        for obj in self._board.objects:
+            if obj.is_background():
+                for tile in obj.tiles_in(*area):
+                    self._background[tile.x - x0, tile.y - y0] = \
+                        self._color_index(tile.color)
+        self._grid[:] = self._background
+        for tile in self._board.tiles_in(x0, y0, x1, y1):
+            self._grid[tile.x - x0, tile.y - y0] = \
+                self._color_index(tile.color)
+        self._origin = (x0, y0)
+
+    def draw(self) -> None:
+        """Draw the view of the board on screen."""
+        # Apply the cells changed since the last frame, or fill the grid
+        # again if the view moved
+        changes = self._board.take_changes()
+        if self._camera.origin != self._origin:
+            self._fill()
+        else:
+            nb_cols = self._board.nb_cols
+            x0, y0 = self._origin
+            for cell, tile in changes.items():
+                y, x = divmod(cell, nb_cols)
+                if self._camera.contains(x, y):
+                    x, y = x - x0, y - y0
+                    self._grid[x, y] = (self._background[x, y] if tile is None
+                                        else self._color_index(tile.color))
+
+        # Turn color indexes into pixels, then scale cells to tiles
+        if self._colors is None:
+            self._colors = np.array(self._palette, dtype = np.uint8)
+        pygame.surfarray.blit_array(self._small, self._colors[self._grid])
+        pygame.transform.scale(self._small, self._size, self._screen)
@@ -0,0 +1,387 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import timeit
+import typing
+
+# Third party
+import pygame
+
+# First party
+from .board import Board
+from .checkerboard import Checkerboard
+from .camera import Camera
+from .cmd_line import (
+    DEFAULT_HEIGHT,
+    DEFAULT_VIEW_HEIGHT,
+    DEFAULT_VIEW_WIDTH,
+    DEFAULT_WIDTH,
+    MIN_HEIGHT,
+    MIN_TILE_SIZE,
+    MIN_WIDTH,
+)
+from .dir import Dir
+from .engine import Engine
+from .exceptions import IntRangeError, SnakeError
+from .fruit import Fruit
+from .score import Score
+from .scores import Scores
+from .simulation import greedy_agent, play_game
+from .snake import DEF_BODY_COLOR, DEF_HEAD_COLOR, SK_START_LENGTH, Snake
+from .tile import Tile
+
+# Benchmark constants
+BOARD_SIZES = ((MIN_WIDTH, MIN_HEIGHT), (DEFAULT_WIDTH, DEFAULT_HEIGHT),
+               (100, 100), (1000, 1000))
+MAX_SNAKE_LENGTH = 100 * 100 - 1 # Longest snake, for huge boards to fit
+SCORE_COUNTS = (10, 1000, 10000) # Number of players in the score files
+SCORE_EXTENSIONS = (".yaml", ".json", ".db")
+GAME_TICKS = 2000 # Length of the games of the macro benchmark
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1 # Slowdown flagged as a regression
+
+# A case gives the function to time, and the number of operations per call
+Setup = typing.Callable[[], tuple[typing.Callable[[], object], int]]
+
+@dataclasses.dataclass(frozen = True)
+class Case:
+    """One benchmark: an operation, timed with some parameters."""
+
+    name: str
+    params: dict[str, typing.Any]
+    setup: Setup
+
+    @property
+    def key(self) -> str:
+        """Unique name of the case in the results."""
+        params = ",".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.name}[{params}]"
+
+def cycle_cells(width: int, height: int) -> typing.Iterator[tuple[int, int]]:
+    """
+    Cells of a cycle going once through every cell of the board.
+
+    Goes right along the first line, zigzags through the other lines
+    without the first column, and comes back up through the first column.
+    The height must be even for the zigzag to end next to the first column.
+    """
+    yield from ((x, 0) for x in range(width))
+    for y in range(1, height):
+        xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        yield from ((x, y) for x in xs)
+    yield from ((0, y) for y in range(height - 1, 0, -1))
+
+def cycle_dir(width: int, height: int, x: int, y: int) -> Dir:
+    """Direction from a cell to the next one on the cycle of the board."""
+    if x == 0 and y > 0:
+        return Dir.UP
+    if y % 2:
+        if x > 1 or y == height - 1:
+            return Dir.LEFT
+        return Dir.DOWN
+    return Dir.RIGHT if x < width - 1 else Dir.DOWN
+
+def cycle_snake(width: int, height: int, length: int) -> Snake:
+    """
+    Create a snake lying on the cycle of the board.
+
+    Following the cycle with cycle_dir(), the snake moves forever without
+    biting itself, whatever its length.
+    """
+    cells = list(itertools.islice(cycle_cells(width, height), length))
+    tiles = [Tile(x, y, DEF_BODY_COLOR) for x, y in reversed(cells)]
+    tiles[0].color = DEF_HEAD_COLOR
+    head = tiles[0]
+    return Snake(tiles, cycle_dir(width, height, head.x, head.y))
+
+def snake_lengths(width: int, height: int) -> tuple[int, ...]:
+    """Lengths of the snakes of the benchmarks: up to the full board."""
+    # Keep one free cell, for the snake to move to
+    full = min(width * height - 1, MAX_SNAKE_LENGTH)
+    return tuple(sorted({SK_START_LENGTH, full // 4, full}))
+
+def make_board(width: int, height: int, length: int, *,
+               screen: pygame.Surface | None = None,
+               ) -> tuple[Board, Snake]:
+    """Create a board with a snake on its cycle, seeded for repeatability."""
+    board = Board(screen, height, width, MIN_TILE_SIZE,
+                  rng = random.Random(0))
+    snake = cycle_snake(width, height, length)
+    board.add_object(snake)
+    return board, snake
+
+def setup_move(width: int, height: int, length: int) -> Setup:
+    """Snake.move, with the events of the tick dispatched."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        board, snake = make_board(width, height, length)
+
+        def op() -> None:
+            head = snake.head
+            snake.dir = cycle_dir(width, height, head.x, head.y)
+            snake.move()
+            board.dispatch()
+        return op, 1
+    return setup
+
+def setup_collides(width: int, height: int, length: int) -> Setup:
+    """Board.collides, on the snake."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        board, snake = make_board(width, height, length)
+        board.create_fruit()
+        return lambda: list(board.collides(snake)), 1
+    return setup
+
+def setup_create_fruit(width: int, height: int, length: int) -> Setup:
+    """Board.create_fruit, then the removal of the fruit."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        board, _ = make_board(width, height, length)
+
+        def op() -> None:
+            board.create_fruit()
+            *_, fruit = board.objects
+            board.remove_object(fruit)
+        return op, 1
+    return setup
+
+def setup_contains(width: int, height: int, length: int) -> Setup:
+    """GameObject.__contains__, of a fruit in the snake."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        _, snake = make_board(width, height, length)
+        fruit = Fruit(Tile(width - 1, height - 1, Fruit.color))
+        return lambda: fruit in snake, 1
+    return setup
+
+def setup_draw(width: int, height: int, length: int, *,
+               view: tuple[int, int] | None = None) -> Setup:
+    """
+    Board.draw of the checkerboard, the snake and a fruit, off-screen.
+
+    With a view, only the cells in the view of a camera centered on the head
+    of the snake are drawn.
+    """
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        camera = None
+        cols, lines = width, height
+        if view is not None:
+            camera = Camera(width, height, *view)
+            cols, lines = camera.view_cols, camera.view_lines
+        screen = pygame.Surface((cols * MIN_TILE_SIZE, lines * MIN_TILE_SIZE))
+        board, snake = make_board(width, height, length, screen = screen)
+        board.remove_object(snake)
+        board.add_object(Checkerboard(height, width))
+        board.add_object(snake)
+        board.create_fruit()
+        if camera is not None:
+            camera.center(snake.head.x, snake.head.y)
+        board.draw(camera) # Renders the checkerboard once
+        return lambda: board.draw(camera), 1
+    return setup
+
+def setup_draw_view(width: int, height: int, length: int) -> Setup:
+    """Board.draw of the default view of the game."""
+    return setup_draw(width, height, length,
+                      view = (DEFAULT_VIEW_WIDTH, DEFAULT_VIEW_HEIGHT))
+
+def write_scores(filename: str, count: int) -> None:
+    """Create a score file with a number of players."""
+    scores = Scores(5, (Score(score = i, name = f"p{i}")
+                        for i in range(count)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scores.save(filename)
+
+def setup_scores_load(directory: str, ext: str, count: int) -> Setup:
+    """Scores.load, of a whole score file."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        filename = os.path.join(directory, f"load-{count}{ext}")
+        write_scores(filename, count)
+        return lambda: Scores.load(filename), 1
+    return setup
+
+def setup_scores_save(directory: str, ext: str, count: int) -> Setup:
+    """Scores.save, with one score improved before each save."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        filename = os.path.join(directory, f"save-{count}{ext}")
+        write_scores(filename, count)
+        scores = Scores.load(filename)
+        best = [count]
+
+        def op() -> None:
+            best[0] += 1
+            scores.merge([Score(score = best[0], name = "p0")])
+            with contextlib.redirect_stdout(io.StringIO()):
+                scores.save(filename)
+        return op, 1
+    return setup
+
+def setup_game(width: int, height: int) -> Setup:
+    """Whole games played by the greedy agent, timed per tick."""
+    def setup() -> tuple[typing.Callable[[], object], int]:
+        engine = Engine(width, height)
+        ticks = play_game(engine, greedy_agent, 0, GAME_TICKS).ticks
+        return lambda: play_game(engine, greedy_agent, 0, GAME_TICKS), ticks
+    return setup
+
+def make_cases(directory: str) -> list[Case]:
+    """All the benchmarks, score files being created in a directory."""
+    cases = []
+    micro = (("snake.move", setup_move),
+             ("board.collides", setup_collides),
+             ("board.create_fruit", setup_create_fruit),
+             ("game_object.contains", setup_contains),
+             ("board.draw", setup_draw),
+             ("board.draw_view", setup_draw_view))
+    for name, setup in micro:
+        for width, height in BOARD_SIZES:
+            # The whole board of a huge board does not fit in memory
+            if name == "board.draw" and width * height > 100 * 100:
+                continue
+            for length in snake_lengths(width, height):
+                cases.append(Case(name, {"w": width, "h": height,
+                                         "len": length},
+                                  setup(width, height, length)))
+    for name, setup in (("scores.load", setup_scores_load),
+                        ("scores.save", setup_scores_save)):
+        for ext in SCORE_EXTENSIONS:
+            for count in SCORE_COUNTS:
+                cases.append(Case(name, {"fmt": ext[1:], "n": count},
+                                  setup(directory, ext, count)))
+    for width, height in BOARD_SIZES:
+        cases.append(Case("engine.game", {"w": width, "h": height},
+                          setup_game(width, height)))
+    return cases
+
+def run_case(case: Case, repeat: int) -> dict[str, typing.Any]:
+    """
+    Time a case.
+
+    The number of calls of each measure is chosen so that it lasts at least
+    0.2 s, and the measure is repeated. The best time is the least disturbed
+    by the rest of the system, so it is the one compared to baselines.
+    """
+    fn, ops = case.setup()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / (number * ops) * 1e9 for t in timer.repeat(repeat, number)]
+    return {"name": case.name, "params": case.params,
+            "ns_per_op": min(times), "median_ns": statistics.median(times),
+            "ops": number * ops, "repeat": repeat}
+
+def run(pattern: str | None = None,
+        repeat: int = DEFAULT_REPEAT) -> dict[str, typing.Any]:
+    """Run the benchmarks whose key matches a pattern, and report them."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for case in make_cases(directory):
+            if pattern is not None and not re.search(pattern, case.key):
+                continue
+            results[case.key] = run_case(case, repeat)
+            print(f"{case.key:<48} {results[case.key]['ns_per_op']:14.0f} ns",
+                  file = sys.stderr)
+    return {
+        "meta": {
+            "date": datetime.datetime.now(datetime.UTC).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def compare(report: dict[str, typing.Any], baseline: dict[str, typing.Any],
+            threshold: float = DEFAULT_THRESHOLD) -> list[dict[str, typing.Any]]:
+    """
+    Compare the cases of a report with the same ones in a baseline.
+
+    A case is a regression if it got slower than the baseline by more than
+    the threshold (a ratio), and an improvement if it got as much faster.
+    """
+    rows = []
+    current, base = report["results"], baseline["results"]
+    for key, result in current.items():
+        new = result["ns_per_op"]
+        old = base.get(key, {}).get("ns_per_op")
+        ratio = None
+        if old is None:
+            status = "new"
+        else:
+            ratio = new / old
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "ok"
+        rows.append({"key": key, "baseline_ns": old, "ns": new,
+                     "ratio": ratio, "status": status})
+    rows.sort(key = lambda row: row["key"])
+    return rows
+
+def read_bench_args() -> argparse.Namespace:
+    """Read command line arguments of the benchmarks."""
+    parser = argparse.ArgumentParser(
+            description = "Time the hot paths of the game, headless.",
+            formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--output", "-o",
+                        help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", "-b",
+                        help="Compare the results with this JSON file, and"
+                        " exit with an error on regressions.")
+    parser.add_argument("--threshold", type = float,
+                        default = DEFAULT_THRESHOLD,
+                        help="Slowdown ratio flagged as a regression.")
+    parser.add_argument("--filter", "-k",
+                        help="Only run the benchmarks matching this regular"
+                        " expression.")
+    parser.add_argument("--repeat", "-r", type = int, default = DEFAULT_REPEAT,
+                        help="Number of measures of each benchmark.")
+    args = parser.parse_args()
+
+    # Check integer range
+    for chk in [{"lbl": "Repeat", "val": args.repeat, "min": 1, "max": 1000}]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return args
+
+def main() -> None:
+    """Entry point of snake-bench."""
+    try:
+        args = read_bench_args()
+    except SnakeError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1) from e
+
+    report = run(args.filter, args.repeat)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        for row in rows:
+            ratio = "" if row["ratio"] is None else f"{row['ratio']:6.2f}x"
+            print(f"{row['key']:<48} {ratio:>8} {row['status']}",
+                  file = sys.stderr)
+        if any(row["status"] == "regression" for row in rows):
+            raise SystemExit(1)
@@ -1,63 +1,343 @@
 # ruff: noqa: D100,S311
 
 # Standard
+import random
 import typing
 
-# Third party
-import pygame
-
 # First party
+from .constants import MAX_WIDTH
+from .events import (
+    Collision,
+    EventBus,
+    ObjectEaten,
+    ObjectMoved,
+    OutOfBoard,
+    TilesReleased,
+)
+from .exceptions import BoardFull, IntRangeError
 from .fruit import Fruit
 from .game_object import GameObject
-from .observer import Observer
 from .subject import Subject
+from .tile import Tile
+
+if typing.TYPE_CHECKING:
+    import pygame
+
+    from .camera import Camera
 
+# Boards up to this number of cells keep a pool of their free cells from the
+# start, and draw fruits from it as they always did, so that recorded games
+# replay the same. Larger boards draw random cells until a free one, and only
+# build the pool once crowded.
+POOL_MAX_CELLS = 100 * 100
+MIN_FREE_RATIO = 4 # Draw random cells while a quarter of the board is free
 
-class Board(Subject, Observer):
+# Side of the square chunks of cells indexing the tiles, for drawing only the
+# visible ones
+CHUNK_SIZE = 16
+
+
+class Board(Subject):
     """Main class that handles all game objects."""
 
-    def __init__(self, screen: pygame.Surface, nb_lines: int, nb_cols: int,
-                 tile_size: int) -> None:
-        """Object initialization."""
+    def __init__(self, screen: "pygame.Surface | None", nb_lines: int,
+                 nb_cols: int, tile_size: int, *,
+                 rng: random.Random | None = None,
+                 track_changes: bool | None = None) -> None:
+        """
+        Object initialization.
+
+        The screen is only used for drawing, and can be None when the board
+        is not displayed. All random draws (fruit spawning) come from rng,
+        by default a generator of its own seeded once from the system. The
+        changed cells are tracked for renderers that only draw them, by
+        default only if the board has a screen.
+        """
+        # Tile hashes only tell lines apart up to the widest board
+        if not 1 <= nb_cols <= MAX_WIDTH:
+            raise IntRangeError("Width", nb_cols, 1, MAX_WIDTH)
         super().__init__()
         self._screen = screen
         self._nb_lines = nb_lines
         self._nb_cols = nb_cols
         self._tile_size = tile_size
+        self._rng = rng if rng is not None else random.Random()
+        self._nb_cells = nb_lines * nb_cols
         self._objects: list[GameObject] = []
 
+        # Occupancy index: cell id (y * nb_cols + x) -> object standing on it.
+        # Background objects are not indexed.
+        self._occupancy: dict[int, GameObject] = {}
+
+        # Pool of free cells, with the position of each cell inside the pool
+        # (-1 if occupied) so that it can be taken out in constant time. None
+        # while the board is too large and not crowded enough to need it.
+        self._free: list[int] | None = None
+        self._free_pos: list[int] | None = None
+        if self._nb_cells <= POOL_MAX_CELLS:
+            self._build_pool()
+
+        # Tiles standing on the board, by chunk then by cell id
+        self._chunk_cols = -(-nb_cols // CHUNK_SIZE)
+        self._chunks: dict[int, dict[int, Tile]] = {}
+
+        # Cells changed since the last draw, with the tile to draw on each of
+        # them (None for a cell that must show the background again). None
+        # when changes are not tracked, since nothing would ever read them.
+        if track_changes is None:
+            track_changes = screen is not None
+        self._dirty: dict[int, Tile | None] | None = (
+                {} if track_changes else None)
+
+        # Events of the objects, handled once per tick by dispatch()
+        self._bus = EventBus()
+        self._bus.subscribe(ObjectMoved, self._on_object_moved)
+        self._bus.subscribe(ObjectEaten, self._on_object_eaten)
+        self._bus.subscribe(TilesReleased, self._on_tiles_released)
+
+    def _occupy(self, tile: Tile, obj: GameObject) -> None:
+        """Register an object on the cell of a tile."""
+        cell = tile.cell(self._nb_cols)
+        self._occupancy[cell] = obj
+        if self._dirty is not None:
+            self._dirty[cell] = tile
+        chunk = ((tile.y // CHUNK_SIZE) * self._chunk_cols
+                 + tile.x // CHUNK_SIZE)
+        self._chunks.setdefault(chunk, {})[cell] = tile
+
+        # Take the cell out of the pool by swapping it with the last one
+        if self._free is None:
+            return
+        i = self._free_pos[cell]
+        if i >= 0:
+            last = self._free.pop()
+            if last != cell:
+                self._free[i] = last
+                self._free_pos[last] = i
+            self._free_pos[cell] = -1
+
+    def _release(self, tile: Tile, obj: GameObject) -> None:
+        """Unregister an object from the cell of a tile."""
+        # Tiles out of the board have no cell
+        if not (0 <= tile.x < self._nb_cols and 0 <= tile.y < self._nb_lines):
+            return
+
+        cell = tile.cell(self._nb_cols)
+        if self._occupancy.get(cell) is obj:
+            del self._occupancy[cell]
+            if self._dirty is not None:
+                self._dirty[cell] = None
+            chunk = ((tile.y // CHUNK_SIZE) * self._chunk_cols
+                     + tile.x // CHUNK_SIZE)
+            tiles = self._chunks[chunk]
+            del tiles[cell]
+            if not tiles:
+                del self._chunks[chunk]
+
+            # Give the cell back to the pool
+            if self._free is not None:
+                self._free_pos[cell] = len(self._free)
+                self._free.append(cell)
+
+    def _build_pool(self) -> None:
+        """Create the pool of free cells, in the order of their ids."""
+        occupancy = self._occupancy
+        self._free = [c for c in range(self._nb_cells) if c not in occupancy]
+        self._free_pos = [-1] * self._nb_cells
+        for i, cell in enumerate(self._free):
+            self._free_pos[cell] = i
+
+    @property
+    def nb_lines(self) -> int:
+        """Number of lines of the board."""
+        return self._nb_lines
+
+    @property
+    def nb_cols(self) -> int:
+        """Number of columns of the board."""
+        return self._nb_cols
+
+    @property
+    def track_changes(self) -> bool:
+        """Tell if the changed cells are tracked."""
+        return self._dirty is not None
+
+    @track_changes.setter
+    def track_changes(self, track: bool) -> None:
+        """Start or stop tracking the changed cells."""
+        if not track:
+            self._dirty = None
+        elif self._dirty is None:
+            self._dirty = {}
+
+    @property
+    def events(self) -> EventBus:
+        """Bus of the events of the objects."""
+        return self._bus
+
+    def dispatch(self) -> None:
+        """Handle the events of the tick: call once the objects have moved."""
+        self._bus.dispatch()
+
+    @property
+    def objects(self) -> typing.Iterator[GameObject]:
+        """Iterator on the objects of the board."""
+        return iter(self._objects)
+
+    def occupant(self, x: int, y: int) -> GameObject | None:
+        """Get the object standing on a cell, if any."""
+        if not (0 <= x < self._nb_cols and 0 <= y < self._nb_lines):
+            return None
+        return self._occupancy.get(y * self._nb_cols + x)
+
+    @property
+    def nb_free_cells(self) -> int:
+        """Number of cells not occupied by any object."""
+        return self._nb_cells - len(self._occupancy)
+
     def add_object(self, obj: GameObject) -> None:
         """Add an object to the board."""
         # Add object if not already there
         if obj not in self._objects:
             self._objects.append(obj)
-            obj.attach_obs(self)
+            obj.attach_bus(self._bus)
+            if not obj.is_background():
+                for tile in obj.tiles:
+                    self._occupy(tile, obj)
 
     def remove_object(self, obj: GameObject) -> None:
         """Remove an object from the board."""
         # Add object if not already there
         if obj in self._objects:
             self._objects.remove(obj)
-            obj.detach_obs(self)
+            obj.detach_bus(self._bus)
+            if not obj.is_background():
+                for tile in obj.tiles:
+                    self._release(tile, obj)
+
+    def clear(self) -> None:
+        """
+        Remove all objects but the background ones.
+
+        The pool of free cells gets back to its initial order, so that random
+        draws only depend on the seed and what happens after.
+        """
+        for obj in list(self._objects):
+            if not obj.is_background():
+                self.remove_object(obj)
+        if self._nb_cells <= POOL_MAX_CELLS:
+            self._build_pool()
+        else:
+            self._free = self._free_pos = None
+        self._bus.clear()
 
     def create_fruit(self) -> None:
-        """Create a random fruit."""
-        fruit = None
-        while fruit is None or list(self.collides(fruit)):
-            fruit = Fruit.create_random(self._nb_lines, self._nb_cols)
-        self.add_object(fruit)
-
-    def draw(self) -> None:
-        """Draw all objects on screen."""
-        # Loop on all objects
-        for obj in self._objects:
-
-            # Loop on all object's tiles
-            for tile in obj.tiles:
-                tile.draw(self._screen, self._tile_size)
-
-    def notify_object_eaten(self, obj: GameObject) -> None:
-        """Notify that the fruit has been eaten."""
+        """
+        Create a fruit on a random free cell.
+
+        Raises BoardFull if there is no cell left.
+        """
+        free = self.nb_free_cells
+        if free == 0:
+            raise BoardFull
+
+        if self._free is None and free * MIN_FREE_RATIO >= self._nb_cells:
+            # Mostly free board: a few draws at most
+            cell = self._rng.randrange(self._nb_cells)
+            while cell in self._occupancy:
+                cell = self._rng.randrange(self._nb_cells)
+        else:
+            if self._free is None:
+                self._build_pool()
+            cell = self._rng.choice(self._free)
+        y, x = divmod(cell, self._nb_cols)
+        self.add_object(Fruit(Tile(x, y, Fruit.color)))
+
+    def tiles_in(self, x0: int, y0: int, x1: int,
+                 y1: int) -> typing.Iterator[Tile]:
+        """
+        The tiles standing in an area of cells, x1 and y1 excluded.
+
+        Only looks at the chunks of cells overlapping the area, whatever the
+        size of the board and the number of tiles.
+        """
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self._nb_cols), min(y1, self._nb_lines)
+        for cy in range(y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1):
+            for cx in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1):
+                tiles = self._chunks.get(cy * self._chunk_cols + cx)
+                if tiles is not None:
+                    for tile in tiles.values():
+                        if x0 <= tile.x < x1 and y0 <= tile.y < y1:
+                            yield tile
+
+    def draw(self, camera: "Camera | None" = None) -> None:
+        """
+        Draw all objects on screen, or only the view of a camera.
+
+        With a camera, only the tiles in the view are drawn, found through
+        the chunks of the board.
+        """
+        if camera is None:
+            # Loop on all objects
+            for obj in self._objects:
+                obj.draw(self._screen, self._tile_size)
+        else:
+            origin = camera.origin
+            for obj in self._objects:
+                if obj.is_background():
+                    obj.draw(self._screen, self._tile_size, origin = origin)
+            for tile in self.tiles_in(*camera.area):
+                tile.draw(self._screen, self._tile_size, origin)
+        if self._dirty is not None:
+            self._dirty.clear()
+
+    def take_changes(self) -> dict[int, Tile | None]:
+        """
+        Get and forget the cells changed since the last draw.
+
+        Each changed cell id is mapped to the tile now standing on it, or None
+        if the cell is free again. Empty if changes are not tracked.
+        """
+        if self._dirty is None:
+            return {}
+        changes, self._dirty = self._dirty, {}
+        return changes
+
+    def draw_dirty(self, camera: "Camera | None" = None,
+                   ) -> list["pygame.Rect"]:
+        """
+        Draw only the cells that changed since the last draw.
+
+        With a camera, only the changed cells in its view are drawn, and the
+        view must not have moved since the last draw. Returns the list of
+        rectangles to update on the display.
+        """
+        import pygame # Only needed for drawing, not by headless games
+
+        rects = []
+        size = self._tile_size
+        ox, oy = origin = (0, 0) if camera is None else camera.origin
+        for cell, tile in self.take_changes().items():
+            y, x = divmod(cell, self._nb_cols)
+            if camera is not None and not camera.contains(x, y):
+                continue
+            rect = pygame.Rect((x - ox) * size, (y - oy) * size, size, size)
+
+            # Restore the background, then draw the tile over it
+            self._screen.fill(pygame.Color("black"), rect)
+            for obj in self._objects:
+                if obj.is_background():
+                    obj.draw(self._screen, size, area = rect,
+                             origin = origin)
+            if tile is not None:
+                tile.draw(self._screen, size, origin)
+            rects.append(rect)
+        return rects
+
+    def _on_object_eaten(self, event: ObjectEaten) -> None:
+        """Replace an eaten fruit."""
+        obj = event.obj
         if isinstance(obj, Fruit):
             # Remove the fruit
             self.remove_object(obj)
@@ -65,24 +345,47 @@ class Board(Subject, Observer):
             # Create a new fruit
             self.create_fruit()
 
-    def notify_object_moved(self, obj: GameObject) -> None:
-        """Notify that an object has moved."""
-        # Detect board exit
-        for tile in obj.tiles:
-            if not (0 <= tile.x < self._nb_cols and
-                    0 <= tile.y < self._nb_lines):
-                obj.notify_out_of_board(width = self._nb_cols,
-                                        height = self._nb_lines)
+    def _on_object_moved(self, event: ObjectMoved) -> None:
+        """Index the new cell of a moved object and detect collisions."""
+        # Only the head enters a new cell, the rest of the object is already
+        # indexed
+        obj = event.obj
+        head = obj.head
 
-        # Detect collisions
-        for o in self.collides(obj):
-            obj.notify_collision(o)
+        # Detect board exit: the object moves again once back on the board
+        if not (0 <= head.x < self._nb_cols and 0 <= head.y < self._nb_lines):
+            self._bus.publish(OutOfBoard(obj, width = self._nb_cols,
+                                         height = self._nb_lines))
+            return
+
+        # Detect collision (including with itself once wrapped around), then
+        # take the cell
+        other = self._occupancy.get(head.cell(self._nb_cols))
+        self._occupy(head, obj)
+
+        # The previous head may have changed color
+        tiles = obj.tiles
+        next(tiles)
+        neck = next(tiles, None)
+        if neck is not None and self._dirty is not None:
+            self._dirty[neck.cell(self._nb_cols)] = neck
+        if other is not None:
+            self._bus.publish(Collision(obj, other = other))
+
+    def _on_tiles_released(self, event: TilesReleased) -> None:
+        """Free the cells an object left."""
+        for tile in event.tiles:
+            self._release(tile, event.obj)
 
     def collides(self, obj: GameObject) -> typing.Iterator[GameObject]:
         """Check if an object collides with other objects on the board."""
-        # Loop on all known objects
-        for o in self._objects:
+        found: list[GameObject] = []
+
+        # Look up the cells of the object in the occupancy index
+        for tile in obj.tiles:
+            o = self._occupancy.get(tile.cell(self._nb_cols))
 
             # Detect a collision
-            if obj != o and not o.is_background() and obj in o:
+            if o is not None and o is not obj and o not in found:
+                found.append(o)
                 yield o
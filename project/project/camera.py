@@ -0,0 +1,103 @@
+# ruff: noqa: D100,S311
+
+# Fraction of the view, from each edge, that the followed cell must not enter
+DEFAULT_MARGIN_RATIO = 4
+
+class Camera:
+    """
+    Window of the board shown on screen, following a cell.
+
+    The view is a rectangle of cells, never larger than the board and never
+    out of it. It only scrolls when the followed cell gets closer to an edge
+    than a margin, so that most frames show the same cells as the previous
+    one.
+    """
+
+    def __init__(self, nb_cols: int, nb_lines: int, view_cols: int,
+                 view_lines: int, *, margin: int | None = None) -> None:
+        """
+        Object initialization.
+
+        The margin is in cells, by default a quarter of the view.
+        """
+        self._nb_cols = nb_cols
+        self._nb_lines = nb_lines
+        self._view_cols = min(view_cols, nb_cols)
+        self._view_lines = min(view_lines, nb_lines)
+        if margin is None:
+            margin = min(self._view_cols,
+                         self._view_lines) // DEFAULT_MARGIN_RATIO
+        self._margin = margin
+        self._x = 0 # Cell in the top-left corner of the view
+        self._y = 0
+
+    @property
+    def x(self) -> int:
+        """Column of the leftmost cells of the view."""
+        return self._x
+
+    @property
+    def y(self) -> int:
+        """Line of the topmost cells of the view."""
+        return self._y
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        """Cell in the top-left corner of the view."""
+        return self._x, self._y
+
+    @property
+    def view_cols(self) -> int:
+        """Number of columns of the view."""
+        return self._view_cols
+
+    @property
+    def view_lines(self) -> int:
+        """Number of lines of the view."""
+        return self._view_lines
+
+    @property
+    def area(self) -> tuple[int, int, int, int]:
+        """Cells of the view: first column and line, then last ones + 1."""
+        return (self._x, self._y, self._x + self._view_cols,
+                self._y + self._view_lines)
+
+    def scrolls(self) -> bool:
+        """Tell if the board is larger than the view."""
+        return (self._view_cols < self._nb_cols
+                or self._view_lines < self._nb_lines)
+
+    def contains(self, x: int, y: int) -> bool:
+        """Tell if a cell is in the view."""
+        return (self._x <= x < self._x + self._view_cols
+                and self._y <= y < self._y + self._view_lines)
+
+    def _move(self, x: int, y: int) -> bool:
+        """Move the view, kept inside the board. Return True if it moved."""
+        x = max(0, min(x, self._nb_cols - self._view_cols))
+        y = max(0, min(y, self._nb_lines - self._view_lines))
+        moved = (x, y) != (self._x, self._y)
+        self._x, self._y = x, y
+        return moved
+
+    def center(self, x: int, y: int) -> bool:
+        """Center the view on a cell. Return True if it moved."""
+        return self._move(x - self._view_cols // 2, y - self._view_lines // 2)
+
+    def follow(self, x: int, y: int) -> bool:
+        """
+        Scroll the view just enough to keep a cell out of the margins.
+
+        Return True if it moved.
+        """
+        vx, vy = self._x, self._y
+        m = self._margin
+        if x < vx + m:
+            vx = x - m
+        elif x >= vx + self._view_cols - m:
+            vx = x - self._view_cols + m + 1
+        if y < vy + m:
+            vy = y - m
+        elif y >= vy + self._view_lines - m:
+            vy = y - self._view_lines + m + 1
+        return self._move(vx, vy)
@@ -17,21 +17,87 @@ CB_COLOR_2 = pygame.Color("Black")
 class Checkerboard(GameObject):
     """The black and white checkerboard used as background."""
 
-    def __init__(self, nb_lines: int, nb_cols: int) -> None:
+    def __init__(self, nb_lines: int, nb_cols: int, *,
+                 color_1: pygame.Color = CB_COLOR_1,
+                 color_2: pygame.Color = CB_COLOR_2) -> None:
         """Object initialization."""
         super().__init__()
         self._nb_lines = nb_lines
         self._nb_cols = nb_cols
+        self._color_1 = color_1
+        self._color_2 = color_2
+
+        # Pre-rendered pattern and the parameters it was rendered with
+        self._surface: pygame.Surface | None = None
+        self._surface_key: tuple | None = None
 
     @property
     def tiles(self) -> typing.Iterator[Tile]:
-        """Tiles generator."""
-        # Loop on all tiles
-        for i in range(self._nb_cols):
-            for j in range(self._nb_lines):
+        """Iterator on the tiles."""
+        return self.tiles_in(0, 0, self._nb_cols, self._nb_lines)
+
+    def tiles_in(self, x0: int, y0: int, x1: int,
+                 y1: int) -> typing.Iterator[Tile]:
+        """
+        The tiles in an area of cells, x1 and y1 excluded.
+
+        Tiles are created on the fly, so that huge boards cost no memory.
+        """
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self._nb_cols), min(y1, self._nb_lines)
+        return (Tile(i, j, self._color_1 if (i + j) % 2 == 0
+                     else self._color_2)
+                for i in range(x0, x1) for j in range(y0, y1))
+
+    def render(self, tile_size: int,
+               screen: pygame.Surface | None = None) -> pygame.Surface:
+        """
+        Get the checkerboard pattern rendered on an off-screen surface.
+
+        The pattern covers the screen, or the board if smaller, plus one
+        column: shifting it by one tile swaps the colors, so that any part of
+        the board can be drawn from it. It is cached and only rendered again
+        if the size or the colors change. If given, the screen is used as
+        pixel format.
+        """
+        cols, lines = self._nb_cols, self._nb_lines
+        if screen is not None:
+            cols = min(cols, -(-screen.get_width() // tile_size))
+            lines = min(lines, -(-screen.get_height() // tile_size))
+        key = (lines, cols, tile_size,
+               tuple(pygame.Color(self._color_1)),
+               tuple(pygame.Color(self._color_2)))
+        if self._surface is None or key != self._surface_key:
+            size = ((cols + 1) * tile_size, lines * tile_size)
+            if screen is None:
+                surface = pygame.Surface(size)
+            else:
+                surface = pygame.Surface(size, 0, screen)
+            surface.fill(self._color_2)
+            for i in range(cols + 1):
+                for j in range(i % 2, lines, 2):
+                    surface.fill(self._color_1, (i * tile_size, j * tile_size,
+                                                 tile_size, tile_size))
+            self._surface = surface
+            self._surface_key = key
+        return self._surface
+
+    def draw(self, screen: pygame.Surface, tile_size: int,
+             area: pygame.Rect | None = None,
+             origin: tuple[int, int] = (0, 0)) -> None:
+        """
+        Draw the checkerboard on screen, with a single blit.
 
-                # Generate the tile with the right color
-                yield Tile(i, j, CB_COLOR_1 if (i+j) % 2 == 0 else CB_COLOR_2)
+        The origin is the cell shown in the top-left corner of the screen.
+        """
+        surface = self.render(tile_size, screen)
+        shift = (origin[0] + origin[1]) % 2 * tile_size
+        if area is None:
+            screen.blit(surface, (0, 0),
+                        (shift, 0, surface.get_width() - tile_size,
+                         surface.get_height()))
+        else:
+            screen.blit(surface, area.topleft, area.move(shift, 0))
 
     def is_background(self) -> bool:
         """Test if this object is a background object."""
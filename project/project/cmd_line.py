@@ -3,39 +3,52 @@
 # Standard
 import argparse
 import re
-
-# Third party
-import pygame
+import typing
 
 # First party
-from .exceptions import ColorError, IntRangeError
+from .constants import MAX_HEIGHT, MAX_WIDTH, MIN_HEIGHT, MIN_WIDTH
+from .exceptions import ColorError, IntRangeError, ReplayError
+
+from .replay import MAX_SEED
+
+if typing.TYPE_CHECKING:
+    from .replay import Replay
 
 # Global constants
 DEFAULT_HEIGHT = 24 # Number of lines
 DEFAULT_WIDTH = 32 # Number of columns
 DEFAULT_TILE_SIZE = 20
-DEFAULT_FPS = 10 # Number of frames per second
-MIN_HEIGHT = 12
-MAX_HEIGHT = 100
-MIN_WIDTH = 24
-MAX_WIDTH = 100
+DEFAULT_FPS = 10 # Number of game ticks per second
+DEFAULT_RENDER_FPS = 60 # Number of frames drawn per second
+DEFAULT_RENDER_EVERY = 100 # Ticks between two frames in turbo mode
+DEFAULT_VIEW_HEIGHT = 36 # Number of lines shown, when the board is larger
+DEFAULT_VIEW_WIDTH = 48 # Number of columns shown, when the board is larger
+MAX_VIEW_HEIGHT = 200
+MAX_VIEW_WIDTH = 200
 MIN_TILE_SIZE = 10
 MAX_TILE_SIZE = 30
 MIN_FPS = 10
 MAX_FPS = 30
+MIN_RENDER_FPS = 1
+MAX_RENDER_FPS = 240
+MIN_RENDER_EVERY = 1
+MAX_RENDER_EVERY = 1000000
+MIN_REPLAY_SPEED = 1
+MAX_REPLAY_SPEED = 10000
+# Full redraw, only the changed cells, or a scaled grid of colors (NumPy)
+RENDERERS = ("full", "dirty", "array")
+DEFAULT_RENDERER = "full"
+# Show frames by flipping the whole window, updating only the drawn areas, or
+# not at all (headless runs)
+PRESENT_MODES = ("flip", "update", "none")
+DEFAULT_PRESENT_MODE = "update"
 
 # Snake constants
-SK_DEF_HEAD_COLOR = pygame.Color("Green2") # Snake's head default color
-SK_DEF_BODY_COLOR = pygame.Color("GreenYellow") # Snake's body default color
-SK_DEF_HEAD_COLOR_HEX = (f"#{SK_DEF_HEAD_COLOR.r:02x}{SK_DEF_HEAD_COLOR.g:02x}"
-                     f"{SK_DEF_HEAD_COLOR.b:02x}")
-SK_DEF_BODY_COLOR_HEX = (f"#{SK_DEF_BODY_COLOR.r:02x}{SK_DEF_BODY_COLOR.g:02x}"
-                     f"{SK_DEF_BODY_COLOR.b:02x}")
+SK_DEF_HEAD_COLOR_HEX = "#00ee00" # Snake's head default color (Green2)
+SK_DEF_BODY_COLOR_HEX = "#adff2f" # Snake's body default color (GreenYellow)
 
 # Fruit constants
-FRUIT_DEF_COLOR = pygame.Color("Red3") # Fruit default color
-FRUIT_DEF_COLOR_HEX = (f"#{FRUIT_DEF_COLOR.r:02x}{FRUIT_DEF_COLOR.g:02x}"
-                       f"{FRUIT_DEF_COLOR.b:02x}")
+FRUIT_DEF_COLOR_HEX = "#cd0000" # Fruit default color (Red3)
 
 def read_args() -> argparse.Namespace:
     """Read command line arguments."""
@@ -55,6 +68,16 @@ def read_args() -> argparse.Namespace:
     parser.add_argument("--width", "-W", type = int, default = DEFAULT_WIDTH,
                         help="Number of columns of the checkerboard."
                         f" Must be between {MIN_WIDTH} and {MAX_WIDTH}.")
+    parser.add_argument("--view-height", type = int,
+                        default = DEFAULT_VIEW_HEIGHT,
+                        help="Number of lines shown in the window, which"
+                        " scrolls with the snake on larger boards. Must be"
+                        f" between {MIN_HEIGHT} and {MAX_VIEW_HEIGHT}.")
+    parser.add_argument("--view-width", type = int,
+                        default = DEFAULT_VIEW_WIDTH,
+                        help="Number of columns shown in the window, which"
+                        " scrolls with the snake on larger boards. Must be"
+                        f" between {MIN_WIDTH} and {MAX_VIEW_WIDTH}.")
 
     # Colors
     parser.add_argument("--fruit-color", default = FRUIT_DEF_COLOR_HEX,
@@ -68,10 +91,76 @@ def read_args() -> argparse.Namespace:
     parser.add_argument("--gameover-on-exit", action = "store_true",
                         help="Exiting the board ends the game.")
 
+    parser.add_argument("--seed", type = int, default = None,
+                        help="Seed of the random generator, to play the same"
+                        " games again. Random if not set. Must be between 0"
+                        f" and {MAX_SEED}.")
+
+    # Recording (replayed games are not recorded again)
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--record", metavar = "FILE",
+                           help="Append a replay of each finished game to"
+                           " this file.")
+    recording.add_argument("--replay", metavar = "FILE",
+                           help="Show the games recorded in this file instead"
+                           " of playing. The board settings come from the"
+                           " file, and must be the same for all its games.")
+    parser.add_argument("--replay-speed", type = int, default = 1,
+                        help="Number of recorded ticks played per frame."
+                        f" Must be between {MIN_REPLAY_SPEED} and"
+                        f" {MAX_REPLAY_SPEED}.")
+
+    # High scores
+    parser.add_argument("--scores", metavar = "FILE",
+                        default = "high_scores.yaml",
+                        help="File of the high scores, shared by all running"
+                        " games. Its format is chosen by its extension: YAML"
+                        " (.yaml, .yml), JSON (.json) or SQLite (.db, .sqlite,"
+                        " .sqlite3).")
+
     # FPS
     parser.add_argument("--fps", type = int, default = DEFAULT_FPS,
-                        help="Set the number of frames per second."
+                        help="Set the number of game ticks per second."
                         f" Must be between {MIN_FPS} and {MAX_FPS}.")
+    parser.add_argument("--render-fps", type = int,
+                        default = DEFAULT_RENDER_FPS,
+                        help="Set the maximum number of frames drawn per"
+                        " second, independently of the game speed. Must be"
+                        f" between {MIN_RENDER_FPS} and {MAX_RENDER_FPS}.")
+    parser.add_argument("--turbo", "--uncapped", action = "store_true",
+                        help="Run the game as fast as possible, drawing a"
+                        " frame every --render-every ticks.")
+    parser.add_argument("--render-every", type = int,
+                        default = DEFAULT_RENDER_EVERY,
+                        help="Number of game ticks between two frames in"
+                        f" turbo mode. Must be between {MIN_RENDER_EVERY} and"
+                        f" {MAX_RENDER_EVERY}.")
+
+    # Rendering
+    parser.add_argument("--renderer", choices = RENDERERS,
+                        default = DEFAULT_RENDERER,
+                        help="How to draw frames: redraw the whole screen,"
+                        " only the cells that changed (dirty rectangles), or"
+                        " the whole board from a grid of colors in one blit"
+                        " (requires NumPy).")
+    parser.add_argument("--present", choices = PRESENT_MODES,
+                        default = DEFAULT_PRESENT_MODE,
+                        help="How to show each frame: flip the whole window,"
+                        " update only the areas drawn, or nothing (headless"
+                        " runs).")
+
+    # Profiling
+    parser.add_argument("--profile-overlay", action = "store_true",
+                        help="Show the p50, p95 and p99 durations of each"
+                        " phase of the frames.")
+    parser.add_argument("--profile-out", metavar = "FILE",
+                        help="At exit, write the durations of each phase of"
+                        " the frames to this file: CSV if its extension is"
+                        " .csv, JSON otherwise.")
+
+    # Logging
+    parser.add_argument("--verbose", "-v", action = "store_true",
+                        help="Enable verbose logging.")
 
     # Parse
     args = parser.parse_args()
@@ -83,8 +172,21 @@ def read_args() -> argparse.Namespace:
                  "min": MIN_WIDTH, "max": MAX_WIDTH},
                 {"lbl": "Height", "val": args.height,
                  "min": MIN_HEIGHT, "max": MAX_HEIGHT},
+                {"lbl": "View width", "val": args.view_width,
+                 "min": MIN_WIDTH, "max": MAX_VIEW_WIDTH},
+                {"lbl": "View height", "val": args.view_height,
+                 "min": MIN_HEIGHT, "max": MAX_VIEW_HEIGHT},
                 {"lbl": "FPS", "val": args.fps,
                  "min": MIN_FPS, "max": MAX_FPS},
+                {"lbl": "Render FPS", "val": args.render_fps,
+                 "min": MIN_RENDER_FPS, "max": MAX_RENDER_FPS},
+                {"lbl": "Render every", "val": args.render_every,
+                 "min": MIN_RENDER_EVERY, "max": MAX_RENDER_EVERY},
+                {"lbl": "Replay speed", "val": args.replay_speed,
+                 "min": MIN_REPLAY_SPEED, "max": MAX_REPLAY_SPEED},
+                *([] if args.seed is None else
+                  [{"lbl": "Seed", "val": args.seed,
+                    "min": 0, "max": MAX_SEED}]),
                 ]:
         if not (chk["min"] <= chk["val"] <= chk["max"]):
             raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
@@ -98,6 +200,39 @@ def read_args() -> argparse.Namespace:
     # Run parser on command line arguments
     return args
 
+def read_replay_settings(replays: list["Replay"],
+                         ) -> tuple[int, int, int, bool]:
+    """
+    Get the board settings of the games to replay.
+
+    All the games must have been played with the same settings, which are
+    checked like the values of the command line. Returns the width, height,
+    start length and gameover on exit.
+    """
+    first = replays[0]
+    settings = (first.width, first.height, first.start_length,
+                first.gameover_on_exit)
+    for i, replay in enumerate(replays):
+        if (replay.width, replay.height, replay.start_length,
+                replay.gameover_on_exit) != settings:
+            msg = (f"Replay {i} was not played with the same board settings"
+                   " as the first one.")
+            raise ReplayError(msg)
+
+    # Check integer range
+    width, height, start_length, _ = settings
+    for chk in [{"lbl": "Replay width", "val": width,
+                 "min": MIN_WIDTH, "max": MAX_WIDTH},
+                {"lbl": "Replay height", "val": height,
+                 "min": MIN_HEIGHT, "max": MAX_HEIGHT},
+                {"lbl": "Replay start length", "val": start_length,
+                 "min": 1, "max": min(width, height) // 2},
+                ]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return settings
+
 
 
 
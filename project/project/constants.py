@@ -0,0 +1,7 @@
+# ruff: noqa: D100,S311
+
+# Size limits of the board, shared by the command line and the game model
+MIN_HEIGHT = 12
+MAX_HEIGHT = 10000
+MIN_WIDTH = 24
+MAX_WIDTH = 10000
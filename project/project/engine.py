@@ -0,0 +1,186 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import dataclasses
+import random
+import typing
+
+# First party
+from .board import Board
+from .dir import Dir
+from .exceptions import BoardExit, BoardFull, GameOver
+from .fruit import Fruit
+from .replay import Replay
+from .snake import DEF_BODY_COLOR, DEF_HEAD_COLOR, SK_START_LENGTH, Snake
+from .tile import Color
+
+if typing.TYPE_CHECKING:
+    import pygame
+
+# Causes of the end of a game
+CAUSE_WALL = "wall" # Exited the board
+CAUSE_SELF = "self" # Ran into itself
+CAUSE_WON = "won" # Filled the board
+
+# Rewards
+REWARD_FRUIT = 1 # For each fruit eaten
+REWARD_DEATH = -1 # When the game is lost
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class EngineState:
+    """Snapshot of a game, after a reset or a step."""
+
+    tick: int
+    score: int
+    length: int
+    head: tuple[int, int]
+    fruit: tuple[int, int] | None
+    dir: Dir
+    done: bool
+    won: bool
+    cause: str | None
+
+class Engine:
+    """
+    The rules of the game, without any display, clock or event queue.
+
+    It uses the same Board, Snake and Fruit as the displayed game, and never
+    imports pygame unless the board is drawn.
+    """
+
+    def __init__(self, width: int, height: int, *, # noqa: PLR0913
+                 start_length: int = SK_START_LENGTH,
+                 gameover_on_exit: bool = False,
+                 head_color: Color = DEF_HEAD_COLOR,
+                 body_color: Color = DEF_BODY_COLOR,
+                 screen: "pygame.Surface | None" = None,
+                 tile_size: int = 0,
+                 record: bool = False) -> None:
+        """
+        Object initialization.
+
+        The screen and tile size are only needed by a frontend that draws the
+        board. If record is set, each game is recorded as a Replay.
+        """
+        self._width = width
+        self._height = height
+        self._start_length = start_length
+        self._gameover_on_exit = gameover_on_exit
+        self._head_color = head_color
+        self._body_color = body_color
+        self._rng = random.Random() # Shared by all random draws of the game
+        self._board = Board(screen = screen, nb_lines = height,
+                            nb_cols = width, tile_size = tile_size,
+                            rng = self._rng)
+        self._snake: Snake | None = None
+        self._tick = 0
+        self._done = True
+        self._cause: str | None = None
+        self._record = record
+        self._replay: Replay | None = None
+
+    @property
+    def board(self) -> Board:
+        """The board."""
+        return self._board
+
+    @property
+    def snake(self) -> Snake | None:
+        """The snake, None before the first reset."""
+        return self._snake
+
+    @property
+    def won(self) -> bool:
+        """Tell if the snake filled the whole board."""
+        return self._cause == CAUSE_WON
+
+    @property
+    def cause(self) -> str | None:
+        """Why the game ended, None if it is still running."""
+        return self._cause
+
+    @property
+    def replay(self) -> Replay | None:
+        """Recording of the current game, if recording."""
+        return self._replay
+
+    @property
+    def state(self) -> EngineState:
+        """Snapshot of the current game."""
+        head = self._snake.head
+        fruit = next((o.head for o in self._board.objects
+                      if isinstance(o, Fruit)), None)
+        return EngineState(tick = self._tick, score = self._snake.score,
+                           length = self._snake.length,
+                           head = (head.x, head.y),
+                           fruit = None if fruit is None else (fruit.x, fruit.y),
+                           dir = self._snake.dir, done = self._done,
+                           won = self.won, cause = self._cause)
+
+    def reset(self, seed: int | None = None) -> EngineState:
+        """
+        Start a new game.
+
+        The same seed always gives the same game for the same actions. Without
+        seed, one is drawn from the random stream of the previous game.
+        """
+        if seed is None:
+            seed = self._rng.getrandbits(32)
+        self._rng.seed(seed)
+
+        # Clear the board, keeping background objects
+        self._board.clear()
+
+        # Place a new snake and a fruit
+        self._snake = Snake.create_random(
+            nb_lines = self._height, nb_cols = self._width,
+            length = self._start_length, head_color = self._head_color,
+            body_color = self._body_color,
+            gameover_on_exit = self._gameover_on_exit, rng = self._rng)
+        self._board.add_object(self._snake)
+        self._board.create_fruit()
+
+        self._tick = 0
+        self._done = False
+        self._cause = None
+        if self._record:
+            self._replay = Replay(seed = seed, width = self._width,
+                                  height = self._height,
+                                  start_length = self._start_length,
+                                  gameover_on_exit = self._gameover_on_exit)
+        return self.state
+
+    def step(self, action: Dir | None = None) -> tuple[EngineState, int, bool]:
+        """
+        Advance the game by one tick.
+
+        The action is the new direction of the snake, None to keep going
+        straight. Returns the new state, the reward and whether the game is
+        over.
+        """
+        if self._done:
+            msg = "The game is over, call reset() first."
+            raise RuntimeError(msg)
+
+        if action is not None:
+            self._snake.dir = action
+        if self._replay is not None:
+            self._replay.record(self._snake.dir)
+        score = self._snake.score
+        reward = 0
+        try:
+            self._snake.move()
+            self._board.dispatch() # End of the tick
+        except BoardFull:
+            self._done = True
+            self._cause = CAUSE_WON
+        except GameOver as e:
+            self._done = True
+            self._cause = CAUSE_WALL if isinstance(e, BoardExit) else CAUSE_SELF
+            reward = REWARD_DEATH
+        self._tick += 1
+        reward += (self._snake.score - score) * REWARD_FRUIT
+        if self._replay is not None:
+            self._replay.score = self._snake.score
+
+        return self.state, reward, self._done
@@ -0,0 +1,127 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+import dataclasses
+import typing
+
+# First party
+from .observer import Observer
+
+if typing.TYPE_CHECKING:
+    from .game_object import GameObject
+    from .tile import Tile
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class Event:
+    """Something that happened to an object of the board."""
+
+    obj: "GameObject"
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class ObjectMoved(Event):
+    """An object moved its head to a new tile."""
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class MoveEnded(Event):
+    """All the consequences of a move of an object have been handled."""
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class OutOfBoard(Event):
+    """The head of an object exited the board."""
+
+    width: int
+    height: int
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class Collision(Event):
+    """The head of an object ran into another object (or itself)."""
+
+    other: "GameObject"
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class ObjectEaten(Event):
+    """An object has been eaten."""
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class TilesReleased(Event):
+    """An object no longer occupies some tiles."""
+
+    tiles: list["Tile"]
+
+Handler = typing.Callable[[typing.Any], None]
+
+class EventBus(Observer):
+    """
+    Queue of the events of a tick, dispatched in one batch.
+
+    Objects notify the bus like any other observer, and it only queues the
+    events. Handlers are registered by event type. Events published by a
+    handler are dispatched right after the event being handled, before the
+    next queued ones: the consequences of an event are handled in order,
+    without any handler being called from inside another one.
+    """
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        super().__init__()
+        self._handlers: dict[type[Event], dict[Handler, None]] = (
+                collections.defaultdict(dict))
+        self._queue: collections.deque[Event] = collections.deque()
+        self._children: list[Event] | None = None # Published while handling
+        self._counts: collections.Counter[type[Event]] = collections.Counter()
+
+    def subscribe(self, event_type: type[Event], handler: Handler) -> None:
+        """Call a handler for each event of a type."""
+        self._handlers[event_type][handler] = None
+
+    def unsubscribe(self, event_type: type[Event], handler: Handler) -> None:
+        """Stop calling a handler."""
+        self._handlers[event_type].pop(handler, None)
+
+    def publish(self, event: Event) -> None:
+        """Queue an event."""
+        if self._children is not None:
+            self._children.append(event)
+        else:
+            self._queue.append(event)
+
+    def dispatch(self) -> None:
+        """Handle all queued events, and the events they cause."""
+        queue = self._queue
+        while queue:
+            event = queue.popleft()
+            self._counts[type(event)] += 1
+            self._children = []
+            try:
+                for handler in list(self._handlers[type(event)]):
+                    handler(event)
+            finally:
+                children, self._children = self._children, None
+            queue.extendleft(reversed(children))
+
+    def clear(self) -> None:
+        """Drop the queued events, left by a game ended during a tick."""
+        self._queue.clear()
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Number of events dispatched so far, by type."""
+        return {t.__name__: n for t, n in self._counts.items()}
+
+    def notify_object_moved(self, obj: "GameObject") -> None:
+        """Queue a move."""
+        self.publish(ObjectMoved(obj))
+
+    def notify_object_eaten(self, obj: "GameObject") -> None:
+        """Queue an object eaten."""
+        self.publish(ObjectEaten(obj))
+
+    def notify_move_ended(self, obj: "GameObject") -> None:
+        """Queue the end of a move."""
+        self.publish(MoveEnded(obj))
+
+    def notify_tiles_released(self, obj: "GameObject",
+                              tiles: list["Tile"]) -> None:
+        """Queue tiles released."""
+        self.publish(TilesReleased(obj, tiles))
@@ -14,6 +14,16 @@ class GameOver(SnakeException):
         """Object initialization."""
         super().__init__("Game over!")
 
+class BoardExit(GameOver):
+    """Exception class used to signal that the snake has exited the board."""
+
+class BoardFull(GameOver):
+    """Exception class used to signal that the snake filled the board."""
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        SnakeException.__init__(self, "Board full, you win!")
+
 class SnakeError(Exception):
     """Exception super-class for all Snake errors."""
 
@@ -29,6 +39,17 @@ class IntRangeError(SnakeError):
         super().__init__(f"{label} value must be between {low} and {high}."
                          f" {value} is not allowed.")
 
+class ReplayError(SnakeError):
+    """Exception for unreadable replays."""
+
+class ScoreStoreError(SnakeError):
+    """Exception for score files of unknown format."""
+
+    def __init__(self, filename: str, extensions: list[str]) -> None:
+        """Object initialization."""
+        super().__init__(f'Unknown format for score file "{filename}".'
+                         f" Extension must be one of {', '.join(extensions)}.")
+
 class ColorError(SnakeError):
     """Exception for color format error."""
 
@@ -4,18 +4,15 @@
 import random
 import typing
 
-# Third party
-import pygame
-
 # First party
 from .game_object import GameObject
-from .tile import Tile
+from .tile import Color, Tile
 
 
 class Fruit(GameObject):
     """A fruit that the snake must eat."""
 
-    color = pygame.Color("black")
+    color: Color = "black"
 
     def __init__(self, tile: Tile) -> None:
         """Object initialization."""
@@ -33,10 +30,14 @@ class Fruit(GameObject):
 
     # Create a Fruit at random position on the board
     @classmethod
-    def create_random(cls, nb_lines: int, nb_cols: int) -> typing.Self:
-        """Create a random fruit."""
-        random.seed()
-        x = random.randint(0, nb_cols - 1)
-        y = random.randint(0, nb_lines - 1)
+    def create_random(cls, nb_lines: int, nb_cols: int,
+                      rng: random.Random) -> typing.Self:
+        """
+        Create a random fruit.
+
+        Draws from the random generator of the game.
+        """
+        x = rng.randint(0, nb_cols - 1)
+        y = rng.randint(0, nb_lines - 1)
         return cls(Tile(x, y, cls.color))
 
@@ -1,21 +1,41 @@
+import logging
 import os
+import random
+import time
 import pygame
 import typing
-from .board import Board
+from .camera import Camera
 from .checkerboard import Checkerboard
 from .dir import Dir
-from .exceptions import GameOver
+from .engine import Engine
+from .exceptions import SnakeError
 from .fruit import Fruit
 from .game_object import GameObject
+from .profiler import (
+    PHASE_DRAW,
+    PHASE_EVENTS,
+    PHASE_IDLE,
+    PHASE_IO,
+    PHASE_MOVE,
+    PHASE_PRESENT,
+    PHASE_TEXT,
+    FrameProfiler,
+    NullProfiler,
+    ProfilerOverlay,
+)
+from .replay import DIRS, Replay, ReplayWriter
 from .score import Score
-from .scores import Scores  
-from .snake import Snake
+from .score_store import open_store
+from .scores import Scores, ScoresWriter
 from .state import State
+from .text_cache import TextCache
 
 # Constants
 SK_START_LENGTH = 3
 MAX_LENGTH = 8
 MAX_SCORES = 5
+MAX_CATCH_UP = 5  # Most ticks played in one frame to catch up with a late frame
+SCORES_FILE = "high_scores.yaml"
 
 
 class Game:
@@ -23,54 +43,109 @@ class Game:
 
     def __init__(self, width: int, height: int, tile_size: int,  # noqa: PLR0913
                  fps: int, *,
+                 start_length: int = SK_START_LENGTH,
+                 view_width: int = 48,
+                 view_height: int = 36,
+                 render_fps: int = 60,
+                 turbo: bool = False,
+                 render_every: int = 100,
                  fruit_color: pygame.Color,
                  snake_head_color: pygame.Color,
                  snake_body_color: pygame.Color,
                  gameover_on_exit: bool,
-                 scores, logger) -> None:
+                 scores: str | None, logger,
+                 renderer: str = "full",
+                 present: str = "update",
+                 seed: int | None = None,
+                 record: str | None = None,
+                 replays: list[Replay] | None = None,
+                 replay_speed: int = 1,
+                 profile_overlay: bool = False,
+                 profile_out: str | None = None) -> None:
         """Object initialization."""
         self._width = width
         self._height = height
+        self._view_width = min(view_width, width)  # Cells shown, the view scrolls on larger boards
+        self._view_height = min(view_height, height)
         self._tile_size = tile_size
-        self._fps = fps
+        self._start_length = start_length  # Length of the snake at start, replays may change it
+        self._fps = fps  # Game ticks per second
+        self._render_fps = render_fps  # Frames per second, at most
+        self._turbo = turbo  # Ticks as fast as possible, a frame every render_every ticks
+        self._render_every = render_every
+        self._lag = 0.0  # Game time not played yet, in seconds
+        self._last_time = 0.0
+        self._countdown = 0  # Ticks left on the game over screen
+        self._debug = False  # Debug logs enabled, checked once per game
         self._fruit_color = fruit_color
         self._snake_head_color = snake_head_color
         self._snake_body_color = snake_body_color
         self._gameover_on_exit = gameover_on_exit
-        self._snake = None
+        self._renderer = renderer  # "full", "dirty" or "array"
+        self._present_mode = present  # "flip", "update" or "none"
+        self._action: Dir | None = None  # Direction asked by the player
+        self._rng = random.Random(seed)  # Draws the seed of each game
+        self._record = record  # File where finished games are appended
+        self._replay_writer: ReplayWriter | None = None  # Appends them off the game loop
+        self._replays = list(replays or [])  # Games to show instead of playing
+        self._replaying = bool(self._replays)
+        self._replay_speed = replay_speed  # Ticks per frame when replaying
         self._new_high_score = None | Score
-        self._scores = Scores.load("high_scores.yaml")  # Loading scores
+        self._scores_store = open_store(scores or SCORES_FILE)  # Format chosen by the file extension
+        self._scores = Scores.load(self._scores_store)  # Loading scores
         self._player_name = ""  # Store the player's name
+        self._won = False  # The snake filled the whole board
+        # Timers of the phases of each frame, on if shown or saved at exit
+        self._profiler = FrameProfiler() if profile_overlay or profile_out else NullProfiler()
+        self._profile_overlay = profile_overlay
+        self._profile_out = profile_out  # JSON or CSV file written at exit
         self._logger = logger
         self._logger.info("Game initialized.")
 
 
-    def _reset_snake(self) -> None:
-        """Reset the snake."""
-        if self._snake is not None:
-            self._board.detach_obs(self._snake)
-            self._board.remove_object(self._snake)
-            self._logger.debug("Resetting the snake.")
-        self._snake = Snake.create_random(
-            nb_lines=self._height, nb_cols=self._width,
-            length=SK_START_LENGTH, head_color=self._snake_head_color,
-            body_color=self._snake_body_color, gameover_on_exit=self._gameover_on_exit,
-        )
-        self._board.add_object(self._snake)
-        self._board.attach_obs(self._snake)
-        self._logger.debug("Snake has been created.")
+    def _reset_game(self) -> None:
+        """Start a new game: new snake and new fruit."""
+        if self._replaying:
+            if not self._replays:
+                self._state = State.QUIT
+                return
+            replay = self._replays.pop(0)
+            self._seed = replay.seed
+            self._replay_moves = iter(replay.moves)
+        else:
+            self._seed = self._rng.getrandbits(32)
+        self._engine.reset(self._seed)
+        head = self._engine.snake.head
+        self._camera.center(head.x, head.y)
+        self._action = None
+        self._logger.debug("Snake has been created (game seed %s).", self._seed)
 
     def _init(self) -> None:
         """Initialize the game."""
-        screen_size = (self._width * self._tile_size, self._height * self._tile_size)
+        if self._renderer == "array":
+            try:
+                from .array_renderer import ArrayRenderer  # Requires NumPy
+            except ImportError as e:
+                raise SnakeError("--renderer array needs numpy") from e
+        screen_size = (self._view_width * self._tile_size, self._view_height * self._tile_size)
         self._screen = pygame.display.set_mode(screen_size)
+        self._camera = Camera(self._width, self._height, self._view_width, self._view_height)
         self._clock = pygame.time.Clock()
-        self._board = Board(screen=self._screen, nb_lines=self._height, nb_cols=self._width, tile_size=self._tile_size)
+        self._engine = Engine(
+            self._width, self._height, start_length=self._start_length,
+            gameover_on_exit=self._gameover_on_exit,
+            head_color=self._snake_head_color, body_color=self._snake_body_color,
+            screen=self._screen, tile_size=self._tile_size,
+            record=self._record is not None,
+        )
+        self._board = self._engine.board
         self._checkerboard = Checkerboard(nb_lines=self._height, nb_cols=self._width)
         self._board.add_object(self._checkerboard)
-        self._reset_snake()
         Fruit.color = self._fruit_color
-        self._board.create_fruit()
+        self._reset_game()
+        if self._renderer == "array":
+            self._array_renderer = ArrayRenderer(self._board, self._screen,
+                                                 self._tile_size, self._camera)
 
         # Load fonts 
         font_path = os.path.join(os.path.dirname(__file__), "DejaVuSansMono-Bold.ttf")
@@ -78,10 +153,15 @@ class Game:
             raise FileNotFoundError(f"Font file not found: {font_path}")
         self._font_1 = pygame.font.Font(font_path, 32)
         self._font_2 = pygame.font.Font(font_path, 64)
+        self._text_cache = TextCache()  # Shared by all screens
+        self._overlay = None
+        if self._profile_overlay:
+            self._overlay = ProfilerOverlay(self._profiler, pygame.font.Font(font_path, 12))
 
     def _drawgameover(self) -> None:
         """Draw the gameover's sentence."""
-        text_gameover = self._font_2.render("GAME OVER", True, pygame.Color("red"))
+        sentence = "YOU WIN" if self._won else "GAME OVER"
+        text_gameover = self._text_cache.render(self._font_2, sentence, "red")
         x, y = 80, 160  # Define the position where to write text.
         self._screen.blit(text_gameover, (x, y))
 
@@ -89,17 +169,15 @@ class Game:
         """Display the list of high scores."""
         x, y = 80, 10  # Define the position where to write text.
         for score in self._scores:
-            text_scores = self._font_1.render(score.name.ljust(Score.MAX_LENGTH) + f" {score.score: >8}", True, pygame.Color("red"))
+            text_scores = self._text_cache.render(self._font_1, score.name.ljust(Score.MAX_LENGTH) + f" {score.score: >8}", "red")
             self._screen.blit(text_scores, (x, y))
             y += 32
-        pygame.display.update()
 
     def _draw_inputname(self) -> None:
         """Draw the input name screen."""
-        text = self._font_1.render(f"Enter your name: {self._new_high_score.name}", True, pygame.Color("red"))
+        text = self._text_cache.render(self._font_1, f"Enter your name: {self._new_high_score.name}", "red")
         x, y = 80, 10
         self._screen.blit(text, (x, y))
-        pygame.display.update()
 
     def _process_scores_event(self, event: pygame.event.Event) -> None:
         """Switch to the state Play if needed."""
@@ -111,21 +189,20 @@ class Game:
         if event.type == pygame.KEYDOWN:
             match event.key:
                 case pygame.K_UP:
-                    self._snake.dir = Dir.UP
+                    self._action = Dir.UP
                 case pygame.K_DOWN:
-                    self._snake.dir = Dir.DOWN
+                    self._action = Dir.DOWN
                 case pygame.K_LEFT:
-                    self._snake.dir = Dir.LEFT
+                    self._action = Dir.LEFT
                 case pygame.K_RIGHT:
-                    self._snake.dir = Dir.RIGHT
+                    self._action = Dir.RIGHT
 
     def _process_inputname(self, event: pygame.event.Event) -> None:
         """The player enters his/her name in the ranking list of highscores."""
         if self._new_high_score is not None and event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:  
                 self._player_name = self._new_high_score.name  
-                self._scores.add_score(self._new_high_score)  # Add or refresh the score
-                self._scores.save("high_scores.yaml")  
+                self._scores.add_score(self._new_high_score)  # Add or refresh the score, saved in the background
                 self._state = State.SCORES 
             elif event.key == pygame.K_BACKSPACE:  
                 self._new_high_score.name = self._new_high_score.name[:-1]
@@ -150,53 +227,189 @@ class Game:
                     case State.INPUT_NAME:
                         self._process_inputname(event)
 
+    def _step(self) -> bool:
+        """Advance the game, return True if it is over."""
+        if not self._replaying:
+            _, _, done = self._engine.step(self._action)
+            self._action = None
+            return done
+
+        # Fast-forward through the recorded moves
+        for _ in range(self._replay_speed):
+            code = next(self._replay_moves, None)
+            if code is None:
+                return True
+            _, _, done = self._engine.step(DIRS[code])
+            if done:
+                return True
+        return False
+
+    def _wait_frame(self) -> int:
+        """
+        Wait for the next frame, return the number of game ticks to play before drawing it.
+
+        The game ticks at its own rate, whatever the frame rate: a late frame plays several ticks to
+        catch up, up to MAX_CATCH_UP (the rest of the delay is dropped). In turbo mode, frames are
+        not waited for while the game runs, and each one plays render_every ticks. The game over
+        screen still lasts its normal time, otherwise it would end in the frame that shows it.
+        """
+        if self._turbo and self._state == State.PLAY:
+            self._clock.tick()
+            self._last_time = time.perf_counter()  # Start counting game time when turbo stops
+            self._lag = 0.0
+            return self._render_every
+
+        self._clock.tick(self._render_fps)
+        now = time.perf_counter()
+        self._lag += now - self._last_time
+        self._last_time = now
+        ticks = int(self._lag * self._fps)
+        if ticks > MAX_CATCH_UP:
+            ticks = MAX_CATCH_UP
+            self._lag = 0.0
+        else:
+            self._lag -= ticks / self._fps
+        return ticks
+
+    def _advance(self, ticks: int) -> None:
+        """Play game ticks: move the snake, or count down on the game over screen."""
+        prof = self._profiler
+        for _ in range(ticks):
+            match self._state:
+                case State.PLAY:
+                    done = self._step()
+                    if self._debug:
+                        self._logger.debug("Snake moved.")
+                    prof.lap(PHASE_MOVE)
+                    if done:
+                        if self._replay_writer is not None and self._engine.replay is not None:
+                            self._replay_writer.submit(self._engine.replay)  # A new one is recorded from the next reset
+                        self._won = self._engine.won
+                        self._state = State.GAMEOVER
+                        self._logger.info("Game over state reached.")
+                        self._countdown = self._fps  # One second of game time
+                        prof.lap(PHASE_IO)
+                        return  # Show the game over screen before counting down
+                case State.GAMEOVER:
+                    self._countdown -= 1
+                    if self._countdown == 0:
+                        self._end_game()
+                        prof.lap(PHASE_MOVE)
+                case _:
+                    return
+
+    def _end_game(self) -> None:
+        """Leave the game over screen: next game, or high scores."""
+        score = self._engine.snake.score
+        self._reset_game()
+        if self._replaying:
+            if self._state != State.QUIT:
+                self._state = State.PLAY
+        elif self._scores.is_highscore(score):
+            default_name = self._player_name if self._player_name else ""
+            self._new_high_score = Score(name=default_name, score=score)
+            if not self._player_name:
+                self._state = State.INPUT_NAME
+            else:
+                self._scores.add_score(self._new_high_score)
+                self._state = State.SCORES
+        else:
+            self._state = State.SCORES
+
+    def _present(self, rects: list[pygame.Rect] | None = None) -> None:
+        """Show the frame composed in the back buffer: the only present of a frame."""
+        match self._present_mode:
+            case "flip":
+                pygame.display.flip()
+            case "update" if rects is not None:
+                pygame.display.update(rects)
+            case "update":
+                pygame.display.update()
+            case "none":
+                pass
+
     def is_game_over(self) -> bool:
         """Check if the game is in the GAMEOVER state."""
         return self._state == State.GAMEOVER
 
-    def start(self) -> None:
-        """Start the game."""
-        pygame.init()
-        self._logger.info("Pygame initialized.")
-        self._init()
-        self._state = State.SCORES
-        self._logger.debug("Game state set to SCORES.")
-
+    def _loop(self) -> None:
+        """Run frames until the player quits."""
+        drawn_state = None  # State of the last fully drawn frame
+        prof = self._profiler
+        self._debug = self._logger.isEnabledFor(logging.DEBUG)
+        self._last_time = time.perf_counter()
         while self._state != State.QUIT:
-            self._clock.tick(self._fps)
+            ticks = self._wait_frame()
+            prof.lap(PHASE_IDLE)
             self._process_events()
-            try:
-                if self._state == State.PLAY:
-                    self._snake.move()
-                    self._logger.debug("Snake moved.")
-
-            except GameOver:
-                self._state = State.GAMEOVER
-                self._logger.info("Game over state reached.")
-                countdown = self._fps
-            self._screen.fill(pygame.Color("black"))
-            self._board.draw()
+            prof.lap(PHASE_EVENTS)
+            self._scores.poll()  # Merge the scores saved by other instances
+            prof.lap(PHASE_IO)
+            self._advance(ticks)
+            head = self._engine.snake.head
+            scrolled = self._camera.follow(head.x, head.y)
+
+            # Only redraw and present the cells changed by the snake, once a
+            # full play frame is on screen and while the view stays still
+            if (self._renderer == "dirty" and self._state == State.PLAY
+                    and drawn_state == State.PLAY and not scrolled):
+                rects = self._board.draw_dirty(self._camera)
+                prof.lap(PHASE_DRAW)
+                if self._overlay is not None:
+                    rects.append(self._overlay.draw(self._screen))
+                    prof.lap(PHASE_TEXT)
+                self._present(rects)
+                prof.lap(PHASE_PRESENT)
+                prof.end_frame()
+                continue
+
+            drawn_state = self._state
+            if self._renderer == "array":
+                self._array_renderer.draw()
+            else:
+                self._screen.fill(pygame.Color("black"))
+                self._board.draw(self._camera)
+            prof.lap(PHASE_DRAW)
             match self._state:
                 case State.GAMEOVER:
                     self._drawgameover()
-                    countdown -= 1
-                    if countdown == 0:
-                        score = self._snake.score
-                        self._reset_snake()
-                        if self._scores.is_highscore(score):
-                            default_name = self._player_name if self._player_name else ""
-                            self._new_high_score = Score(name=default_name, score=score)
-                            if not self._player_name:
-                                self._state = State.INPUT_NAME
-                            else:
-                                self._scores.add_score(self._new_high_score)
-                                self._state = State.SCORES
-                        else:
-                            self._state = State.SCORES
                 case State.SCORES:
                     self._draw_scores()
                 case State.INPUT_NAME:
                     self._draw_inputname()
-            pygame.display.update()
+            if self._overlay is not None:
+                self._overlay.draw(self._screen)
+            prof.lap(PHASE_TEXT)
+            self._present()
+            prof.lap(PHASE_PRESENT)
+            prof.end_frame()
+
+    def start(self) -> None:
+        """Start the game."""
+        pygame.init()
+        self._logger.info("Pygame initialized.")
+        self._init()
+        self._scores.writer = ScoresWriter(self._scores_store, max_scores=self._scores.max_scores)  # Keep disk writes off the game loop
+        if self._record is not None:
+            self._replay_writer = ReplayWriter(self._record)
+        self._state = State.PLAY if self._replaying else State.SCORES
+        self._logger.debug("Game state set to SCORES.")
+        try:
+            self._loop()
+        finally:
+            unsaved = self._scores.writer.close()  # Flush the scores not saved yet, even after an error
+            self._scores.writer = None
+            if unsaved:
+                self._logger.error("%d score(s) could not be saved.", len(unsaved))
+            if self._replay_writer is not None:
+                unsaved_replays = self._replay_writer.close()  # Append the replays still queued
+                if unsaved_replays:
+                    self._logger.error("%d replay(s) could not be saved to %s: %s", len(unsaved_replays),
+                                       self._record, self._replay_writer.error)
+                self._replay_writer = None
         self._logger.info("Game ended. Exiting...")
+        prof = self._profiler
+        if self._profile_out is not None and prof:
+            prof.dump(self._profile_out)
+            self._logger.info("Frame timings saved to %s.", self._profile_out)
         pygame.quit()
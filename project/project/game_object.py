@@ -9,6 +9,11 @@ from .observer import Observer
 from .subject import Subject
 from .tile import Tile
 
+if typing.TYPE_CHECKING:
+    import pygame
+
+    from .events import EventBus
+
 
 class GameObject(Subject, Observer, abc.ABC):
     """Abstract class for all game objects."""
@@ -23,11 +28,45 @@ class GameObject(Subject, Observer, abc.ABC):
         """The tiles of the object."""
         raise NotImplementedError
 
+    @property
+    def head(self) -> Tile:
+        """The leading tile of the object, the only one that can move in."""
+        return next(self.tiles)
+
     def __contains__(self, other: object) -> bool:
         """Check if an game object intersects with another."""
         if not isinstance(other, GameObject):
             return False
-        return any(t in self.tiles for t in other.tiles)
+        tiles = set(self.tiles)
+        return any(t in tiles for t in other.tiles)
+
+    def tiles_in(self, x0: int, y0: int, x1: int,
+                 y1: int) -> typing.Iterator[Tile]:
+        """The tiles of the object in an area of cells, x1 and y1 excluded."""
+        return (t for t in self.tiles if x0 <= t.x < x1 and y0 <= t.y < y1)
+
+    def draw(self, screen: "pygame.Surface", tile_size: int,
+             area: "pygame.Rect | None" = None,
+             origin: tuple[int, int] = (0, 0)) -> None:
+        """
+        Draw the object on screen, or only the part inside an area.
+
+        The origin is the cell shown in the top-left corner of the screen.
+        """
+        ox, oy = origin
+        for tile in self.tiles:
+            if area is None or area.colliderect(
+                    ((tile.x - ox) * tile_size, (tile.y - oy) * tile_size,
+                     tile_size, tile_size)):
+                tile.draw(screen, tile_size, origin)
+
+    def attach_bus(self, bus: "EventBus") -> None:
+        """Send the events of the object to a bus, and handle its events."""
+        self.attach_obs(bus)
+
+    def detach_bus(self, bus: "EventBus") -> None:
+        """Stop sending and handling the events of a bus."""
+        self.detach_obs(bus)
 
     def is_background(self) -> bool:
         """Tell if this object is a background object."""
@@ -0,0 +1,110 @@
+import bisect
+import itertools
+import typing
+from .score import Score
+
+BUCKET_SIZE = 1000  # Buckets are split when they grow over twice this size
+
+
+class Leaderboard:
+    """
+    Best score of each player, sorted from best to worst.
+
+    Entries are kept in a list of sorted buckets, so that inserting or updating a score only shifts
+    the entries of one bucket. Players with the same score are ordered by name.
+    """
+
+    def __init__(self, scores: typing.Iterable[Score] = (), bucket_size: int = BUCKET_SIZE) -> None:
+        """Initialize the leaderboard with the best score of each player."""
+        self._bucket_size = bucket_size
+        self._best: dict[str, int] = {}
+        for s in scores:
+            if s.score > self._best.get(s.name, s.score - 1):
+                self._best[s.name] = s.score
+
+        # Build the buckets at once from the sorted entries
+        keys = sorted((-score, name) for name, score in self._best.items())
+        self._buckets = [keys[i:i + bucket_size] for i in range(0, len(keys), bucket_size)]
+        self._maxes = [b[-1] for b in self._buckets]  # Last key of each bucket
+
+    def __len__(self) -> int:
+        """Return the number of players."""
+        return len(self._best)
+
+    def __iter__(self) -> typing.Iterator[Score]:
+        """Iterate over all the scores, best first."""
+        return (Score(score=-score, name=name) for score, name in itertools.chain.from_iterable(self._buckets))
+
+    def __contains__(self, name: str) -> bool:
+        """Tell if a player has a score."""
+        return name in self._best
+
+    def get(self, name: str) -> int | None:
+        """Return the best score of a player, None if the player has no score."""
+        return self._best.get(name)
+
+    def add(self, score: Score) -> bool:
+        """Add a player's score, or update it if it is better. Return True if the leaderboard changed."""
+        old = self._best.get(score.name)
+        if old is not None:
+            if score.score <= old:
+                return False
+            self._remove((-old, score.name))
+        self._best[score.name] = score.score
+        self._insert((-score.score, score.name))
+        return True
+
+    def top(self, k: int) -> list[Score]:
+        """Return the k best scores."""
+        return list(itertools.islice(self, k))
+
+    def rank(self, name: str) -> int | None:
+        """Return the rank of a player (1 for the best), None if the player has no score."""
+        score = self._best.get(name)
+        if score is None:
+            return None
+        key = (-score, name)
+        i = bisect.bisect_left(self._maxes, key)
+        return sum(len(b) for b in self._buckets[:i]) + bisect.bisect_left(self._buckets[i], key) + 1
+
+    def score_at(self, rank: int) -> int | None:
+        """Return the score at a rank (1 for the best), None if there are fewer players."""
+        i = rank - 1
+        for bucket in self._buckets:
+            if i < len(bucket):
+                return -bucket[i][0]
+            i -= len(bucket)
+        return None
+
+    def is_highscore(self, score: int, k: int) -> bool:
+        """Check if a score would enter the k best scores."""
+        last = self.score_at(k)
+        return last is None or score > last
+
+    def _insert(self, key: tuple[int, str]) -> None:
+        """Insert a key in its bucket, splitting the bucket if it gets too big."""
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            return
+        i = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        bisect.insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self._bucket_size:
+            half = bucket[self._bucket_size:]
+            del bucket[self._bucket_size:]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    def _remove(self, key: tuple[int, str]) -> None:
+        """Remove a key, and its bucket if it gets empty."""
+        i = bisect.bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect.bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
@@ -1,13 +1,30 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import colorlog
-from argparse import ArgumentParser
-from .cmd_line import read_args
-from .exceptions import SnakeError
-from .game import Game
+from .cmd_line import read_args, read_replay_settings
+from .exceptions import ReplayError, SnakeError
+from .game import SK_START_LENGTH, Game
+from .replay import load_replays
+
+_listener: logging.handlers.QueueListener | None = None  # Writes the log records, in its own thread
+
 
 def setup_logger(verbose: bool) -> logging.Logger:
-    """Set up the logger with color support and verbosity control."""
+    """
+    Set up the logger with color support and verbosity control.
+
+    Records are only queued by the calling thread: they are formatted and written by a background
+    listener, so that logging never blocks the game loop. Handlers are set up only once.
+    """
+    global _listener
     log_level = logging.DEBUG if verbose else logging.INFO
+    logger = logging.getLogger("snake")
+    logger.setLevel(log_level)
+    if _listener is not None:
+        return logger
+
     handler = colorlog.StreamHandler()
     handler.setFormatter(colorlog.ColoredFormatter(
         '%(log_color)s[%(levelname)s] %(message)s',
@@ -20,36 +37,61 @@ def setup_logger(verbose: bool) -> logging.Logger:
         }
     ))
 
-    logger = logging.getLogger("snake")
-    logger.setLevel(log_level)
-    logger.addHandler(handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)  # Write the records still queued
     return logger
 
 
 def main() -> None:
-    parser = ArgumentParser()
-    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
-    args = parser.parse_args()
-
-    # Configure the logger
-    logger = setup_logger(args.verbose)
-
+    # Read command line arguments, then configure the logger
     try:
-        # Read command line arguments
         game_args = read_args()
+    except SnakeError as e:
+        setup_logger(False).error(f"Error: {e}")
+        exit(1)
+    logger = setup_logger(game_args.verbose)
+
+    try:
+        # Games to show, played on their own board settings
+        replays = None
+        start_length = SK_START_LENGTH
+        if game_args.replay is not None:
+            replays = load_replays(game_args.replay)
+            if not replays:
+                raise ReplayError(f"No replay in {game_args.replay}.")
+            (game_args.width, game_args.height, start_length,
+             game_args.gameover_on_exit) = read_replay_settings(replays)
 
         # Start the game
         logger.info("Starting the Snake game...")
         game = Game(
             width=game_args.width,
             height=game_args.height,
+            view_width=game_args.view_width,
+            view_height=game_args.view_height,
             tile_size=game_args.tile_size,
+            start_length=start_length,
             fps=game_args.fps,
+            render_fps=game_args.render_fps,
+            turbo=game_args.turbo,
+            render_every=game_args.render_every,
             fruit_color=game_args.fruit_color,
             snake_head_color=game_args.snake_head_color,
             snake_body_color=game_args.snake_body_color,
             gameover_on_exit=game_args.gameover_on_exit,
-            scores=None,  # Replace if needed
+            renderer=game_args.renderer,
+            present=game_args.present,
+            seed=game_args.seed,
+            record=game_args.record,
+            replays=replays,
+            replay_speed=game_args.replay_speed,
+            profile_overlay=game_args.profile_overlay,
+            profile_out=game_args.profile_out,
+            scores=game_args.scores,
             logger=logger,  # Pass the logger to the game
         )
         game.start()
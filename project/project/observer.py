@@ -5,6 +5,7 @@ import typing
 
 if typing.TYPE_CHECKING:
     from .game_object import GameObject
+    from .tile import Tile
 
 class Observer:
     """Interface representing an observer for the Observer pattern."""
@@ -16,6 +17,9 @@ class Observer:
     def notify_object_moved(self, obj: "GameObject") -> None:
         """Notify that an object has moved."""
 
+    def notify_move_ended(self, obj: "GameObject") -> None:
+        """Notify that an object has done everything a move implies."""
+
     def notify_collision(self, obj: "GameObject") -> None:
         """Notify that an object collides with another."""
 
@@ -24,3 +28,7 @@ class Observer:
 
     def notify_out_of_board(self, width: int, height: int) -> None:
         """Notify an object that it has exited the board."""
+
+    def notify_tiles_released(self, obj: "GameObject",
+                              tiles: list["Tile"]) -> None:
+        """Notify that an object no longer occupies some tiles."""
@@ -0,0 +1,184 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import bisect
+import collections
+import csv
+import json
+import os
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    import pygame
+
+# Phases of a frame of the game loop, in order
+PHASE_IDLE = "idle" # Waiting for the clock
+PHASE_EVENTS = "events" # Processing input events
+PHASE_IO = "io" # Score refreshes and replay recording
+PHASE_MOVE = "move" # Game step: move, observers and collisions
+PHASE_DRAW = "draw" # Drawing the board
+PHASE_TEXT = "text" # Drawing texts and overlays
+PHASE_PRESENT = "present" # Showing the frame
+PHASE_FRAME = "frame" # Whole frame
+PHASES = (PHASE_IDLE, PHASE_EVENTS, PHASE_IO, PHASE_MOVE, PHASE_DRAW,
+          PHASE_TEXT, PHASE_PRESENT, PHASE_FRAME)
+
+WINDOW = 600 # Number of recent samples used for percentiles
+PERCENTILES = (50, 95, 99)
+# Upper bounds, in seconds, of the buckets of the whole-run histograms: from
+# 10 µs to about 1.3 s, doubling each time
+BUCKET_BOUNDS = tuple(1e-5 * 2 ** i for i in range(18))
+
+class PhaseTimer:
+    """Durations of one phase: recent samples, and a histogram of all."""
+
+    __slots__ = ("_buckets", "_count", "_max", "_recent", "_total")
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        self._recent: collections.deque[float] = collections.deque(
+                maxlen = WINDOW)
+        self._buckets = [0] * (len(BUCKET_BOUNDS) + 1) # Last one is overflow
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Record a duration, in seconds."""
+        self._recent.append(duration)
+        self._buckets[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+        self._count += 1
+        self._total += duration
+        self._max = max(duration, self._max)
+
+    @property
+    def count(self) -> int:
+        """Number of samples."""
+        return self._count
+
+    def percentiles(self) -> dict[int, float]:
+        """Percentiles of the recent samples, in seconds."""
+        if not self._recent:
+            return {p: 0.0 for p in PERCENTILES}
+        samples = sorted(self._recent)
+        last = len(samples) - 1
+        return {p: samples[round(last * p / 100)] for p in PERCENTILES}
+
+    def summary(self) -> dict[str, typing.Any]:
+        """Statistics of the phase, in milliseconds."""
+        pct = self.percentiles()
+        return {
+            "count": self._count,
+            "mean_ms": self._total / self._count * 1e3 if self._count else 0.0,
+            **{f"p{p}_ms": v * 1e3 for p, v in pct.items()},
+            "max_ms": self._max * 1e3,
+            "histogram": [{"le_ms": b * 1e3, "count": n}
+                          for b, n in zip((*BUCKET_BOUNDS, float("inf")),
+                                          self._buckets, strict = True)
+                          if n],
+        }
+
+class FrameProfiler:
+    """
+    Timers around the phases of each frame.
+
+    Each call to lap() charges the time elapsed since the previous lap to a
+    phase, so that timing a phase costs a single clock read.
+    """
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        self._timers = {phase: PhaseTimer() for phase in PHASES}
+        self._last = time.perf_counter()
+        self._frame_start = self._last
+
+    def __bool__(self) -> bool:
+        """Tell if the profiler records anything."""
+        return True
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to a phase."""
+        now = time.perf_counter()
+        self._timers[phase].add(now - self._last)
+        self._last = now
+
+    def end_frame(self) -> None:
+        """Record the duration of the whole frame."""
+        self._timers[PHASE_FRAME].add(self._last - self._frame_start)
+        self._frame_start = self._last
+
+    def summary(self) -> dict[str, dict[str, typing.Any]]:
+        """Statistics of each phase that was timed, in milliseconds."""
+        return {phase: timer.summary() for phase, timer in self._timers.items()
+                if timer.count}
+
+    def overlay_lines(self) -> list[str]:
+        """Lines of text showing the rolling percentiles of each phase."""
+        lines = [f"{'ms':<8}" + "".join(f"{'p' + str(p):>7}"
+                                         for p in PERCENTILES)]
+        for phase, timer in self._timers.items():
+            if timer.count:
+                pct = timer.percentiles()
+                lines.append(f"{phase:<8}" + "".join(f"{pct[p] * 1e3:7.2f}"
+                                                     for p in PERCENTILES))
+        return lines
+
+    def dump(self, filename: str) -> None:
+        """
+        Write the statistics to a file.
+
+        The file is CSV, without the histograms, if its extension is .csv,
+        and JSON otherwise.
+        """
+        summary = self.summary()
+        if os.path.splitext(filename)[1].lower() == ".csv":
+            fields = ["count", "mean_ms",
+                      *(f"p{p}_ms" for p in PERCENTILES), "max_ms"]
+            with open(filename, "w", newline = "") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", *fields])
+                for phase, stats in summary.items():
+                    writer.writerow([phase, *(stats[k] for k in fields)])
+        else:
+            with open(filename, "w") as f:
+                json.dump(summary, f, indent = 2)
+
+class NullProfiler:
+    """Profiler doing nothing, used when profiling is off."""
+
+    def __bool__(self) -> bool:
+        """Tell if the profiler records anything."""
+        return False
+
+    def lap(self, phase: str) -> None:
+        """Do nothing."""
+
+    def end_frame(self) -> None:
+        """Do nothing."""
+
+class ProfilerOverlay:
+    """On-screen table of the rolling percentiles, refreshed periodically."""
+
+    def __init__(self, profiler: FrameProfiler, font: "pygame.font.Font",
+                 refresh: int = 30) -> None:
+        """Object initialization. The table is redrawn every refresh frames."""
+        self._profiler = profiler
+        self._font = font
+        self._refresh = refresh
+        self._frames = 0
+        self._surface: "pygame.Surface | None" = None
+
+    def draw(self, screen: "pygame.Surface") -> "pygame.Rect":
+        """Draw the table in the top-left corner, return the area drawn."""
+        import pygame
+        if self._surface is None or self._frames % self._refresh == 0:
+            lines = [self._font.render(line, True, "yellow", "black")
+                     for line in self._profiler.overlay_lines()]
+            height = self._font.get_linesize()
+            self._surface = pygame.Surface(
+                    (max(s.get_width() for s in lines), height * len(lines)))
+            for i, s in enumerate(lines):
+                self._surface.blit(s, (0, i * height))
+        self._frames += 1
+        return screen.blit(self._surface, (0, 0))
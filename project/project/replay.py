@@ -0,0 +1,242 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import argparse
+import dataclasses
+import queue
+import struct
+import threading
+import typing
+
+# First party
+from .dir import Dir
+from .exceptions import ReplayError, SnakeError
+
+if typing.TYPE_CHECKING:
+    from .engine import Engine, EngineState
+
+# Binary format: a fixed header, then the run-length encoded directions of the
+# snake, one byte per run of up to MAX_RUN ticks in the same direction (the 2
+# high bits are the direction, the 6 low bits the run length minus one).
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHHBQIiI") # magic, version, width, height,
+                                       # start length, flags, seed, ticks,
+                                       # score, body size
+FLAG_GAMEOVER_ON_EXIT = 0x01
+MAX_SEED = 2 ** 64 - 1 # Seeds are stored unsigned, on 64 bits
+DIRS = list(Dir) # Direction codes
+RUN_BITS = 6
+MAX_RUN = 1 << RUN_BITS
+
+@dataclasses.dataclass
+class Replay:
+    """
+    Everything needed to play a game again: seed, board settings and the
+    direction of the snake at each tick.
+    """
+
+    seed: int
+    width: int
+    height: int
+    start_length: int
+    gameover_on_exit: bool = False
+    score: int = 0 # Final score, to check the replay
+    moves: bytearray = dataclasses.field(default_factory = bytearray)
+
+    @property
+    def ticks(self) -> int:
+        """Number of recorded ticks."""
+        return len(self.moves)
+
+    def record(self, direction: Dir) -> None:
+        """Record the direction of the snake for one tick."""
+        self.moves.append(DIRS.index(direction))
+
+    def to_bytes(self) -> bytes:
+        """Encode the replay."""
+        body = bytearray()
+        moves = self.moves
+        i = 0
+        while i < len(moves):
+            code = moves[i]
+            run = 1
+            while (run < MAX_RUN and i + run < len(moves)
+                   and moves[i + run] == code):
+                run += 1
+            body.append(code << RUN_BITS | (run - 1))
+            i += run
+        flags = FLAG_GAMEOVER_ON_EXIT if self.gameover_on_exit else 0
+        return HEADER.pack(MAGIC, VERSION, self.width, self.height,
+                           self.start_length, flags, self.seed,
+                           len(moves), self.score, len(body)) + body
+
+    @classmethod
+    def from_bytes(cls, buf: typing.Any, offset: int = 0) -> typing.Self:
+        """Decode a replay from any buffer, starting at an offset."""
+        return cls.read(buf, offset)[0]
+
+    @classmethod
+    def read(cls, buf: typing.Any, offset: int = 0) -> tuple[typing.Self, int]:
+        """Decode a replay from a buffer. Also returns the offset after it."""
+        if len(buf) - offset < HEADER.size:
+            msg = "Truncated replay header."
+            raise ReplayError(msg)
+        (magic, version, width, height, start_length, flags, seed, ticks,
+         score, size) = HEADER.unpack_from(buf, offset)
+        if magic != MAGIC or version != VERSION:
+            msg = "Not a replay, or unknown replay version."
+            raise ReplayError(msg)
+        start = offset + HEADER.size
+        if len(buf) - start < size:
+            msg = "Truncated replay body."
+            raise ReplayError(msg)
+
+        moves = bytearray()
+        for byte in memoryview(buf)[start:start + size]:
+            moves += bytes([byte >> RUN_BITS]) * ((byte & (MAX_RUN - 1)) + 1)
+        if len(moves) != ticks:
+            msg = "Corrupted replay body."
+            raise ReplayError(msg)
+
+        return cls(seed = seed, width = width, height = height,
+                   start_length = start_length,
+                   gameover_on_exit = bool(flags & FLAG_GAMEOVER_ON_EXIT),
+                   score = score, moves = moves), start + size
+
+    def new_engine(self) -> "Engine":
+        """Create a headless engine with the settings of the replay."""
+        from .engine import Engine # The engine records replays
+        return Engine(self.width, self.height,
+                      start_length = self.start_length,
+                      gameover_on_exit = self.gameover_on_exit)
+
+    def play(self, engine: "Engine | None" = None, *,
+             stride: int = 1,
+             on_frame: typing.Callable[["EngineState"], None] | None = None,
+             ) -> "EngineState":
+        """
+        Play the game again on an engine (a new headless one by default).
+
+        If on_frame is given, it is called every stride ticks. Returns the
+        final state.
+        """
+        if engine is None:
+            engine = self.new_engine()
+        state = engine.reset(self.seed)
+        for tick, code in enumerate(self.moves, 1):
+            state, _, done = engine.step(DIRS[code])
+            if on_frame is not None and (done or tick % stride == 0):
+                on_frame(state)
+            if done:
+                break
+        return state
+
+def iter_replays(buf: typing.Any) -> typing.Iterator[Replay]:
+    """Iterate over concatenated replays."""
+    offset = 0
+    while offset < len(buf):
+        replay, offset = Replay.read(buf, offset)
+        yield replay
+
+def load_replays(filename: str) -> list[Replay]:
+    """Load all the replays of a file."""
+    with open(filename, "rb") as f:
+        return list(iter_replays(f.read()))
+
+def append_replay(filename: str, replay: Replay) -> None:
+    """Append a replay at the end of a file."""
+    with open(filename, "ab") as f:
+        f.write(replay.to_bytes())
+
+class ReplayWriter:
+    """
+    Append replays to a file from a background thread.
+
+    The game loop only queues the replay of each finished game. The thread
+    encodes and appends all the replays queued since its last write at once.
+    Replays that could not be appended are kept and appended again with the
+    next ones, until the writer is closed.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Start the writer thread."""
+        self._filename = filename
+        self._queue: queue.SimpleQueue[Replay | None] = queue.SimpleQueue()
+        self._unsaved: list[Replay] = [] # Replays the last write failed on
+        self._error: OSError | None = None # Last failure to write
+        self._thread = threading.Thread(target = self._run,
+                                        name = "replay-writer", daemon = True)
+        self._thread.start()
+
+    @property
+    def filename(self) -> str:
+        """File where the replays are appended."""
+        return self._filename
+
+    @property
+    def error(self) -> OSError | None:
+        """Last failure to append replays, if any."""
+        return self._error
+
+    def submit(self, replay: Replay) -> None:
+        """Schedule the append of a replay. Never blocks on disk."""
+        self._queue.put(replay)
+
+    def close(self) -> list[Replay]:
+        """
+        Append the queued replays and stop the thread.
+
+        Returns the replays that could not be appended.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self._unsaved
+
+    def _run(self) -> None:
+        """Append replays as they are submitted, until closed."""
+        closed = False
+        while not closed:
+            replays = [self._queue.get()]
+            try:
+                while True:
+                    replays.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            closed = None in replays
+            replays = self._unsaved + [r for r in replays if r is not None]
+            if not replays:
+                continue
+            try:
+                with open(self._filename, "ab") as f:
+                    f.write(b"".join(r.to_bytes() for r in replays))
+            except OSError as e:
+                self._error = e
+                self._unsaved = replays
+            else:
+                self._unsaved = []
+
+def main() -> None:
+    """Entry point of snake-replay: check recorded games, without display."""
+    parser = argparse.ArgumentParser(
+            description = "Play recorded Snake games again, without display,"
+            " and check their final score.")
+    parser.add_argument("files", nargs = "+", help="Replay files.")
+    args = parser.parse_args()
+
+    failures = 0
+    try:
+        for filename in args.files:
+            for i, replay in enumerate(load_replays(filename)):
+                state = replay.play()
+                ok = (state.score == replay.score
+                      and state.tick == replay.ticks)
+                failures += not ok
+                print(f"{filename}[{i}] seed={replay.seed}"
+                      f" ticks={state.tick} score={state.score}"
+                      f" {'OK' if ok else 'MISMATCH'}")
+    except (OSError, SnakeError) as e:
+        print(f"Error: {e}")
+        raise SystemExit(1) from e
+    if failures:
+        raise SystemExit(1)
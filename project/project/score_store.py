@@ -0,0 +1,406 @@
+import abc
+import contextlib
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import typing
+import yaml
+from schema import Schema, And
+from .exceptions import ScoreStoreError
+from .leaderboard import Leaderboard
+from .score import Score
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: files are still replaced atomically, but not locked
+    fcntl = None
+
+DEFAULT_MAX_SCORES = 5
+LOCK_SUFFIX = ".lock"
+
+# libyaml is much faster than the pure Python loader and dumper, when installed
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Schema of the score files
+SCORE_SCHEMA = Schema({
+    "name": And(str, lambda s: len(s) <= Score.MAX_LENGTH),  # Name must be <= 8 characters
+    "score": int  # Score must be an integer
+})
+SCORES_SCHEMA = Schema({
+    "max_scores": And(int, lambda n: n > 0),  # max_scores must be a positive integer
+    "scores": [SCORE_SCHEMA]
+})
+# Schema of the score files, without checking the scores one by one
+SCORES_LIST_SCHEMA = Schema({
+    "max_scores": And(int, lambda n: n > 0),
+    "scores": list
+})
+
+
+def file_mode(filename: str) -> int:
+    """Return the permissions of a file, or the ones a new file would get from the umask."""
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_atomic(filename: str, write: typing.Callable[[typing.TextIO], None]) -> None:
+    """
+    Write a file through a temporary file, so that readers never see a partial file.
+
+    The file keeps its permissions: the temporary file would only be readable by its owner.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        os.chmod(tmp, file_mode(filename))
+        with os.fdopen(fd, "w") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@contextlib.contextmanager
+def file_lock(filename: str) -> typing.Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a file shared by several processes.
+
+    The lock is taken on a separate lock file, since the file itself is replaced on each write.
+    """
+    with open(filename + LOCK_SUFFIX, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def file_stamp(filename: str) -> tuple[int, int, int] | None:
+    """Return what changes when a file is replaced or modified, None if it does not exist."""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class ScoreStore(abc.ABC):
+    """
+    Storage of the best score of each player, shared by several game instances.
+
+    A store remembers what it last read or wrote, so that changes() only returns what other
+    instances changed since.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Initialize the store."""
+        self._filename = filename
+        self._stamp = None  # Stamp of the file when it was last read or written
+
+    @property
+    def filename(self) -> str:
+        """Return the file name."""
+        return self._filename
+
+    def exists(self) -> bool:
+        """Tell if the store has been created."""
+        return os.path.exists(self._filename)
+
+    @abc.abstractmethod
+    def read(self) -> tuple[int, list[Score]]:
+        """Read the number of high scores and all the scores. Raise FileNotFoundError if there is no store."""
+        raise NotImplementedError
+
+    def read_top(self) -> tuple[int, list[Score]]:
+        """Read the number of high scores and the high scores only. Raise FileNotFoundError if there is no store."""
+        max_scores, scores = self.read()
+        return max_scores, Leaderboard(scores).top(max_scores)
+
+    def get(self, name: str) -> int | None:
+        """Read the best score of a player, None if the player has no score."""
+        return Leaderboard(self.read()[1]).get(name)
+
+    def rank(self, name: str) -> int | None:
+        """Read the rank of a player (1 for the best), None if the player has no score."""
+        return Leaderboard(self.read()[1]).rank(name)
+
+    @abc.abstractmethod
+    def _changes(self) -> list[Score]:
+        """Return the scores changed since the last read, write or call."""
+        raise NotImplementedError
+
+    def changes(self) -> list[Score]:
+        """Return the scores changed since the last read, write or call. Cheap if nothing changed."""
+        stamp = file_stamp(self._filename)
+        if stamp is None or stamp == self._stamp:
+            return []
+        self._stamp = stamp
+        return self._changes()
+
+    @abc.abstractmethod
+    def merge(self, scores: typing.Iterable[Score], max_scores: int = DEFAULT_MAX_SCORES) -> list[Score]:
+        """
+        Save scores, keeping the best one of each player, without losing the scores saved by others.
+
+        max_scores is only used when the store is created. Return all the scores changed since the
+        last read, write or call to changes(), including the new ones.
+        """
+        raise NotImplementedError
+
+
+class FileStore(ScoreStore):
+    """Store rewriting a whole file on each save, under a file lock."""
+
+    def __init__(self, filename: str) -> None:
+        """Initialize the store."""
+        super().__init__(filename)
+        self._known: dict[str, int] = {}  # Scores of the file when it was last read or written
+
+    @abc.abstractmethod
+    def _load(self, f: typing.TextIO) -> typing.Any:
+        """Parse the content of the file."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _dump(self, data: dict, f: typing.TextIO) -> None:
+        """Write the content of the file."""
+        raise NotImplementedError
+
+    def _parse(self) -> typing.Any:
+        """Parse the file, and remember its stamp."""
+        stamp = file_stamp(self._filename)
+        with open(self._filename, "r") as f:
+            data = self._load(f)
+        self._stamp = stamp
+        return data
+
+    def _read(self) -> tuple[int, list[Score]]:
+        """Read and validate the file."""
+        data = self._parse()
+
+        # Validate the data against the schema
+        SCORES_SCHEMA.validate(data)
+
+        scores = [Score(score=item["score"], name=item["name"]) for item in data["scores"]]
+        return data["max_scores"], scores
+
+    def _diff(self, scores: typing.Iterable[Score]) -> list[Score]:
+        """Return the scores that are not known yet, and remember them."""
+        changed = [s for s in scores if self._known.get(s.name) != s.score]
+        self._known.update((s.name, s.score) for s in changed)
+        return changed
+
+    def read(self) -> tuple[int, list[Score]]:
+        """Read the number of high scores and all the scores."""
+        max_scores, scores = self._read()
+        self._known = {s.name: s.score for s in scores}
+        return max_scores, scores
+
+    def _is_known(self, item: typing.Any) -> bool:
+        """Tell if an entry of the file is a score already known, and valid as such."""
+        if type(item) is not dict or item.keys() != {"name", "score"}:
+            return False
+        name, score = item["name"], item["score"]
+        return type(name) is str and type(score) is int and self._known.get(name) == score
+
+    def _validate(self, data: typing.Any) -> list[Score]:
+        """
+        Validate the content of the file, but only check one by one the scores not known yet.
+
+        The whole file has to be parsed, since other instances rewrite it whole, but the scores
+        that did not change are only compared with the known ones.
+        """
+        SCORES_LIST_SCHEMA.validate(data)
+        scores = []
+        for item in data["scores"]:
+            if not self._is_known(item):
+                SCORE_SCHEMA.validate(item)
+            scores.append(Score(score=item["score"], name=item["name"]))
+        return scores
+
+    def _changes(self) -> list[Score]:
+        """Parse the file again. It is replaced atomically, so no lock is needed."""
+        return self._diff(self._validate(self._parse()))
+
+    def merge(self, scores: typing.Iterable[Score], max_scores: int = DEFAULT_MAX_SCORES) -> list[Score]:
+        """Merge scores into the file (read-merge-write cycle under the file lock)."""
+        with file_lock(self._filename):
+            current = []
+            if self.exists():
+                data = self._parse()
+                current = self._validate(data)
+                max_scores = data["max_scores"]
+            leaderboard = Leaderboard(current)
+            changed = False
+            for score in scores:
+                changed |= leaderboard.add(score)
+            if changed or not current:
+                data = {
+                    "max_scores": max_scores,
+                    "scores": [{"name": s.name, "score": s.score} for s in leaderboard],
+                }
+                write_atomic(self._filename, lambda f: self._dump(data, f))
+                self._stamp = file_stamp(self._filename)
+        return self._diff(leaderboard)
+
+
+class YamlStore(FileStore):
+    """Scores in a YAML file."""
+
+    def _load(self, f: typing.TextIO) -> typing.Any:
+        """Parse the content of the file."""
+        return yaml.load(f, Loader=YamlLoader)
+
+    def _dump(self, data: dict, f: typing.TextIO) -> None:
+        """Write the content of the file."""
+        yaml.dump(data, f, Dumper=YamlDumper)
+
+
+class JsonStore(FileStore):
+    """Scores in a JSON file."""
+
+    def _load(self, f: typing.TextIO) -> typing.Any:
+        """Parse the content of the file."""
+        return json.load(f)
+
+    def _dump(self, data: dict, f: typing.TextIO) -> None:
+        """Write the content of the file."""
+        json.dump(data, f, indent=1)
+
+
+class SqliteStore(ScoreStore):
+    """
+    Scores in an SQLite database, indexed on score.
+
+    Each row carries the version of the save that last changed it, so that saves only touch the
+    changed rows and other instances only read those.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS scores (name TEXT PRIMARY KEY, score INTEGER NOT NULL,
+                                           version INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS scores_score ON scores (score DESC);
+        CREATE INDEX IF NOT EXISTS scores_version ON scores (version);
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Initialize the store."""
+        super().__init__(filename)
+        self._version = 0  # Version of the last changes read
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, in autocommit mode: transactions are explicit."""
+        return sqlite3.connect(self._filename, timeout=30, isolation_level=None)
+
+    def read(self) -> tuple[int, list[Score]]:
+        """Read the number of high scores and all the scores."""
+        if not self.exists():
+            raise FileNotFoundError(self._filename)
+        stamp = file_stamp(self._filename)
+        with contextlib.closing(self._connect()) as db:
+            db.execute("BEGIN")
+            row = db.execute("SELECT value FROM meta WHERE key = 'max_scores'").fetchone()
+            rows = db.execute("SELECT name, score, version FROM scores ORDER BY score DESC").fetchall()
+            db.execute("COMMIT")
+        self._stamp = stamp
+        self._version = max((v for _, _, v in rows), default=0)
+        return (DEFAULT_MAX_SCORES if row is None else row[0]), [Score(score=s, name=n) for n, s, _ in rows]
+
+    def read_top(self) -> tuple[int, list[Score]]:
+        """Read the number of high scores and the high scores only, through the index on scores."""
+        if not self.exists():
+            raise FileNotFoundError(self._filename)
+        stamp = file_stamp(self._filename)
+        with contextlib.closing(self._connect()) as db:
+            db.execute("BEGIN")
+            row = db.execute("SELECT value FROM meta WHERE key = 'max_scores'").fetchone()
+            max_scores = DEFAULT_MAX_SCORES if row is None else row[0]
+            rows = db.execute("SELECT name, score FROM scores ORDER BY score DESC, name LIMIT ?",
+                              (max_scores,)).fetchall()
+            version = db.execute("SELECT MAX(version) FROM scores").fetchone()[0]
+            db.execute("COMMIT")
+        self._stamp = stamp
+        self._version = version or 0
+        return max_scores, [Score(score=s, name=n) for n, s in rows]
+
+    def get(self, name: str) -> int | None:
+        """Read the best score of a player."""
+        with contextlib.closing(self._connect()) as db:
+            row = db.execute("SELECT score FROM scores WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def rank(self, name: str) -> int | None:
+        """Read the rank of a player, counting the better players through the index on scores."""
+        with contextlib.closing(self._connect()) as db:
+            row = db.execute(
+                "SELECT (SELECT COUNT(*) FROM scores AS o WHERE o.score > s.score"
+                " OR (o.score = s.score AND o.name < s.name)) + 1 FROM scores AS s WHERE name = ?",
+                (name,),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _changes(self) -> list[Score]:
+        """Read the rows changed since the last version read."""
+        with contextlib.closing(self._connect()) as db:
+            return self._fetch_changes(db)
+
+    def _fetch_changes(self, db: sqlite3.Connection) -> list[Score]:
+        """Read the rows changed since the last version read, using the index on versions."""
+        rows = db.execute("SELECT name, score, version FROM scores WHERE version > ?", (self._version,)).fetchall()
+        self._version = max((v for _, _, v in rows), default=self._version)
+        return [Score(score=s, name=n) for n, s, _ in rows]
+
+    def merge(self, scores: typing.Iterable[Score], max_scores: int = DEFAULT_MAX_SCORES) -> list[Score]:
+        """Upsert the scores that beat the saved ones, in one transaction."""
+        stamp = file_stamp(self._filename)  # Before the transaction, not to miss later changes by others
+        with contextlib.closing(self._connect()) as db:
+            db.executescript(self.SCHEMA)
+            db.execute("BEGIN IMMEDIATE")  # Take the write lock now, to number the version safely
+            try:
+                db.execute("INSERT OR IGNORE INTO meta VALUES ('max_scores', ?)", (max_scores,))
+                version = db.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM scores").fetchone()[0]
+                db.executemany(
+                    "INSERT INTO scores VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE"
+                    " SET score = excluded.score, version = excluded.version"
+                    " WHERE excluded.score > scores.score",
+                    ((s.name, s.score, version) for s in scores),
+                )
+                changed = self._fetch_changes(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        self._stamp = stamp
+        return changed
+
+
+# Backend of each file extension
+STORES: dict[str, type[ScoreStore]] = {
+    ".yaml": YamlStore,
+    ".yml": YamlStore,
+    ".json": JsonStore,
+    ".db": SqliteStore,
+    ".sqlite": SqliteStore,
+    ".sqlite3": SqliteStore,
+}
+
+
+def open_store(filename: str) -> ScoreStore:
+    """Return the store of a score file, chosen by its extension."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in STORES:
+        raise ScoreStoreError(filename, sorted(STORES))
+    return STORES[ext](filename)
@@ -1,79 +1,183 @@
+import sqlite3
+import threading
 import yaml
-from schema import Schema, And, SchemaError
+from schema import SchemaError
+from .leaderboard import Leaderboard
 from .score import Score
+from .score_store import DEFAULT_MAX_SCORES, ScoreStore, open_store
 import typing
 
+REFRESH_PERIOD = 1.0  # Seconds between two checks for changes made by other instances
+
+
+class ScoresWriter:
+    """
+    Save scores from a background thread, and watch the store for scores saved by other instances.
+
+    Scores submitted while a save is pending are merged into the same save. Stores merge saved scores
+    with the ones already there, so that no instance loses the updates of the others. Scores that
+    could not be saved are kept and saved again later, until the writer is closed.
+    """
+
+    def __init__(self, store: ScoreStore, max_scores: int = DEFAULT_MAX_SCORES,
+                 refresh_period: float = REFRESH_PERIOD) -> None:
+        """Start the writer thread."""
+        self._store = store
+        self._max_scores = max_scores  # Number of high scores, if the writer creates the store
+        self._refresh_period = refresh_period
+        self._cond = threading.Condition()
+        self._pending: dict[str, int] = {}  # Best new score of each player
+        self._update: list[Score] = []  # Scores changed in the store, not taken yet
+        self._closed = False
+        self._error: Exception | None = None  # Last failure to save scores
+        self._thread = threading.Thread(target=self._run, name="scores-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, score: Score) -> None:
+        """Schedule the save of a score. Never blocks on disk."""
+        with self._cond:
+            if score.score > self._pending.get(score.name, score.score - 1):
+                self._pending[score.name] = score.score
+            self._cond.notify()
+
+    def take_update(self) -> list[Score]:
+        """Return the scores changed in the store since the last call."""
+        with self._cond:
+            update, self._update = self._update, []
+        return update
+
+    def close(self) -> list[Score]:
+        """Write pending scores and stop the thread. Return the scores that could not be saved."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        unsaved = [Score(score=score, name=name) for name, score in self._pending.items()]
+        if unsaved:
+            print(f"Could not save {len(unsaved)} score(s) to {self._store.filename}: {self._error}")
+        return unsaved
+
+    def _run(self) -> None:
+        """Write scores as they are submitted, and check the store for changes in between."""
+        while True:
+            with self._cond:
+                if not self._pending and not self._closed:
+                    self._cond.wait(self._refresh_period)
+                if not self._pending and self._closed:
+                    return
+                closed = self._closed  # Closing was requested before this attempt
+                pending, self._pending = self._pending, {}
+            try:
+                if pending:
+                    changed = self._store.merge((Score(score=score, name=name) for name, score in pending.items()),
+                                                max_scores=self._max_scores)
+                else:
+                    changed = self._store.changes()
+            except (OSError, sqlite3.Error, yaml.YAMLError, ValueError, SchemaError) as e:
+                print(f"Error while updating {self._store.filename}: {e}")
+                with self._cond:
+                    # Keep the scores not saved, unless better ones were submitted since
+                    for name, score in pending.items():
+                        if score > self._pending.get(name, score - 1):
+                            self._pending[name] = score
+                    self._error = e
+                    if closed:
+                        return  # Even the last attempt, made after close, failed
+                    if not self._closed:
+                        self._cond.wait(self._refresh_period)  # Try again later, or at close
+                continue
+            if changed:
+                with self._cond:
+                    self._update.extend(changed)
+
 
 class Scores:
-    """Contains instances of scores and handles persistence with a YAML file."""
+    """
+    Contains the best score of every player and handles persistence with a score store.
+
+    Only the max_scores best ones are high scores, shown in the game.
+    """
 
-    def __init__(self, max_scores: int, scores: list[Score]) -> None:
+    def __init__(self, max_scores: int, scores: typing.Iterable[Score]) -> None:
         """Initialize the scores."""
         self._max_scores = max_scores
-        self._scores = sorted(scores, reverse=True)[:max_scores]
+        self._leaderboard = Leaderboard(scores)
+        self._writer: ScoresWriter | None = None
+
+    @property
+    def max_scores(self) -> int:
+        """Return the number of high scores."""
+        return self._max_scores
+
+    @property
+    def writer(self) -> "ScoresWriter | None":
+        """Background writer used to save changes, if any."""
+        return self._writer
+
+    @writer.setter
+    def writer(self, writer: "ScoresWriter | None") -> None:
+        """Save changes in the background with this writer."""
+        self._writer = writer
+
+    @property
+    def leaderboard(self) -> Leaderboard:
+        """Best score of every player."""
+        return self._leaderboard
 
     def __iter__(self) -> typing.Iterator[Score]:
-        """Iterate over the list of scores."""
-        return iter(self._scores)
+        """Iterate over the high scores."""
+        return iter(self._leaderboard.top(self._max_scores))
+
+    def entries(self) -> typing.Iterator[Score]:
+        """Iterate over the scores of all players, best first."""
+        return iter(self._leaderboard)
 
     def is_highscore(self, score_player: int) -> bool:
         """Check if a player's score qualifies as a high score."""
-        return len(self._scores) < self._max_scores or score_player > self._scores[-1].score
+        return self._leaderboard.is_highscore(score_player, self._max_scores)
+
+    def merge(self, scores: typing.Iterable[Score]) -> bool:
+        """Merge scores, keeping the best one of each player. Return True if the scores changed."""
+        changed = False
+        for score in scores:
+            changed |= self._leaderboard.add(score)
+        return changed
 
     def add_score(self, score_player: Score) -> None:
         """Add a new score or update the existing one."""
-        existing_player = next((s for s in self._scores if s.name == score_player.name), None)
-        if existing_player:
-            # Update the score if the new score is higher
-            if score_player.score > existing_player.score:
-                existing_player._score = score_player.score
-                self._scores.sort(reverse=True)
-                self.save()
-        else:
-            # Add a new score if it's a high score
-            if self.is_highscore(score_player.score):
-                if len(self._scores) >= self._max_scores:
-                    self._scores.pop()
-                self._scores.append(score_player)
-                self._scores.sort(reverse=True)
+        if self._leaderboard.add(score_player):
+            if self._writer is not None:
+                self._writer.submit(score_player)
+            else:
                 self.save()
 
+    def poll(self) -> None:
+        """Merge the scores saved by other instances since the last call. Never blocks on disk."""
+        if self._writer is not None:
+            self.merge(self._writer.take_update())
+
     @staticmethod
-    def load(filename: str = "high_scores.yaml") -> "Scores":
-        """Load scores from a YAML file or create a file with default scores if it doesn't exist."""
-        # Define the schema for validation
-        score_schema = Schema({
-            "max_scores": And(int, lambda n: n > 0),  # max_scores must be a positive integer
-            "scores": [
-                {
-                    "name": And(str, lambda s: len(s) <= 8),  # Name must be <= 8 characters
-                    "score": int  # Score must be an integer
-                }
-            ]
-        })
+    def read(store: ScoreStore) -> "Scores":
+        """Read and validate the high scores of a store."""
+        max_scores, scores = store.read_top()
+        return Scores(max_scores, scores)
 
+    @staticmethod
+    def load(source: "str | ScoreStore" = "high_scores.yaml") -> "Scores":
+        """Load scores from a score file (YAML, JSON or SQLite) or use default scores if it doesn't exist."""
+        store = open_store(source) if isinstance(source, str) else source
+        filename = store.filename
         try:
-            with open(filename, "r") as f:
-                data = yaml.safe_load(f)
-
-                # Validate the data against the schema
-                score_schema.validate(data)
-
-                max_scores = data.get("max_scores", 5)
-                scores = [
-                    Score(score=item["score"], name=item["name"])
-                    for item in data.get("scores", [])
-                ]
-                return Scores(max_scores, scores)
+            return Scores.read(store)
         except FileNotFoundError:
             print(f"File {filename} not found, creating a new file with default scores.")
-            return Scores.default(max_scores=5)
+            return Scores.default(max_scores=DEFAULT_MAX_SCORES)
         except SchemaError as e:
             print(f"Schema validation error in {filename}: {e}")
-            return Scores.default(max_scores=5)
+            return Scores.default(max_scores=DEFAULT_MAX_SCORES)
         except Exception as e:
             print(f"Error while loading {filename}: {e}")
-            return Scores.default(max_scores=5)
+            return Scores.default(max_scores=DEFAULT_MAX_SCORES)
 
     @staticmethod
     def default(max_scores: int) -> "Scores":
@@ -89,11 +193,6 @@ class Scores:
         )
 
     def save(self, filename: str = "high_scores.yaml") -> None:
-        """Save the current scores to a YAML file."""
-        data = {
-            "max_scores": self._max_scores,
-            "scores": [{"name": s.name, "score": s.score} for s in self._scores],
-        }
-        with open(filename, "w") as f:
-            yaml.dump(data, f)
-            print(f"Scores saved to {filename}.")
+        """Merge the current scores into a score file, keeping the scores saved there by others."""
+        self.merge(open_store(filename).merge(self.entries(), max_scores=self._max_scores))
+        print(f"Scores saved to {filename}.")
@@ -0,0 +1,269 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+import json
+import os
+import random
+import typing
+
+# First party
+from .archive import ReplayArchive
+from .cmd_line import (
+    DEFAULT_HEIGHT,
+    DEFAULT_WIDTH,
+    MAX_HEIGHT,
+    MAX_WIDTH,
+    MIN_HEIGHT,
+    MIN_WIDTH,
+)
+from .dir import Dir
+from .engine import Engine
+from .exceptions import IntRangeError, SnakeError
+from .replay import MAX_SEED
+from .snake import SK_START_LENGTH
+
+# Simulation constants
+DEFAULT_GAMES = 1000
+DEFAULT_MAX_TICKS = 10000 # A game still running after that is stopped
+DEFAULT_CHUNK_SIZE = 50 # Number of games sent to a worker at once
+CAUSE_TIMEOUT = "timeout"
+
+# An agent chooses the next action of a game, None to keep going straight
+Agent = typing.Callable[[Engine, random.Random], Dir | None]
+
+def random_agent(engine: Engine, rng: random.Random) -> Dir | None: # noqa: ARG001
+    """Turn in a random direction, one time out of four."""
+    return rng.choice(list(Dir)) if rng.random() < 0.25 else None # noqa: PLR2004
+
+def greedy_agent(engine: Engine, rng: random.Random) -> Dir | None:
+    """Move towards the fruit, avoiding cells where the game would end."""
+    board = engine.board
+    snake = engine.snake
+    head = snake.head
+    fruit = engine.state.fruit
+    best: list[Dir] = []
+    best_dist = None
+    for d in Dir:
+        x, y = head.x + d.x, head.y + d.y
+
+        # Skip moves that end the game
+        if not (0 <= x < board.nb_cols and 0 <= y < board.nb_lines):
+            if snake.gameover_on_exit:
+                continue
+            x, y = x % board.nb_cols, y % board.nb_lines
+        if board.occupant(x, y) is snake:
+            continue
+
+        # Keep the moves getting the closest to the fruit
+        dist = 0 if fruit is None else abs(fruit[0] - x) + abs(fruit[1] - y)
+        if best_dist is None or dist < best_dist:
+            best, best_dist = [d], dist
+        elif dist == best_dist:
+            best.append(d)
+    return rng.choice(best) if best else None
+
+AGENTS: dict[str, Agent] = {"random": random_agent, "greedy": greedy_agent}
+
+@dataclasses.dataclass(frozen = True)
+class SimConfig:
+    """Settings shared by all the games of a simulation."""
+
+    width: int = DEFAULT_WIDTH
+    height: int = DEFAULT_HEIGHT
+    start_length: int = SK_START_LENGTH
+    gameover_on_exit: bool = False
+    agent: str = "greedy"
+    max_ticks: int = DEFAULT_MAX_TICKS
+
+@dataclasses.dataclass(frozen = True)
+class GameResult:
+    """Outcome of one simulated game."""
+
+    seed: int
+    score: int
+    ticks: int
+    cause: str
+
+def play_game(engine: Engine, agent: Agent, seed: int,
+              max_ticks: int) -> GameResult:
+    """Play one game with an agent, until it ends or max_ticks is reached."""
+    rng = random.Random(seed)
+    state = engine.reset(seed)
+    done = False
+    while not done and state.tick < max_ticks:
+        state, _, done = engine.step(agent(engine, rng))
+    return GameResult(seed = seed, score = state.score, ticks = state.tick,
+                      cause = state.cause if done else CAUSE_TIMEOUT)
+
+def run_games(config: SimConfig, seeds: list[int], *, record: bool = False,
+              ) -> list[tuple[GameResult, bytes | None]]:
+    """
+    Play a list of seeded games. Runs in a worker process.
+
+    Each result comes with the encoded replay of the game if record is set.
+    """
+    engine = Engine(config.width, config.height,
+                    start_length = config.start_length,
+                    gameover_on_exit = config.gameover_on_exit,
+                    record = record)
+    agent = AGENTS[config.agent]
+    results = []
+    for seed in seeds:
+        result = play_game(engine, agent, seed, config.max_ticks)
+        results.append((result, engine.replay.to_bytes() if record else None))
+    return results
+
+class SimStats:
+    """Aggregated results of a simulation, updated as games finish."""
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        self._results: list[GameResult] = []
+        self._causes: collections.Counter[str] = collections.Counter()
+        self._total_score = 0
+        self._total_ticks = 0
+        self._max_score = None
+
+    def add(self, result: GameResult) -> None:
+        """Account for a finished game."""
+        self._results.append(result)
+        self._causes[result.cause] += 1
+        self._total_score += result.score
+        self._total_ticks += result.ticks
+        if self._max_score is None or result.score > self._max_score:
+            self._max_score = result.score
+
+    @property
+    def results(self) -> list[GameResult]:
+        """Results of all finished games, in order of completion."""
+        return self._results
+
+    def summary(self) -> dict[str, typing.Any]:
+        """Summary of the simulation."""
+        n = len(self._results)
+        return {
+            "games": n,
+            "mean_score": self._total_score / n if n else None,
+            "max_score": self._max_score,
+            "mean_ticks": self._total_ticks / n if n else None,
+            "causes": dict(self._causes),
+        }
+
+def simulate(config: SimConfig, seeds: list[int], *,
+             workers: int | None = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             archive: ReplayArchive | None = None) -> SimStats:
+    """
+    Spread games over a pool of processes and aggregate their results.
+
+    If an archive is given, the replays of all games are appended to it, in
+    order of completion.
+    """
+    stats = SimStats()
+    record = archive is not None
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers = workers) as pool:
+        futures = [pool.submit(run_games, config, chunk, record = record)
+                   for chunk in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            for result, replay in future.result():
+                stats.add(result)
+                if replay is not None:
+                    archive.append_bytes(replay, seed = result.seed,
+                                         score = result.score,
+                                         ticks = result.ticks)
+    return stats
+
+def read_sim_args() -> argparse.Namespace:
+    """Read command line arguments of the simulation."""
+    parser = argparse.ArgumentParser(
+            description = "Play batches of headless Snake games.",
+            formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--games", "-n", type = int, default = DEFAULT_GAMES,
+                        help="Number of games to play.")
+    parser.add_argument("--seed", type = int, default = 0,
+                        help="Seed of the first game, the next ones follow."
+                        f" Must be between 0 and {MAX_SEED}.")
+    parser.add_argument("--height", "-H", type = int, default = DEFAULT_HEIGHT,
+                        help="Number of lines of the checkerboard."
+                        f" Must be between {MIN_HEIGHT} and {MAX_HEIGHT}.")
+    parser.add_argument("--width", "-W", type = int, default = DEFAULT_WIDTH,
+                        help="Number of columns of the checkerboard."
+                        f" Must be between {MIN_WIDTH} and {MAX_WIDTH}.")
+    parser.add_argument("--start-length", type = int, default = SK_START_LENGTH,
+                        help="Length of the snake at start.")
+    parser.add_argument("--gameover-on-exit", action = "store_true",
+                        help="Exiting the board ends the game.")
+    parser.add_argument("--agent", choices = sorted(AGENTS), default = "greedy",
+                        help="Agent playing the games.")
+    parser.add_argument("--max-ticks", type = int, default = DEFAULT_MAX_TICKS,
+                        help="Stop games still running after that many ticks.")
+    parser.add_argument("--workers", "-j", type = int, default = os.cpu_count(),
+                        help="Number of worker processes.")
+    parser.add_argument("--chunk-size", type = int, default = DEFAULT_CHUNK_SIZE,
+                        help="Number of games sent to a worker at once.")
+    parser.add_argument("--output", "-o",
+                        help="Write the summary and all results to this JSON"
+                        " file.")
+    parser.add_argument("--archive", "-a",
+                        help="Append the replays of all games to this"
+                        " archive.")
+    args = parser.parse_args()
+
+    # Check integer range
+    max_length = min(args.width, args.height) // 2
+    for chk in [{"lbl": "Width", "val": args.width,
+                 "min": MIN_WIDTH, "max": MAX_WIDTH},
+                {"lbl": "Height", "val": args.height,
+                 "min": MIN_HEIGHT, "max": MAX_HEIGHT},
+                {"lbl": "Start length", "val": args.start_length,
+                 "min": 1, "max": max_length},
+                {"lbl": "Games", "val": args.games,
+                 "min": 1, "max": 10 ** 9},
+                {"lbl": "Seed", "val": args.seed,
+                 "min": 0, "max": MAX_SEED + 1 - args.games},
+                {"lbl": "Workers", "val": args.workers,
+                 "min": 1, "max": 1024},
+                {"lbl": "Chunk size", "val": args.chunk_size,
+                 "min": 1, "max": 10 ** 6},
+                ]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return args
+
+def main() -> None:
+    """Entry point of snake-sim."""
+    try:
+        args = read_sim_args()
+    except SnakeError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1) from e
+
+    config = SimConfig(width = args.width, height = args.height,
+                       start_length = args.start_length,
+                       gameover_on_exit = args.gameover_on_exit,
+                       agent = args.agent, max_ticks = args.max_ticks)
+    seeds = list(range(args.seed, args.seed + args.games))
+    archive = None if args.archive is None else ReplayArchive(args.archive)
+    try:
+        stats = simulate(config, seeds, workers = args.workers,
+                         chunk_size = args.chunk_size, archive = archive)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    summary = stats.summary()
+    print(json.dumps(summary, indent = 2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": dataclasses.asdict(config),
+                       "summary": summary,
+                       "results": [dataclasses.asdict(r)
+                                   for r in sorted(stats.results,
+                                                   key = lambda r: r.seed)]},
+                      f)
@@ -1,22 +1,21 @@
 # ruff: noqa: D100,S311
 
 # Standard
+import collections
 import random
 import typing
 
-# Third party
-import pygame
-
 # First party
 from project.dir import Dir  
-from project.exceptions import GameOver
+from project.events import Collision, EventBus, MoveEnded, OutOfBoard
+from project.exceptions import BoardExit, GameOver
 from project.fruit import Fruit
 from project.game_object import GameObject
-from project.tile import Tile
+from project.tile import Color, Tile
 
 # Constants
-DEF_HEAD_COLOR = pygame.Color("green")
-DEF_BODY_COLOR = pygame.Color("darkgreen")
+DEF_HEAD_COLOR = "green"
+DEF_BODY_COLOR = "darkgreen"
 SK_START_LENGTH = 3
 
 class Snake(GameObject):
@@ -26,7 +25,8 @@ class Snake(GameObject):
                  gameover_on_exit: bool = False) -> None:
         """Object initialization."""
         super().__init__()
-        self._tiles = tiles
+        self._tiles = collections.deque(tiles)
+        self._cells = set(tiles) # For self-collision checks
         self._dir = direction
         self._length = len(tiles)
         self._gameover_on_exit = gameover_on_exit
@@ -41,6 +41,11 @@ class Snake(GameObject):
         """Iterator on the tiles."""
         return iter(self._tiles)
 
+    @property
+    def head(self) -> Tile:
+        """The head of the snake."""
+        return self._tiles[0]
+
     @property
     def score(self) -> int :
         """Score of the player."""
@@ -55,17 +60,67 @@ class Snake(GameObject):
     def dir(self, direction: Dir) -> None:
         self._dir = direction
 
+    @property
+    def gameover_on_exit(self) -> bool:
+        """Tell if exiting the board ends the game."""
+        return self._gameover_on_exit
+
     def notify_out_of_board(self, width: int, height: int) -> None:
         """Snake has exited the board."""
         if self._gameover_on_exit:
-            raise GameOver
+            raise BoardExit
 
         # Only the head has exited
-        self._tiles[0].x = self._tiles[0].x % width
-        self._tiles[0].y = self._tiles[0].y % height
+        head = self._tiles[0]
+        self._cells.discard(head)
+        head.x = head.x % width
+        head.y = head.y % height
+        self._cells.add(head)
+
+    def attach_bus(self, bus: EventBus) -> None:
+        """Send the events of the snake to a bus, and handle its events."""
+        super().attach_bus(bus)
+        bus.subscribe(OutOfBoard, self._on_out_of_board)
+        bus.subscribe(Collision, self._on_collision)
+        bus.subscribe(MoveEnded, self._on_move_ended)
+
+    def detach_bus(self, bus: EventBus) -> None:
+        """Stop sending and handling the events of a bus."""
+        super().detach_bus(bus)
+        bus.unsubscribe(OutOfBoard, self._on_out_of_board)
+        bus.unsubscribe(Collision, self._on_collision)
+        bus.unsubscribe(MoveEnded, self._on_move_ended)
+
+    def _on_out_of_board(self, event: OutOfBoard) -> None:
+        """Wrap around the board, then move the head to its new cell."""
+        if event.obj is self:
+            self.notify_out_of_board(event.width, event.height)
+            for obs in self.observers:
+                obs.notify_object_moved(self)
+
+    def _on_collision(self, event: Collision) -> None:
+        """Handle a collision of the head."""
+        if event.obj is self:
+            self.notify_collision(event.other)
+
+    def _on_move_ended(self, event: MoveEnded) -> None:
+        """Remove tail tiles, once the snake has grown if it ate."""
+        if event.obj is not self or len(self._tiles) <= self._length:
+            return
+        released = []
+        while len(self._tiles) > self._length:
+            tail = self._tiles.pop()
+            self._cells.discard(tail)
+            released.append(tail)
+        for obs in self.observers:
+            obs.notify_tiles_released(self, released)
 
     def notify_collision(self, obj: GameObject) -> None:
         """Notify that an object collides with another."""
+        # Bit itself after wrapping around the board
+        if obj is self:
+            raise GameOver
+
         if isinstance(obj, Fruit):
 
             # Grow
@@ -76,48 +131,55 @@ class Snake(GameObject):
                 obs.notify_object_eaten(obj)
 
     def move(self) -> None:
-        """Let the snake advance."""
+        """
+        Let the snake advance.
+
+        The consequences of the move (board exit, collisions, fruit eaten,
+        tail removed) are handled when the events of the tick are dispatched.
+        """
         # Create new head
         new_head = self._tiles[0] + self._dir
 
         # Slither on itself?
-        if new_head in self._tiles:
+        if new_head in self._cells:
             raise GameOver
 
         # Current head changes color
         self._tiles[0].color = self._tiles[-1].color
 
         # Insert new head
-        self._tiles.insert(0, new_head)
+        self._tiles.appendleft(new_head)
+        self._cells.add(new_head)
 
-        # Notify movement
+        # Notify movement, then the end of the move to remove tail tiles
+        # after the snake has grown
         for obs in self.observers:
             obs.notify_object_moved(self)
-
-        # Remove queue tiles if needed
-        if len(self._tiles) > self._length:
-            del self._tiles[self._length:]
+        for obs in self.observers:
+            obs.notify_move_ended(self)
 
     # Create a Snake at random position on the board
     @classmethod
     def create_random(cls, nb_lines: int, nb_cols: int, # noqa: PLR0913
-                      length: int,
+                      length: int, rng: random.Random,
                       *,
-                      head_color: pygame.Color = DEF_HEAD_COLOR,
-                      body_color: pygame.Color = DEF_BODY_COLOR,
+                      head_color: Color = DEF_HEAD_COLOR,
+                      body_color: Color = DEF_BODY_COLOR,
                       gameover_on_exit: bool = False) -> typing.Self:
-        """Create a snake and place it randomly on the board."""
+        """
+        Create a snake and place it randomly on the board.
+
+        Draws from the random generator of the game.
+        """
         tiles = [] # List of tuples (col_index, line_index)
 
         # Choose head
-        random.seed()
-        x = random.randint(length - 1, nb_cols - length)
-        y = random.randint(length - 1, nb_lines - length)
+        x = rng.randint(length - 1, nb_cols - length)
+        y = rng.randint(length - 1, nb_lines - length)
         tiles.append(Tile(x, y, head_color))
 
         # Choose body orientation (i.e.: in which direction the snake will move)
-        random.seed()
-        snake_dir = random.sample([Dir.LEFT, Dir.RIGHT, Dir.UP, Dir.DOWN], 1)[0]
+        snake_dir = rng.sample([Dir.LEFT, Dir.RIGHT, Dir.UP, Dir.DOWN], 1)[0]
 
         # Create body
         while len(tiles) < length:
@@ -1,5 +1,8 @@
 # ruff: noqa: D100,S311
 
+# Standard
+import typing
+
 # First party
 from .observer import Observer
 
@@ -10,18 +13,20 @@ class Subject:
     def __init__(self) -> None:
         """Object initialization."""
         super().__init__()
-        self._observers: list[Observer] = []
+        # Observers in order of attachment, as dict keys to detach in
+        # constant time
+        self._observers: dict[Observer, None] = {}
 
     @property
-    def observers(self) -> list[Observer]:
-        """List of observers."""
-        return self._observers
+    def observers(self) -> typing.Iterable[Observer]:
+        """Observers, in order of attachment."""
+        return self._observers.keys()
 
     def attach_obs(self, obs: Observer) -> None:
         """Attach an observer."""
-        self._observers.append(obs)
+        self._observers[obs] = None
 
     def detach_obs(self, obs: Observer) -> None:
         """Detach an observer."""
-        self._observers.remove(obs)
+        del self._observers[obs]
 
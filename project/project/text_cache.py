@@ -0,0 +1,64 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+
+# Third party
+import pygame
+
+# First party
+from .tile import Color
+
+DEFAULT_MAX_ENTRIES = 256
+
+class TextCache:
+    """
+    Rendered text surfaces, so that static text is rasterized once.
+
+    Surfaces are keyed by font, text, color and antialiasing, and the least
+    recently used ones are dropped when the cache is full.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Object initialization."""
+        self._max_entries = max_entries
+        self._surfaces: collections.OrderedDict[
+            tuple[pygame.font.Font, str, tuple[int, int, int, int], bool],
+            pygame.Surface] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        """Number of cached surfaces."""
+        return len(self._surfaces)
+
+    @property
+    def hits(self) -> int:
+        """Number of renders served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of texts actually rendered."""
+        return self._misses
+
+    def render(self, font: pygame.font.Font, text: str, color: Color,
+               antialias: bool = True) -> pygame.Surface:
+        """Render a text, or return the surface already rendered."""
+        key = (font, text, tuple(pygame.Color(color)), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self._misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self._max_entries:
+            self._surfaces.popitem(last = False)
+        return surface
+
+    def clear(self) -> None:
+        """Drop all the cached surfaces."""
+        self._surfaces.clear()
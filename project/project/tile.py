@@ -1,20 +1,36 @@
 # ruff: noqa: D100,S311
 
-# Third party
-import pygame
+# Standard
+import typing
 
 # First party
+from .constants import MAX_WIDTH
 from .dir import Dir
 
+if typing.TYPE_CHECKING:
+    import pygame
+
+# Anything pygame accepts as a color: name, "#rrggbb", RGB tuple, pygame.Color.
+# The game rules never look inside, so they do not need pygame.
+Color: typing.TypeAlias = "str | tuple[int, int, int] | pygame.Color"
+
+
+# Stride used to turn coordinates into an integer for hashing: the power of two
+# above the widest board, so that tiles of a line, even one column out of the
+# board, never hash like tiles of another line.
+HASH_STRIDE = 1 << (MAX_WIDTH + 1).bit_length()
 
 class Tile:
     """
     A square tile in the game.
 
-    Includes a color.
+    Includes a color, shared by reference between all the tiles of the same
+    role (snake body, fruit, ...).
     """
 
-    def __init__(self, x: int, y: int, color: pygame.Color) -> None:
+    __slots__ = ("_color", "_x", "_y")
+
+    def __init__(self, x: int, y: int, color: Color) -> None:
         """Object initialization."""
         self._x = x # Column index
         self._y = y # Line index
@@ -41,15 +57,19 @@ class Tile:
         self._y = value
 
     @property
-    def color(self) -> pygame.Color:
+    def color(self) -> Color:
         """The color of the tile."""
         return self._color
 
     @color.setter
-    def color(self, color: pygame.Color) -> None:
+    def color(self, color: Color) -> None:
         """Change the color of the tile."""
         self._color = color
 
+    def cell(self, nb_cols: int) -> int:
+        """Integer id of the cell under this tile on a board of nb_cols."""
+        return self._y * nb_cols + self._x
+
     def __eq__(self, other: object) -> bool:
         """
         Check if two tiles are equal.
@@ -60,23 +80,38 @@ class Tile:
             return self._x == other._x and self._y == other._y
         return False
 
+    def __hash__(self) -> int:
+        """
+        Hash the tile on its coordinates.
+
+        Beware that moving a tile changes its hash: take it out of any set or
+        dict before.
+        """
+        return self._y * HASH_STRIDE + self._x
+
     def __add__(self, other: object) -> "Tile":
         """Add two tiles together or a tile with a direction."""
         if isinstance(other, (Tile, Dir)):
-            return Tile(x = self.x + other.x, y = self.y + other.y,
-                        color = self.color)
+            return Tile(self._x + other.x, self._y + other.y, self._color)
         msg = f"Wrong object type {type(object)}."
         raise ValueError(msg)
 
     def __sub__(self, other: object) -> "Tile":
         """Substract a tile or a direction to this tile."""
         if isinstance(other, (Tile, Dir)):
-            return Tile(x = self.x - other.x, y = self.y - other.y,
-                        color = self.color)
+            return Tile(self._x - other.x, self._y - other.y, self._color)
         msg = f"Wrong object type {type(object)}."
         raise ValueError(msg)
 
-    def draw(self, screen: pygame.Surface, size: int) -> None:
-        """Draw the tile on screen."""
-        rect = pygame.Rect(self.x * size, self.y * size, size, size)
-        pygame.draw.rect(screen, self.color, rect)
+    def draw(self, screen: "pygame.Surface", size: int,
+             origin: tuple[int, int] = (0, 0)) -> None:
+        """
+        Draw the tile on screen.
+
+        The origin is the cell shown in the top-left corner of the screen.
+        """
+        import pygame # Only needed for drawing, not by headless games
+
+        rect = pygame.Rect((self._x - origin[0]) * size,
+                           (self._y - origin[1]) * size, size, size)
+        pygame.draw.rect(screen, self._color, rect)
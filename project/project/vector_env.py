@@ -0,0 +1,195 @@
+# ruff: noqa: D100,S311
+
+# Third party
+import numpy as np
+
+# First party
+from .dir import Dir
+from .engine import REWARD_DEATH, REWARD_FRUIT
+from .snake import SK_START_LENGTH
+
+# Actions, as indexes in this tuple. A negative action keeps the direction.
+ACTIONS = (Dir.UP, Dir.DOWN, Dir.LEFT, Dir.RIGHT)
+_DX = np.array([d.x for d in ACTIONS], dtype = np.int64)
+_DY = np.array([d.y for d in ACTIONS], dtype = np.int64)
+
+# Cell values in observations
+EMPTY = 0
+BODY = 1
+HEAD = 2
+FRUIT = 3
+
+class VectorSnakeEnv:
+    """
+    N independent games of snake, stepped all at once with NumPy.
+
+    Follows the rules of Engine: running into the board edge wraps around
+    unless gameover_on_exit is set, running into the body (tail included)
+    ends the game, eating a fruit grows the snake by one on the same tick.
+    A game that ends is immediately reset, and the observation returned for it
+    is the one of the new game.
+    """
+
+    def __init__(self, nb_games: int, width: int, height: int, *,
+                 start_length: int = SK_START_LENGTH,
+                 gameover_on_exit: bool = False) -> None:
+        """Object initialization."""
+        self._n = nb_games
+        self._width = width
+        self._height = height
+        self._nb_cells = width * height
+        self._start_length = start_length
+        self._gameover_on_exit = gameover_on_exit
+        self._rng = np.random.default_rng()
+        self._all = np.arange(nb_games)
+
+        # Occupancy grids, flattened on cell ids (y * width + x)
+        self._occ = np.zeros((nb_games, self._nb_cells), dtype = bool)
+
+        # Bodies as ring buffers of cell ids: the head is at _head_ptr and the
+        # tail _length - 1 slots before
+        self._body = np.zeros((nb_games, self._nb_cells), dtype = np.int32)
+        self._head_ptr = np.zeros(nb_games, dtype = np.int64)
+        self._length = np.zeros(nb_games, dtype = np.int64)
+
+        self._hx = np.zeros(nb_games, dtype = np.int64)
+        self._hy = np.zeros(nb_games, dtype = np.int64)
+        self._dir = np.zeros(nb_games, dtype = np.int64)
+        self._fruit = np.zeros(nb_games, dtype = np.int64)
+        self._ticks = np.zeros(nb_games, dtype = np.int64)
+        self._final_scores = np.zeros(nb_games, dtype = np.int64)
+        self._final_ticks = np.zeros(nb_games, dtype = np.int64)
+
+    @property
+    def nb_games(self) -> int:
+        """Number of games."""
+        return self._n
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Current score of each game."""
+        return self._length - self._start_length
+
+    @property
+    def final_scores(self) -> np.ndarray:
+        """Score of the last finished game, for each game slot."""
+        return self._final_scores
+
+    @property
+    def final_ticks(self) -> np.ndarray:
+        """Number of ticks of the last finished game, for each game slot."""
+        return self._final_ticks
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        """Start all games again. Returns the observations."""
+        self._rng = np.random.default_rng(seed)
+        self._reset_games(self._all)
+        return self.observe()
+
+    def observe(self) -> np.ndarray:
+        """Get the boards, as an array of shape (nb_games, height, width)."""
+        obs = self._occ.astype(np.int8)
+        obs[self._all, self._fruit] = FRUIT
+        obs[self._all, self._hy * self._width + self._hx] = HEAD
+        return obs.reshape(self._n, self._height, self._width)
+
+    def _reset_games(self, idx: np.ndarray) -> None:
+        """Place a new snake and a new fruit in some games."""
+        k = len(idx)
+        length = self._start_length
+        x = self._rng.integers(length - 1, self._width - length + 1, k)
+        y = self._rng.integers(length - 1, self._height - length + 1, k)
+        d = self._rng.integers(0, len(ACTIONS), k)
+
+        self._occ[idx] = False
+        for i in range(length):
+            cells = (y - i * _DY[d]) * self._width + (x - i * _DX[d])
+            self._body[idx, length - 1 - i] = cells
+            self._occ[idx, cells] = True
+
+        self._head_ptr[idx] = length - 1
+        self._length[idx] = length
+        self._hx[idx] = x
+        self._hy[idx] = y
+        self._dir[idx] = d
+        self._ticks[idx] = 0
+        self._spawn_fruits(idx)
+
+    def _spawn_fruits(self, idx: np.ndarray) -> np.ndarray:
+        """
+        Put a fruit on a random free cell in some games.
+
+        Returns the mask of the games whose board is full.
+        """
+        draw = self._rng.random((len(idx), self._nb_cells))
+        draw[self._occ[idx]] = -1.0
+        cells = draw.argmax(axis = 1)
+        self._fruit[idx] = cells
+        return draw[np.arange(len(idx)), cells] < 0
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray,
+                                                 np.ndarray]:
+        """
+        Advance all games by one tick.
+
+        Actions are indexes in ACTIONS, one per game. Returns the
+        observations, the rewards and the mask of games that ended.
+        """
+        actions = np.asarray(actions)
+        self._dir = np.where(actions >= 0, actions, self._dir)
+        nx = self._hx + _DX[self._dir]
+        ny = self._hy + _DY[self._dir]
+        rewards = np.zeros(self._n, dtype = np.int64)
+
+        # Board exit
+        out = (nx < 0) | (nx >= self._width) | (ny < 0) | (ny >= self._height)
+        if self._gameover_on_exit:
+            dead = out
+        else:
+            dead = np.zeros(self._n, dtype = bool)
+        nx %= self._width
+        ny %= self._height
+        cells = ny * self._width + nx
+
+        # Self collision (the tail has not moved yet)
+        dead |= self._occ[self._all, cells]
+        alive = self._all[~dead]
+        eaten = np.zeros(self._n, dtype = bool)
+        eaten[alive] = cells[alive] == self._fruit[alive]
+
+        # Tails of snakes that did not eat, read before the ring moves on
+        movers = self._all[~dead & ~eaten]
+        tails = self._body[movers, (self._head_ptr[movers]
+                                    - self._length[movers] + 1)
+                           % self._nb_cells]
+
+        # Move heads forward
+        self._hx[alive] = nx[alive]
+        self._hy[alive] = ny[alive]
+        self._head_ptr[alive] = (self._head_ptr[alive] + 1) % self._nb_cells
+        self._body[alive, self._head_ptr[alive]] = cells[alive]
+        self._occ[alive, cells[alive]] = True
+
+        # Drop tails of snakes that did not eat, grow the others
+        self._occ[movers, tails] = False
+        eaters = self._all[eaten]
+        self._length[eaters] += 1
+        rewards[eaters] += REWARD_FRUIT
+        rewards[dead] += REWARD_DEATH
+        self._ticks += 1
+
+        # New fruits, a full board is a win
+        won = np.zeros(self._n, dtype = bool)
+        if len(eaters):
+            won[eaters] = self._spawn_fruits(eaters)
+
+        # Restart finished games
+        done = dead | won
+        ended = self._all[done]
+        if len(ended):
+            self._final_scores[ended] = (self._length[ended]
+                                         - self._start_length)
+            self._final_ticks[ended] = self._ticks[ended]
+            self._reset_games(ended)
+
+        return self.observe(), rewards, done
@@ -1,6 +1,7 @@
 # Import des bibliothèques requises 
 import pygame
 import argparse
+import collections
 import random
 
 # Définition des différentes tailles
@@ -32,24 +33,28 @@ class Checkerboard:
 # Classe pour le serpent 
 class Snake:
     def __init__(self, initial_position, drawer):
-        self.position = initial_position
+        self.position = collections.deque(initial_position)
+        self.cells = set(initial_position)  # Cases occupées, pour tester les collisions en O(1)
         self.drawer = drawer
         self.direction = (1, 0)  # Le serpent commence par aller vers la droite
         self.grow_next = False  # Indique si le serpent doit grandir au prochain déplacement
+        self.bit_itself = False  # Indique si le serpent s'est mordu la queue
 
     def move(self):  # Déplacements du serpent en fonction de la direction
         head_x, head_y = self.position[0]
         new_head = (head_x + self.direction[0], head_y + self.direction[1])
 
-        # Ajout de la nouvelle tête
-        self.position = [new_head] + self.position
-
         # Si le serpent doit grandir, on ne supprime pas la queue
         if not self.grow_next:
-            self.position.pop()
+            self.cells.discard(self.position.pop())
         else:
             self.grow_next = False  # Réinitialiser après avoir grandi
 
+        # Ajout de la nouvelle tête
+        self.bit_itself = new_head in self.cells
+        self.position.appendleft(new_head)
+        self.cells.add(new_head)
+
     def grow(self):  # Signaler que le serpent doit grandir
         self.grow_next = True
 
@@ -111,6 +116,11 @@ def snake():
     fruit_count = 0
     clock = pygame.time.Clock()
 
+    # Police chargée une seule fois, et texte du score rendu seulement quand il change
+    font = pygame.font.SysFont("Arial", 28)
+    score_text = None
+    score_shown = None
+
     # Boucle principale
     running = True
     while running:
@@ -139,7 +149,7 @@ def snake():
         # Vérification des collisions avec les bords ou soi-même
         head_x, head_y = snake.position[0]
         if head_x < 0 or head_x >= width // SQUARE_SIZE or head_y < 0 or head_y >= height // SQUARE_SIZE or \
-           len(snake.position) != len(set(snake.position)):
+           snake.bit_itself:
             print("Game Over! Score:", fruit_count)
             running = False
 
@@ -149,8 +159,9 @@ def snake():
         fruit.draw()
 
         # Pour afficher le score
-        font = pygame.font.SysFont("Arial", 28)
-        score_text = font.render(f"Fruits mangés: {fruit_count}", True, (0, 0, 255))
+        if score_shown != fruit_count:
+            score_text = font.render(f"Fruits mangés: {fruit_count}", True, (0, 0, 255))
+            score_shown = fruit_count
         screen.blit(score_text, (10, 10))
 
         pygame.display.flip()
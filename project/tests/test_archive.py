@@ -0,0 +1,120 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import pathlib
+import sys
+
+# Third party
+import pytest
+
+# First party
+from project.archive import ArchiveReader, ReplayArchive, main
+from project.cmd_line import MIN_HEIGHT, MIN_WIDTH, read_args
+from project.engine import Engine
+from project.exceptions import IntRangeError
+from project.replay import MAX_SEED, Replay
+from project.simulation import play_game, random_agent, read_sim_args
+
+def record_game(seed: int) -> Replay:
+    """Play a game with the random agent and return its replay."""
+    engine = Engine(MIN_WIDTH, MIN_HEIGHT, record = True)
+    play_game(engine, random_agent, seed, 2000)
+    return engine.replay
+
+@pytest.mark.parametrize("seed", [0, 2 ** 32, MAX_SEED])
+def test_largest_seeds(seed: int) -> None:
+    """Seeds up to MAX_SEED are stored and played again."""
+    replay = record_game(seed)
+    decoded = Replay.from_bytes(replay.to_bytes())
+    assert decoded == replay
+    state = decoded.play()
+    assert (state.score, state.tick) == (replay.score, replay.ticks)
+
+def test_archive_round_trip(tmp_path: pathlib.Path) -> None:
+    """Archived replays are found through the index."""
+    filename = str(tmp_path / "games.snka")
+    replays = [record_game(seed) for seed in (*range(10), MAX_SEED)]
+    with ReplayArchive(filename) as archive:
+        for replay in replays[:5]:
+            archive.append(replay)
+    with ReplayArchive(filename) as archive: # Appending to an archive
+        for replay in replays[5:]:
+            archive.append_bytes(replay.to_bytes(), seed = replay.seed,
+                                 score = replay.score, ticks = replay.ticks)
+
+    with ArchiveReader(filename) as reader:
+        assert len(reader) == len(replays)
+        for i, replay in enumerate(replays):
+            entry = reader.entry(i)
+            assert (entry.seed, entry.score, entry.ticks) == (
+                replay.seed, replay.score, replay.ticks)
+            assert reader.replay(i) == replay
+        best = max(r.score for r in replays)
+        assert replays[reader.top(1)[0]].score == best
+        assert reader.select(lambda e: e.seed == MAX_SEED) == [10]
+        with pytest.raises(IndexError):
+            reader.entry(len(replays))
+
+def test_empty_archive(tmp_path: pathlib.Path) -> None:
+    """An archive without replays can be read."""
+    filename = str(tmp_path / "empty.snka")
+    ReplayArchive(filename).close()
+    with ArchiveReader(filename) as reader:
+        assert len(reader) == 0
+        assert reader.top(3) == []
+
+def test_check(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+               capsys: pytest.CaptureFixture) -> None:
+    """snake-archive check plays a game again, comparing score and ticks."""
+    filename = str(tmp_path / "games.snka")
+    replay = record_game(1)
+    assert replay.play().done
+    with ReplayArchive(filename) as archive:
+        archive.append(replay)
+        replay.moves.append(0) # Same score, one tick after the end
+        archive.append(replay)
+
+    monkeypatch.setattr(sys, "argv", ["snake-archive", "check", filename,
+                                      "0"])
+    main()
+    assert capsys.readouterr().out.endswith(" OK\n")
+    monkeypatch.setattr(sys, "argv", ["snake-archive", "check", filename,
+                                      "1"])
+    with pytest.raises(SystemExit):
+        main()
+    assert capsys.readouterr().out.endswith(" MISMATCH\n")
+
+@pytest.mark.parametrize(("seed", "games", "ok"), [
+    (0, 1, True),
+    (MAX_SEED, 1, True),
+    (MAX_SEED - 9, 10, True),
+    (MAX_SEED - 8, 10, False),
+    (-1, 1, False),
+])
+def test_sim_seed_range(monkeypatch: pytest.MonkeyPatch, seed: int,
+                        games: int, ok: bool) -> None:
+    """Simulated games only use seeds that replays can store."""
+    monkeypatch.setattr(sys, "argv", ["snake-sim", "--seed", str(seed),
+                                      "--games", str(games)])
+    if ok:
+        assert read_sim_args().seed == seed
+    else:
+        with pytest.raises(IntRangeError):
+            read_sim_args()
+
+@pytest.mark.parametrize(("seed", "ok"), [
+    (0, True),
+    (MAX_SEED, True),
+    (MAX_SEED + 1, False),
+    (-1, False),
+])
+def test_game_seed_range(monkeypatch: pytest.MonkeyPatch, seed: int,
+                         ok: bool) -> None:
+    """The seed of a game must fit in its replay."""
+    monkeypatch.setattr(sys, "argv", ["snake", "--seed", str(seed)])
+    if ok:
+        assert read_args().seed == seed
+    else:
+        with pytest.raises(IntRangeError):
+            read_args()
+
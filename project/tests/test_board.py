@@ -0,0 +1,134 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import random
+
+# Third party
+import pytest
+
+# First party
+from project.board import Board
+from project.checkerboard import Checkerboard
+from project.dir import Dir
+from project.engine import Engine
+from project.exceptions import BoardFull
+from project.fruit import Fruit
+from project.game_object import GameObject
+from project.simulation import greedy_agent
+from project.snake import Snake
+from project.tile import Tile
+
+WIDTH = 24
+HEIGHT = 12
+COLOR = "black"
+
+def scan(board: Board) -> dict[tuple[int, int], GameObject]:
+    """Objects standing on each cell, found by looking at all the tiles."""
+    return {(t.x, t.y): obj for obj in board.objects
+            if not obj.is_background() for t in obj.tiles}
+
+def test_occupancy_follows_objects() -> None:
+    """The object found on each cell is the one whose tile stands there."""
+    engine = Engine(WIDTH, HEIGHT)
+    board = engine.board
+    board.add_object(Checkerboard(HEIGHT, WIDTH)) # Not indexed
+    engine.reset(2)
+    rng = random.Random(0)
+    for i in range(500):
+        if engine.step(greedy_agent(engine, rng))[2]:
+            engine.reset(i)
+        occupied = scan(board)
+        assert {(x, y): board.occupant(x, y) for x in range(WIDTH)
+                for y in range(HEIGHT)
+                if board.occupant(x, y) is not None} == occupied
+        assert board.nb_free_cells == WIDTH * HEIGHT - len(occupied)
+    assert board.occupant(-1, 0) is None
+    assert board.occupant(WIDTH, 0) is None
+
+def test_collides() -> None:
+    """Objects sharing a cell with an object collide with it."""
+    board = Board(screen = None, nb_lines = HEIGHT, nb_cols = WIDTH,
+                  tile_size = 0)
+    snake = Snake([Tile(3, 5, COLOR), Tile(2, 5, COLOR), Tile(1, 5, COLOR)],
+                  Dir.RIGHT)
+    fruit = Fruit(Tile(8, 5, COLOR))
+    board.add_object(snake)
+    board.add_object(fruit)
+    assert list(board.collides(snake)) == []
+    assert list(board.collides(Fruit(Tile(2, 5, COLOR)))) == [snake]
+    assert list(board.collides(Fruit(Tile(8, 5, COLOR)))) == [fruit]
+
+    board.remove_object(fruit)
+    assert board.occupant(8, 5) is None
+    assert list(board.collides(Fruit(Tile(8, 5, COLOR)))) == []
+
+def test_wrapped_head_indexed() -> None:
+    """A head wrapping around the board takes the cell on the other side."""
+    board = Board(screen = None, nb_lines = HEIGHT, nb_cols = WIDTH,
+                  tile_size = 0)
+    snake = Snake([Tile(WIDTH - 1, 5, COLOR), Tile(WIDTH - 2, 5, COLOR),
+                   Tile(WIDTH - 3, 5, COLOR)], Dir.RIGHT)
+    board.add_object(snake)
+    snake.move()
+    board.dispatch()
+    assert board.occupant(0, 5) is snake
+    assert board.occupant(WIDTH - 3, 5) is None # Tail released
+    assert scan(board) == {(0, 5): snake, (WIDTH - 1, 5): snake,
+                           (WIDTH - 2, 5): snake}
+
+def free_cells(board: Board) -> set[tuple[int, int]]:
+    """Cells without any object, found by looking at all the tiles."""
+    return {(x, y) for x in range(board.nb_cols)
+            for y in range(board.nb_lines)} - set(scan(board))
+
+def fill(board: Board, cells: list[tuple[int, int]]) -> None:
+    """Cover cells with the tiles of one object."""
+    board.add_object(Snake([Tile(x, y, COLOR) for x, y in cells], Dir.RIGHT))
+
+def test_fruit_on_last_free_cell() -> None:
+    """The last free cell gets the fruit, then the board is full."""
+    board = Board(screen = None, nb_lines = 3, nb_cols = 4, tile_size = 0,
+                  rng = random.Random(0))
+    fill(board, [(x, y) for x in range(4) for y in range(3)
+                 if (x, y) != (2, 1)])
+    assert board.nb_free_cells == 1
+    board.create_fruit()
+    assert isinstance(board.occupant(2, 1), Fruit)
+    assert board.nb_free_cells == 0
+    with pytest.raises(BoardFull):
+        board.create_fruit()
+
+@pytest.mark.parametrize(("nb_cols", "nb_lines"), [(WIDTH, HEIGHT),
+                                                   (200, 100)])
+def test_fruits_on_free_cells(nb_cols: int, nb_lines: int) -> None:
+    """Fruits only spawn on free cells, including on crowded large boards."""
+    board = Board(screen = None, nb_lines = nb_lines, nb_cols = nb_cols,
+                  tile_size = 0, rng = random.Random(1))
+    cells = [(x, y) for y in range(nb_lines) for x in range(nb_cols)]
+    random.Random(2).shuffle(cells)
+    fill(board, cells[:len(cells) * 99 // 100]) # Crowded: the pool is used
+    free = free_cells(board)
+    while free:
+        before = list(board.objects)
+        board.create_fruit()
+        fruit, = (o for o in board.objects if o not in before)
+        cell = (fruit.head.x, fruit.head.y)
+        assert cell in free
+        free.remove(cell)
+        assert board.nb_free_cells == len(free)
+    with pytest.raises(BoardFull):
+        board.create_fruit()
+
+def test_same_seed_same_fruits() -> None:
+    """After a clear, fruits only depend on the random draws."""
+    board = Board(screen = None, nb_lines = HEIGHT, nb_cols = WIDTH,
+                  tile_size = 0, rng = random.Random())
+    runs = []
+    for _ in range(2):
+        board.clear()
+        board._rng.seed(5) # noqa: SLF001
+        fill(board, [(x, 3) for x in range(10)])
+        for _ in range(20):
+            board.create_fruit()
+        runs.append(set(scan(board)))
+    assert runs[0] == runs[1]
@@ -0,0 +1,76 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import random
+
+# Third party
+import pytest
+
+# First party
+from project.board import CHUNK_SIZE, Board
+from project.camera import Camera
+from project.dir import Dir
+from project.snake import Snake
+from project.tile import Tile
+
+COLOR = "black"
+
+def test_view_clamped() -> None:
+    """The view is never larger than the board, nor out of it."""
+    camera = Camera(100, 50, 20, 10)
+    assert camera.scrolls()
+    assert camera.center(0, 0) is False # Already in the corner
+    assert camera.area == (0, 0, 20, 10)
+    assert camera.center(99, 49)
+    assert camera.area == (80, 40, 100, 50)
+    assert camera.center(50, 25)
+    assert camera.origin == (40, 20)
+    assert camera.contains(40, 20)
+    assert not camera.contains(60, 20)
+
+    small = Camera(10, 8, 20, 10)
+    assert (small.view_cols, small.view_lines) == (10, 8)
+    assert not small.scrolls()
+    assert small.center(5, 4) is False
+
+def test_follow_margin() -> None:
+    """The view only scrolls when the cell gets within the margin."""
+    camera = Camera(100, 50, 20, 10, margin = 3)
+    camera.center(50, 25)
+    assert camera.origin == (40, 20)
+    for x in range(43, 57):
+        assert camera.follow(x, 25) is False
+    assert camera.follow(57, 25)
+    assert camera.origin == (41, 20)
+    assert camera.follow(40, 22)
+    assert camera.origin == (37, 19)
+
+    # Keeps the cell in view, even far away
+    assert camera.follow(5, 48)
+    assert camera.contains(5, 48)
+    assert camera.origin == (2, 40)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_tiles_in_like_scan(seed: int) -> None:
+    """The tiles found through the chunks are the ones in the area."""
+    rng = random.Random(seed)
+    nb_cols, nb_lines = 5 * CHUNK_SIZE + 3, 3 * CHUNK_SIZE + 7
+    board = Board(screen = None, nb_lines = nb_lines, nb_cols = nb_cols,
+                  tile_size = 0)
+    cells = rng.sample([(x, y) for x in range(nb_cols)
+                        for y in range(nb_lines)], 2000)
+    snake = Snake([Tile(x, y, COLOR) for x, y in cells], Dir.RIGHT)
+    board.add_object(snake)
+    board.remove_object(snake) # Emptied chunks are forgotten
+    assert list(board.tiles_in(0, 0, nb_cols, nb_lines)) == []
+    board.add_object(snake)
+
+    for _ in range(200):
+        x0 = rng.randrange(-5, nb_cols)
+        y0 = rng.randrange(-5, nb_lines)
+        x1 = rng.randrange(x0 + 1, nb_cols + 6)
+        y1 = rng.randrange(y0 + 1, nb_lines + 6)
+        found = [(t.x, t.y) for t in board.tiles_in(x0, y0, x1, y1)]
+        assert len(found) == len(set(found))
+        assert set(found) == {(x, y) for x, y in cells
+                              if x0 <= x < x1 and y0 <= y < y1}
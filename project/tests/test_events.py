@@ -0,0 +1,110 @@
+# ruff: noqa: D100,S101,S311
+
+# Third party
+import pytest
+
+# First party
+from project.board import Board
+from project.dir import Dir
+from project.events import (
+    Collision,
+    EventBus,
+    MoveEnded,
+    ObjectEaten,
+    ObjectMoved,
+    TilesReleased,
+)
+from project.exceptions import GameOver
+from project.fruit import Fruit
+from project.snake import Snake
+from project.tile import Tile
+
+COLOR = "black"
+
+def test_children_before_queued_events() -> None:
+    """Events published by a handler are dispatched before later events."""
+    bus = EventBus()
+    a, b = Fruit(Tile(0, 0, COLOR)), Fruit(Tile(1, 0, COLOR))
+    log = []
+
+    def on_moved(event: ObjectMoved) -> None:
+        log.append(("moved", event.obj))
+        bus.publish(Collision(event.obj, other = event.obj))
+        bus.publish(ObjectEaten(event.obj))
+
+    def on_collision(event: Collision) -> None:
+        log.append(("collision", event.obj))
+        bus.publish(MoveEnded(event.obj)) # Grandchild
+
+    bus.subscribe(ObjectMoved, on_moved)
+    bus.subscribe(Collision, on_collision)
+    bus.subscribe(ObjectEaten, lambda e: log.append(("eaten", e.obj)))
+    bus.subscribe(MoveEnded, lambda e: log.append(("ended", e.obj)))
+    bus.notify_object_moved(a)
+    bus.notify_object_moved(b)
+    assert log == []
+    bus.dispatch()
+    assert log == [("moved", a), ("collision", a), ("ended", a), ("eaten", a),
+                   ("moved", b), ("collision", b), ("ended", b), ("eaten", b)]
+    assert bus.counts == {"ObjectMoved": 2, "Collision": 2, "MoveEnded": 2,
+                          "ObjectEaten": 2}
+
+def test_handlers_in_subscription_order() -> None:
+    """Handlers of an event are called in the order they subscribed."""
+    bus = EventBus()
+    log = []
+    first = lambda e: log.append(1) # noqa: E731
+    second = lambda e: log.append(2) # noqa: E731
+    bus.subscribe(MoveEnded, first)
+    bus.subscribe(MoveEnded, second)
+    bus.subscribe(MoveEnded, first) # Already subscribed
+    bus.notify_move_ended(Fruit(Tile(0, 0, COLOR)))
+    bus.dispatch()
+    assert log == [1, 2]
+
+    bus.unsubscribe(MoveEnded, first)
+    bus.notify_move_ended(Fruit(Tile(0, 0, COLOR)))
+    bus.dispatch()
+    assert log == [1, 2, 2]
+
+def test_failing_handler_keeps_queue() -> None:
+    """A handler raising stops the dispatch, the queue can be cleared."""
+    bus = EventBus()
+
+    def fail(event: ObjectMoved) -> None:
+        raise GameOver
+
+    bus.subscribe(ObjectMoved, fail)
+    bus.notify_object_moved(Fruit(Tile(0, 0, COLOR)))
+    bus.notify_move_ended(Fruit(Tile(0, 0, COLOR)))
+    with pytest.raises(GameOver):
+        bus.dispatch()
+    bus.clear()
+    bus.dispatch() # Nothing left
+    assert bus.counts == {"ObjectMoved": 1}
+
+def test_tick_order() -> None:
+    """During a tick, a fruit is eaten before the tail of the snake moves."""
+    board = Board(screen = None, nb_lines = 10, nb_cols = 10, tile_size = 0)
+    snake = Snake([Tile(3, 5, COLOR), Tile(2, 5, COLOR), Tile(1, 5, COLOR)],
+                  Dir.RIGHT)
+    board.add_object(snake)
+    board.add_object(Fruit(Tile(4, 5, COLOR)))
+    log = []
+    bus = board.events
+    for event_type in (ObjectMoved, Collision, ObjectEaten, MoveEnded,
+                       TilesReleased):
+        bus.subscribe(event_type,
+                      lambda e: log.append(type(e).__name__))
+
+    snake.move() # Eats the fruit
+    board.dispatch()
+    assert log == ["ObjectMoved", "Collision", "ObjectEaten", "MoveEnded"]
+    assert snake.length == 4 # noqa: PLR2004
+
+    log.clear()
+    snake.move()
+    board.dispatch()
+    assert log == ["ObjectMoved", "MoveEnded", "TilesReleased"]
+    assert [(t.x, t.y) for t in snake.tiles] == [(5, 5), (4, 5), (3, 5),
+                                                 (2, 5)]
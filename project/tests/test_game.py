@@ -0,0 +1,107 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import logging
+import pathlib
+import sys
+import typing
+
+# Third party
+import pygame
+import pytest
+
+# First party
+from project import game as game_module
+from project.exceptions import SnakeError
+from project.game import MAX_CATCH_UP, Game
+from project.state import State
+
+WIDTH = 24
+HEIGHT = 12
+TILE_SIZE = 4
+FPS = 10
+
+class FakeClock:
+    """Clock of pygame, spending frame_time on each frame."""
+
+    def __init__(self, now: list[float], frame_time: float) -> None:
+        """Object initialization. now[0] is the current time."""
+        self.now = now
+        self.frame_time = frame_time
+        self.waits: list[int] = [] # Frame rate asked on each frame
+
+    def tick(self, framerate: int = 0) -> int:
+        """Let a frame pass."""
+        self.waits.append(framerate)
+        self.now[0] += self.frame_time
+        return round(self.frame_time * 1000)
+
+def run_frames(game: Game, monkeypatch: pytest.MonkeyPatch, nb_frames: int,
+               frame_time: float) -> list[int]:
+    """Number of ticks played on each frame, on a fake clock."""
+    now = [100.0]
+    monkeypatch.setattr(game_module.time, "perf_counter", lambda: now[0])
+    game._clock = FakeClock(now, frame_time) # noqa: SLF001
+    game._last_time = now[0] # noqa: SLF001
+    return [game._wait_frame() for _ in range(nb_frames)] # noqa: SLF001
+
+@pytest.fixture
+def make_game(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+              ) -> typing.Iterator[typing.Callable[..., Game]]:
+    """Build games without display, saving their scores in tmp_path."""
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+
+    def make(**kwargs: object) -> Game:
+        kwargs.setdefault("scores", str(tmp_path / "scores.json"))
+        return Game(WIDTH, HEIGHT, TILE_SIZE, FPS, fruit_color = "red",
+                    snake_head_color = "green", snake_body_color = "yellow",
+                    gameover_on_exit = False,
+                    logger = logging.getLogger("test"), **kwargs)
+
+    yield make
+    pygame.quit()
+
+def test_array_renderer_without_numpy(make_game: typing.Callable[..., Game],
+                                      monkeypatch: pytest.MonkeyPatch,
+                                      ) -> None:
+    """The array renderer cannot be chosen without NumPy."""
+    monkeypatch.setitem(sys.modules, "numpy", None) # Import fails
+    monkeypatch.delitem(sys.modules, "project.array_renderer",
+                        raising = False)
+    game = make_game(renderer = "array")
+    with pytest.raises(SnakeError, match = "needs numpy"):
+        game.start()
+
+@pytest.mark.parametrize("render_fps", [FPS // 2, 15, 60, 144])
+def test_ticks_independent_of_frame_rate(
+        make_game: typing.Callable[..., Game],
+        monkeypatch: pytest.MonkeyPatch, render_fps: int) -> None:
+    """The game ticks at its own rate, whatever the frame rate."""
+    game = make_game(render_fps = render_fps)
+    game._state = State.PLAY # noqa: SLF001
+    ticks = run_frames(game, monkeypatch, render_fps * 3, 1 / render_fps)
+    assert sum(ticks) in (3 * FPS - 1, 3 * FPS) # Up to rounding
+    assert max(ticks) - min(ticks) <= 1 # Evenly spread
+    assert set(game._clock.waits) == {render_fps} # noqa: SLF001
+
+def test_late_frame_catch_up(make_game: typing.Callable[..., Game],
+                             monkeypatch: pytest.MonkeyPatch) -> None:
+    """A very late frame plays a few ticks, the rest of the delay is lost."""
+    game = make_game()
+    game._state = State.PLAY # noqa: SLF001
+    assert run_frames(game, monkeypatch, 2, 2.0) == [MAX_CATCH_UP,
+                                                     MAX_CATCH_UP]
+    assert game._lag == 0.0 # noqa: SLF001
+
+def test_turbo(make_game: typing.Callable[..., Game],
+               monkeypatch: pytest.MonkeyPatch) -> None:
+    """In turbo mode, frames are not waited for and play many ticks."""
+    game = make_game(turbo = True, render_every = 50)
+    game._state = State.PLAY # noqa: SLF001
+    assert run_frames(game, monkeypatch, 3, 0.001) == [50, 50, 50]
+    assert game._clock.waits == [0, 0, 0] # noqa: SLF001
+
+    # The game over screen lasts its normal time
+    game._state = State.GAMEOVER # noqa: SLF001
+    ticks = run_frames(game, monkeypatch, 60, 1 / 60)
+    assert sum(ticks) in (FPS - 1, FPS)
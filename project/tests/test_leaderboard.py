@@ -0,0 +1,75 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import random
+
+# Third party
+import pytest
+
+# First party
+from project.leaderboard import Leaderboard
+from project.score import Score
+
+BUCKET_SIZE = 4 # Small, to split buckets many times
+
+def expected(best: dict[str, int]) -> list[tuple[str, int]]:
+    """Players and scores, sorted like the leaderboard."""
+    return sorted(best.items(), key = lambda item: (-item[1], item[0]))
+
+def as_pairs(scores: list[Score]) -> list[tuple[str, int]]:
+    """Players and scores of a list of scores."""
+    return [(s.name, s.score) for s in scores]
+
+def check(board: Leaderboard, best: dict[str, int]) -> None:
+    """Compare a leaderboard with the best score of each player."""
+    ranking = expected(best)
+    assert len(board) == len(best)
+    assert as_pairs(list(board)) == ranking
+    for k in (0, 1, BUCKET_SIZE, 2 * BUCKET_SIZE + 1, len(best) + 1):
+        assert as_pairs(board.top(k)) == ranking[:k]
+    for rank, (name, score) in enumerate(ranking, 1):
+        assert board.rank(name) == rank
+        assert board.get(name) == score
+        assert board.score_at(rank) == score
+    assert board.score_at(len(best) + 1) is None
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_updates(seed: int) -> None:
+    """Ranks and top scores stay right while buckets split and empty."""
+    rng = random.Random(seed)
+    names = [f"p{i}" for i in range(60)]
+    initial = [Score(score = rng.randrange(100), name = rng.choice(names))
+               for _ in range(20)]
+    board = Leaderboard(initial, bucket_size = BUCKET_SIZE)
+    best: dict[str, int] = {}
+    for s in initial:
+        best[s.name] = max(best.get(s.name, s.score), s.score)
+    check(board, best)
+
+    for _ in range(300):
+        s = Score(score = rng.randrange(200), name = rng.choice(names))
+        changed = s.score > best.get(s.name, s.score - 1)
+        assert board.add(s) == changed
+        if changed:
+            best[s.name] = s.score
+    check(board, best)
+    assert len(board._buckets) > 1 # noqa: SLF001
+
+def test_ties_ordered_by_name() -> None:
+    """Players with the same score are ranked by name."""
+    board = Leaderboard(bucket_size = BUCKET_SIZE)
+    for name in ("eve", "bob", "dan", "amy", "cat"):
+        board.add(Score(score = 10, name = name))
+    board.add(Score(score = 11, name = "zed"))
+    assert [s.name for s in board] == ["zed", "amy", "bob", "cat", "dan",
+                                       "eve"]
+    assert board.rank("amy") == 2 # noqa: PLR2004
+    assert board.rank("nobody") is None
+
+def test_is_highscore() -> None:
+    """A score enters the top k if it beats the k-th one."""
+    board = Leaderboard([Score(score = s, name = f"p{s}") for s in range(10)],
+                        bucket_size = BUCKET_SIZE)
+    assert board.is_highscore(8, 3)
+    assert not board.is_highscore(7, 3)
+    assert board.is_highscore(0, 11)
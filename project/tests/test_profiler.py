@@ -0,0 +1,88 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import csv
+import itertools
+import json
+import pathlib
+
+# Third party
+import pytest
+
+# First party
+from project import profiler
+from project.profiler import (
+    PHASE_DRAW,
+    PHASE_FRAME,
+    PHASE_IDLE,
+    PHASE_MOVE,
+    FrameProfiler,
+    NullProfiler,
+    PhaseTimer,
+)
+
+def test_phase_timer() -> None:
+    """Percentiles of the recent samples, histogram of all of them."""
+    timer = PhaseTimer()
+    assert timer.percentiles() == {50: 0.0, 95: 0.0, 99: 0.0}
+    for i in range(1, 101):
+        timer.add(i * 1e-3)
+    assert timer.count == 100 # noqa: PLR2004
+    assert timer.percentiles() == pytest.approx({50: 0.051, 95: 0.095,
+                                                 99: 0.099})
+    summary = timer.summary()
+    assert summary["mean_ms"] == pytest.approx(50.5)
+    assert summary["max_ms"] == pytest.approx(100)
+    assert sum(b["count"] for b in summary["histogram"]) == 100 # noqa: PLR2004
+    assert summary["histogram"][0] == {"le_ms": pytest.approx(1.28),
+                                       "count": 1}
+
+    # Percentiles only look at the last samples
+    for _ in range(profiler.WINDOW):
+        timer.add(2.0)
+    assert timer.percentiles() == {50: 2.0, 95: 2.0, 99: 2.0}
+    assert timer.summary()["histogram"][-1] == {"le_ms": float("inf"),
+                                                "count": profiler.WINDOW}
+
+@pytest.fixture
+def frame_profiler(monkeypatch: pytest.MonkeyPatch) -> FrameProfiler:
+    """Profiler of three frames, with a clock ticking 1 ms per read."""
+    clock = itertools.count()
+    monkeypatch.setattr(profiler.time, "perf_counter",
+                        lambda: next(clock) * 1e-3)
+    prof = FrameProfiler()
+    for _ in range(3):
+        prof.lap(PHASE_IDLE)
+        prof.lap(PHASE_MOVE)
+        prof.lap(PHASE_DRAW)
+        prof.end_frame()
+    return prof
+
+def test_frame_profiler(frame_profiler: FrameProfiler) -> None:
+    """Each lap charges the time since the previous one to its phase."""
+    summary = frame_profiler.summary()
+    assert list(summary) == [PHASE_IDLE, PHASE_MOVE, PHASE_DRAW, PHASE_FRAME]
+    for phase in (PHASE_IDLE, PHASE_MOVE, PHASE_DRAW):
+        assert summary[phase]["count"] == 3 # noqa: PLR2004
+        assert summary[phase]["mean_ms"] == pytest.approx(1)
+    assert summary[PHASE_FRAME]["mean_ms"] == pytest.approx(3)
+    lines = frame_profiler.overlay_lines()
+    assert len(lines) == 5 # noqa: PLR2004
+    assert lines[-1].split() == [PHASE_FRAME, "3.00", "3.00", "3.00"]
+    assert frame_profiler
+    assert not NullProfiler()
+
+def test_dump(frame_profiler: FrameProfiler, tmp_path: pathlib.Path) -> None:
+    """Statistics are saved as JSON, or as CSV without the histograms."""
+    filename = tmp_path / "frames.json"
+    frame_profiler.dump(str(filename))
+    assert json.loads(filename.read_text()) == json.loads(
+            json.dumps(frame_profiler.summary()))
+
+    filename = tmp_path / "frames.CSV"
+    frame_profiler.dump(str(filename))
+    with open(filename, newline = "") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["phase"] for r in rows] == list(frame_profiler.summary())
+    assert float(rows[-1]["mean_ms"]) == pytest.approx(3)
+    assert "histogram" not in rows[0]
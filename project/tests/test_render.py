@@ -0,0 +1,111 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import random
+
+# Third party
+import pygame
+import pytest
+
+# First party
+from project.camera import Camera
+from project.checkerboard import Checkerboard
+from project.engine import Engine
+from project.simulation import greedy_agent
+
+WIDTH = 12
+HEIGHT = 10
+TILE_SIZE = 4
+
+def make_engine(seed: int) -> Engine:
+    """Engine drawing on an off-screen surface, with a checkerboard."""
+    screen = pygame.Surface((WIDTH * TILE_SIZE, HEIGHT * TILE_SIZE))
+    engine = Engine(WIDTH, HEIGHT, screen = screen, tile_size = TILE_SIZE)
+    engine.board.add_object(Checkerboard(HEIGHT, WIDTH))
+    engine.reset(seed)
+    return engine
+
+def pixels(engine: Engine, area: pygame.Rect | None = None) -> bytes:
+    """Content of the screen of an engine, or of an area of it."""
+    screen = engine.board._screen # noqa: SLF001
+    if area is not None:
+        screen = screen.subsurface(area)
+    return pygame.image.tobytes(screen, "RGB")
+
+def cells(engine: Engine) -> list[tuple[int, int]]:
+    """Cells of the snake, head first."""
+    return [(t.x, t.y) for t in engine.snake.tiles]
+
+def test_headless_board_tracks_nothing() -> None:
+    """A board without screen does not keep the cells it changed."""
+    engine = Engine(WIDTH, HEIGHT)
+    engine.reset(0)
+    assert not engine.board.track_changes
+    for _ in range(20):
+        if engine.step()[2]:
+            engine.reset()
+    assert engine.board.take_changes() == {}
+
+    engine.board.track_changes = True
+    engine.step()
+    assert engine.board.take_changes()
+
+def test_draw_dirty_one_move() -> None:
+    """After a move, only the new head, the previous head and the tail."""
+    engine = make_engine(3)
+    assert engine.board.track_changes
+    engine.board.draw()
+    before = cells(engine)
+    _, reward, done = engine.step()
+    assert reward == 0
+    assert not done
+    rects = engine.board.draw_dirty()
+
+    expected = {cells(engine)[0], before[0], before[-1]}
+    assert {(r.x // TILE_SIZE, r.y // TILE_SIZE) for r in rects} == expected
+    assert all(r.size == (TILE_SIZE, TILE_SIZE) for r in rects)
+    assert engine.board.draw_dirty() == [] # Nothing changed since
+
+def test_draw_dirty_like_full_draw() -> None:
+    """Drawing only the changed cells gives the same frames as redrawing."""
+    dirty, full = make_engine(7), make_engine(7)
+    dirty.board.draw()
+    rng = random.Random(0)
+    nb_games = 0
+    for _ in range(300):
+        action = greedy_agent(full, rng)
+        done = [dirty.step(action)[2], full.step(action)[2]]
+        assert done[0] == done[1]
+        if done[0]:
+            dirty.reset(nb_games)
+            full.reset(nb_games)
+            nb_games += 1
+        dirty.board.draw_dirty()
+        full.board.draw()
+        assert pixels(dirty) == pixels(full)
+
+@pytest.mark.parametrize("view", [(WIDTH, HEIGHT), (6, 5)])
+def test_array_renderer_like_full_draw(view: tuple[int, int]) -> None:
+    """The grid of colors gives the same frames as redrawing every tile."""
+    pytest.importorskip("numpy")
+    from project.array_renderer import ArrayRenderer # noqa: PLC0415
+
+    array, full = make_engine(11), make_engine(11)
+    cameras = [Camera(WIDTH, HEIGHT, *view), Camera(WIDTH, HEIGHT, *view)]
+    array.board.track_changes = False
+    area = pygame.Rect(0, 0, view[0] * TILE_SIZE, view[1] * TILE_SIZE)
+    screen = pygame.Surface(area.size) # The size of the view
+    renderer = ArrayRenderer(array.board, screen, TILE_SIZE, cameras[0])
+    assert array.board.track_changes # Needed by the renderer
+    rng = random.Random(1)
+    for i in range(300):
+        action = greedy_agent(full, rng)
+        done = [array.step(action)[2], full.step(action)[2]]
+        if done[0]:
+            array.reset(i)
+            full.reset(i)
+        for camera in cameras:
+            camera.follow(*cells(full)[0])
+        renderer.draw()
+        full.board.draw(cameras[1])
+        assert pygame.image.tobytes(screen, "RGB") == pixels(full, area)
@@ -0,0 +1,128 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import pathlib
+import sys
+
+# Third party
+import pytest
+
+# First party
+from project.cmd_line import (
+    MIN_HEIGHT,
+    MIN_WIDTH,
+    read_args,
+    read_replay_settings,
+)
+from project.dir import Dir
+from project.engine import Engine
+from project.exceptions import IntRangeError, ReplayError
+from project import main
+from project.replay import Replay, ReplayWriter, append_replay, load_replays
+from project.simulation import play_game, random_agent
+from project.snake import SK_START_LENGTH
+
+def record_game(seed: int, *, width: int = MIN_WIDTH,
+                height: int = MIN_HEIGHT,
+                gameover_on_exit: bool = False) -> Replay:
+    """Play a game with the random agent and return its replay."""
+    engine = Engine(width, height, gameover_on_exit = gameover_on_exit,
+                    record = True)
+    play_game(engine, random_agent, seed, 2000)
+    return engine.replay
+
+@pytest.mark.parametrize("seed", [0, 1, 2 ** 32])
+def test_bytes_round_trip(seed: int) -> None:
+    """Decoding an encoded replay gives it back."""
+    replay = record_game(seed, gameover_on_exit = seed % 2 == 1)
+    data = replay.to_bytes()
+    assert Replay.from_bytes(data) == replay
+    assert Replay.read(b"xx" + data, 2) == (replay, len(data) + 2)
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_play_again(seed: int) -> None:
+    """Playing a replay again gives the same score and number of ticks."""
+    replay = record_game(seed)
+    state = Replay.from_bytes(replay.to_bytes()).play()
+    assert state.score == replay.score
+    assert state.tick == replay.ticks
+
+def test_long_runs() -> None:
+    """Runs longer than a byte can hold are split and joined again."""
+    replay = Replay(seed = 5, width = 10, height = 10, start_length = 3)
+    for _ in range(1000):
+        replay.record(Dir.LEFT)
+    replay.record(Dir.UP)
+    assert Replay.from_bytes(replay.to_bytes()) == replay
+
+def test_corrupted() -> None:
+    """Truncated or foreign data is rejected."""
+    data = record_game(0).to_bytes()
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data[:-1])
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+
+def test_file_round_trip(tmp_path: pathlib.Path) -> None:
+    """Replays appended to a file are all loaded back, in order."""
+    filename = str(tmp_path / "games.snkr")
+    replays = [record_game(seed) for seed in range(5)]
+    for replay in replays:
+        append_replay(filename, replay)
+    assert load_replays(filename) == replays
+
+def test_writer_appends_in_order(tmp_path: pathlib.Path) -> None:
+    """Replays submitted to the writer are all appended by close, in order."""
+    filename = str(tmp_path / "games.snkr")
+    append_replay(filename, record_game(9))
+    replays = [record_game(9)] + [record_game(seed) for seed in range(5)]
+    writer = ReplayWriter(filename)
+    for replay in replays[1:]:
+        writer.submit(replay)
+    assert writer.close() == []
+    assert writer.error is None
+    assert load_replays(filename) == replays
+
+def test_writer_reports_unsaved(tmp_path: pathlib.Path) -> None:
+    """Closing the writer returns the replays it failed to append."""
+    replays = [record_game(seed) for seed in range(3)]
+    writer = ReplayWriter(str(tmp_path / "missing" / "games.snkr"))
+    for replay in replays:
+        writer.submit(replay)
+    assert writer.close() == replays
+    assert isinstance(writer.error, FileNotFoundError)
+
+def test_replay_empty_file(tmp_path: pathlib.Path,
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+    """A replay file without games is an error, not a game to play."""
+    filename = tmp_path / "games.snkr"
+    filename.touch()
+    monkeypatch.setattr(sys, "argv", ["snake", "--replay", str(filename)])
+    started = []
+    monkeypatch.setattr(main, "Game", lambda **kwargs: started.append(kwargs))
+    with pytest.raises(SystemExit):
+        main.main()
+    assert started == []
+
+def test_record_with_replay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A replayed game cannot be recorded."""
+    monkeypatch.setattr(sys, "argv", ["snake", "--record", "a.snkr",
+                                      "--replay", "b.snkr"])
+    with pytest.raises(SystemExit):
+        read_args()
+
+def test_replay_settings() -> None:
+    """Games replayed together must share valid board settings."""
+    replays = [record_game(0), record_game(1)]
+    assert read_replay_settings(replays) == (MIN_WIDTH, MIN_HEIGHT,
+                                             SK_START_LENGTH, False)
+    replays.append(record_game(2, width = MIN_WIDTH + 1))
+    with pytest.raises(ReplayError):
+        read_replay_settings(replays)
+    with pytest.raises(IntRangeError): # Board too narrow
+        read_replay_settings([Replay(seed = 0, width = MIN_WIDTH - 1,
+                                     height = MIN_HEIGHT, start_length = 3)])
+    with pytest.raises(IntRangeError): # Snake longer than half the board
+        read_replay_settings([Replay(seed = 0, width = MIN_WIDTH,
+                                     height = MIN_HEIGHT,
+                                     start_length = MIN_HEIGHT // 2 + 1)])
@@ -0,0 +1,195 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import json
+import os
+import pathlib
+import typing
+
+# Third party
+import pytest
+from schema import SchemaError
+
+# First party
+from project import score_store
+from project.exceptions import ScoreStoreError
+from project.score import Score
+from project.score_store import (
+    FileStore,
+    JsonStore,
+    SqliteStore,
+    YamlStore,
+    open_store,
+    write_atomic,
+)
+from project.scores import Scores
+
+EXTENSIONS = [".yaml", ".json", ".db"]
+
+def as_dict(scores: typing.Iterable[Score]) -> dict[str, int]:
+    """Scores by player name."""
+    return {s.name: s.score for s in scores}
+
+@pytest.fixture(params = EXTENSIONS)
+def filename(request: pytest.FixtureRequest, tmp_path: pathlib.Path) -> str:
+    """Name of a score file of each backend, not created yet."""
+    return str(tmp_path / f"scores{request.param}")
+
+def test_write_atomic_keeps_mode(tmp_path: pathlib.Path) -> None:
+    """Replacing a file keeps its permissions."""
+    filename = str(tmp_path / "scores.json")
+    write_atomic(filename, lambda f: f.write("{}"))
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(filename).st_mode & 0o777 == 0o666 & ~umask
+    os.chmod(filename, 0o640)
+    write_atomic(filename, lambda f: f.write("[]"))
+    assert os.stat(filename).st_mode & 0o777 == 0o640 # noqa: PLR2004
+    with open(filename) as f:
+        assert f.read() == "[]"
+    assert os.listdir(tmp_path) == ["scores.json"] # No temporary file left
+
+def test_write_atomic_failure(tmp_path: pathlib.Path) -> None:
+    """A failed write leaves the file as it was."""
+    filename = str(tmp_path / "scores.json")
+    write_atomic(filename, lambda f: f.write("{}"))
+
+    def fail(f: object) -> None:
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match = "disk full"):
+        write_atomic(filename, fail)
+    with open(filename) as f:
+        assert f.read() == "{}"
+    assert os.listdir(tmp_path) == ["scores.json"]
+
+def test_merge_keeps_best(filename: str) -> None:
+    """Merging keeps the best score of each player."""
+    store = open_store(filename)
+    assert not store.exists()
+    changed = store.merge([Score(score = 5, name = "amy"),
+                           Score(score = 3, name = "bob")], max_scores = 7)
+    assert as_dict(changed) == {"amy": 5, "bob": 3}
+    changed = store.merge([Score(score = 4, name = "amy"),
+                           Score(score = 6, name = "bob"),
+                           Score(score = 1, name = "cat")])
+    assert as_dict(changed) == {"bob": 6, "cat": 1}
+    assert store.merge([Score(score = 1, name = "amy")]) == []
+
+    max_scores, scores = open_store(filename).read()
+    assert max_scores == 7 # noqa: PLR2004 # Set when the store was created
+    assert as_dict(scores) == {"amy": 5, "bob": 6, "cat": 1}
+
+def test_merge_keeps_others(filename: str) -> None:
+    """Instances sharing a store do not lose the scores of each other."""
+    first, second = open_store(filename), open_store(filename)
+    first.merge([Score(score = 5, name = "amy")])
+    second.merge([Score(score = 3, name = "bob")])
+    first.merge([Score(score = 2, name = "cat")])
+    _, scores = open_store(filename).read()
+    assert as_dict(scores) == {"amy": 5, "bob": 3, "cat": 2}
+
+def test_refresh(filename: str) -> None:
+    """An instance only gets the scores changed by the others."""
+    first, second = open_store(filename), open_store(filename)
+    assert second.changes() == [] # No store yet
+    first.merge([Score(score = 5, name = "amy"),
+                 Score(score = 3, name = "bob")])
+    second.read()
+    assert second.changes() == []
+
+    first.merge([Score(score = 4, name = "bob"),
+                 Score(score = 1, name = "cat")])
+    assert as_dict(second.changes()) == {"bob": 4, "cat": 1}
+    assert second.changes() == [] # Nothing new since
+    assert first.changes() == [] # Its own changes
+
+    # A merge returns the changes of the others too
+    first.merge([Score(score = 9, name = "dan")])
+    changed = second.merge([Score(score = 2, name = "eve")])
+    assert as_dict(changed) == {"dan": 9, "eve": 2}
+
+@pytest.mark.parametrize("ext", [".yaml", ".json"])
+def test_refresh_validates_changes(tmp_path: pathlib.Path, ext: str) -> None:
+    """Scores changed in a file are validated, the known ones are not."""
+    filename = str(tmp_path / f"scores{ext}")
+    store = open_store(filename)
+    store.merge([Score(score = 5, name = "amy")])
+    assert isinstance(store, FileStore)
+
+    # Another instance writes a score with a name too long
+    data = {"max_scores": 5, "scores": [{"name": "amy", "score": 5},
+                                        {"name": "x" * 20, "score": 1}]}
+    with open(filename, "w") as f:
+        json.dump(data, f) # JSON is valid YAML
+    with pytest.raises(SchemaError):
+        store.changes()
+
+    data["scores"][1]["name"] = "bob"
+    with open(filename, "w") as f:
+        json.dump(data, f, indent = 2) # Not the same size
+    assert as_dict(store.changes()) == {"bob": 1}
+
+@pytest.mark.parametrize("ext", [".yaml", ".json"])
+def test_merge_validates_changes(tmp_path: pathlib.Path, ext: str,
+                                 monkeypatch: pytest.MonkeyPatch) -> None:
+    """Merging into a file only validates the scores changed by others."""
+    filename = str(tmp_path / f"scores{ext}")
+    first, second = open_store(filename), open_store(filename)
+    first.merge([Score(score = i, name = f"p{i}") for i in range(100)])
+    second.merge([Score(score = 1000, name = "amy")])
+
+    validated = []
+    validate = score_store.SCORE_SCHEMA.validate
+    monkeypatch.setattr(score_store.SCORE_SCHEMA, "validate",
+                        lambda item: validated.append(item) or validate(item))
+    changed = first.merge([Score(score = 200, name = "p1")])
+    assert as_dict(changed) == {"amy": 1000, "p1": 200}
+    assert validated == [{"name": "amy", "score": 1000}]
+
+    # Another instance writes a score with a name too long
+    with open(filename, "w") as f:
+        json.dump({"max_scores": 5,
+                   "scores": [{"name": "x" * 20, "score": 1}]}, f)
+    with pytest.raises(SchemaError):
+        first.merge([Score(score = 300, name = "p1")])
+
+def test_open_store() -> None:
+    """The backend is chosen by the file extension."""
+    assert type(open_store("a.yml")) is YamlStore
+    assert type(open_store("a.JSON")) is JsonStore
+    assert type(open_store("a.sqlite3")) is SqliteStore
+    with pytest.raises(ScoreStoreError):
+        open_store("a.txt")
+
+def test_queries(filename: str) -> None:
+    """High scores, scores and ranks of players are read from the store."""
+    store = open_store(filename)
+    with pytest.raises(FileNotFoundError):
+        store.read_top()
+    store.merge([Score(score = i % 7, name = f"p{i}") for i in range(50)],
+                max_scores = 3)
+    _, scores = store.read()
+    board = Scores(3, scores).leaderboard
+
+    store = open_store(filename)
+    max_scores, top = store.read_top()
+    assert max_scores == 3 # noqa: PLR2004
+    assert as_dict(top) == as_dict(board.top(3))
+    for name in ("p0", "p6", "p13", "p48"):
+        assert store.get(name) == board.get(name)
+        assert store.rank(name) == board.rank(name)
+    assert store.get("nobody") is None
+    assert store.rank("nobody") is None
+
+    # Only the changes made after the read are returned
+    other = open_store(filename)
+    other.merge([Score(score = 10, name = "p1")])
+    assert as_dict(store.changes()) == {"p1": 10}
+
+def test_load_high_scores(filename: str) -> None:
+    """The game only loads the high scores."""
+    open_store(filename).merge([Score(score = i, name = f"p{i}")
+                                for i in range(20)], max_scores = 4)
+    scores = Scores.load(filename)
+    assert [s.score for s in scores] == [19, 18, 17, 16]
@@ -0,0 +1,121 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import threading
+import typing
+
+# Third party
+import pytest
+
+# First party
+from project.score import Score
+from project.score_store import ScoreStore
+from project.scores import ScoresWriter
+
+# Long enough for the writer never to wake up by itself during a test
+REFRESH_PERIOD = 3600
+
+def as_dict(scores: typing.Iterable[Score]) -> dict[str, int]:
+    """Scores by player name."""
+    return {s.name: s.score for s in scores}
+
+class MemoryStore(ScoreStore):
+    """
+    Store keeping the scores in memory.
+
+    Its first merges fail, calling a hook just before failing the first time.
+    """
+
+    def __init__(self, fails: int = 0,
+                 on_fail: typing.Callable[[], None] | None = None) -> None:
+        """Object initialization."""
+        super().__init__("memory.json")
+        self.saved: dict[str, int] = {}
+        self.nb_merges = 0
+        self.fails = fails
+        self.on_fail = on_fail
+        self.failed = threading.Event() # Set once a merge failed
+
+    def read(self) -> tuple[int, list[Score]]:
+        """Read the saved scores."""
+        return 5, [Score(score = s, name = n) for n, s in self.saved.items()]
+
+    def _changes(self) -> list[Score]:
+        """Nothing changes behind the writer."""
+        return []
+
+    def merge(self, scores: typing.Iterable[Score],
+              max_scores: int = 5) -> list[Score]: # noqa: ARG002
+        """Save the best score of each player."""
+        self.nb_merges += 1
+        if self.nb_merges <= self.fails:
+            if self.on_fail is not None and not self.failed.is_set():
+                self.on_fail()
+            self.failed.set()
+            raise OSError("disk full")
+        changed = [s for s in scores
+                   if s.score > self.saved.get(s.name, s.score - 1)]
+        self.saved.update(as_dict(changed))
+        return changed
+
+def test_writer_saves_best_scores() -> None:
+    """Submitted scores are all saved by close, the best of each player."""
+    store = MemoryStore()
+    writer = ScoresWriter(store, refresh_period = REFRESH_PERIOD)
+    writer.submit(Score(score = 5, name = "amy"))
+    writer.submit(Score(score = 3, name = "amy"))
+    writer.submit(Score(score = 2, name = "bob"))
+    writer.submit(Score(score = 4, name = "bob"))
+    assert writer.close() == []
+    assert store.saved == {"amy": 5, "bob": 4}
+    assert as_dict(writer.take_update()) == store.saved
+    assert writer.take_update() == []
+
+def test_writer_close_without_scores() -> None:
+    """Closing a writer with nothing to save writes nothing."""
+    store = MemoryStore()
+    writer = ScoresWriter(store, refresh_period = REFRESH_PERIOD)
+    assert writer.close() == []
+    assert store.nb_merges == 0
+
+def test_writer_keeps_failed_scores() -> None:
+    """Scores that could not be saved are saved again at close."""
+    writer = None
+
+    def submit() -> None:
+        # Worse than the score being saved
+        writer.submit(Score(score = 3, name = "amy"))
+        writer.submit(Score(score = 2, name = "bob"))
+
+    store = MemoryStore(fails = 1, on_fail = submit)
+    writer = ScoresWriter(store, refresh_period = REFRESH_PERIOD)
+    writer.submit(Score(score = 5, name = "amy"))
+    assert store.failed.wait(5) # Close after the failure
+    assert writer.close() == []
+    assert store.nb_merges == 2 # noqa: PLR2004
+    assert store.saved == {"amy": 5, "bob": 2}
+
+def test_writer_closed_during_failed_merge() -> None:
+    """Closing while a merge fails still makes a last attempt."""
+    writer = None
+
+    def request_close() -> None:
+        with writer._cond: # noqa: SLF001 # What close() does first
+            writer._closed = True # noqa: SLF001
+
+    store = MemoryStore(fails = 1, on_fail = request_close)
+    writer = ScoresWriter(store, refresh_period = REFRESH_PERIOD)
+    writer.submit(Score(score = 5, name = "amy"))
+    assert store.failed.wait(5) # Close after the failure
+    assert writer.close() == []
+    assert store.saved == {"amy": 5}
+
+def test_writer_reports_unsaved(capsys: pytest.CaptureFixture) -> None:
+    """Closing the writer returns the scores it failed to save."""
+    store = MemoryStore(fails = 10)
+    writer = ScoresWriter(store, refresh_period = REFRESH_PERIOD)
+    writer.submit(Score(score = 5, name = "amy"))
+    assert store.failed.wait(5)
+    assert as_dict(writer.close()) == {"amy": 5}
+    assert store.nb_merges == 2 # noqa: PLR2004 # One last attempt at close
+    assert "disk full" in capsys.readouterr().out
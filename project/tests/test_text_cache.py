@@ -0,0 +1,42 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import typing
+
+# Third party
+import pygame
+import pytest
+
+# First party
+from project.text_cache import TextCache
+
+@pytest.fixture
+def font() -> typing.Iterator[pygame.font.Font]:
+    """Default font of pygame."""
+    pygame.font.init()
+    yield pygame.font.Font(None, 12)
+    pygame.font.quit()
+
+def test_render_once(font: pygame.font.Font) -> None:
+    """A text is rendered once, then served from the cache."""
+    cache = TextCache()
+    surface = cache.render(font, "amy", "red")
+    assert cache.render(font, "amy", pygame.Color("red")) is surface
+    assert cache.render(font, "amy", "blue") is not surface
+    assert cache.render(font, "amy", "red", antialias = False) is not surface
+    assert (cache.hits, cache.misses, len(cache)) == (1, 3, 3)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.render(font, "amy", "red") is not surface
+
+def test_least_recently_used_dropped(font: pygame.font.Font) -> None:
+    """A full cache drops the text rendered or used the longest ago."""
+    cache = TextCache(max_entries = 3)
+    surfaces = {t: cache.render(font, t, "red") for t in ("a", "b", "c")}
+    cache.render(font, "a", "red") # "b" is now the oldest
+    cache.render(font, "d", "red")
+    assert len(cache) == 3 # noqa: PLR2004
+    assert cache.render(font, "a", "red") is surfaces["a"]
+    assert cache.render(font, "c", "red") is surfaces["c"]
+    assert cache.render(font, "b", "red") is not surfaces["b"]
@@ -0,0 +1,34 @@
+# ruff: noqa: D100,S101,S311
+
+# Third party
+import pytest
+
+# First party
+from project.board import Board
+from project.constants import MAX_HEIGHT, MAX_WIDTH
+from project.dir import Dir
+from project.exceptions import IntRangeError
+from project.tile import Tile
+
+COLOR = "black"
+
+def test_hash_tells_lines_apart() -> None:
+    """Tiles of the widest boards hash differently, even one cell out."""
+    tiles = [Tile(x, y, COLOR) for y in (-1, 0, 1, MAX_HEIGHT - 1)
+             for x in (-1, 0, 1, MAX_WIDTH - 1, MAX_WIDTH)]
+    assert len({hash(t) for t in tiles}) == len(tiles)
+
+def test_moved_tile() -> None:
+    """Moving a tile gives an equal tile with the same color."""
+    tile = Tile(3, 4, COLOR) + Dir.LEFT
+    assert tile == Tile(2, 4, "white")
+    assert hash(tile) == hash(Tile(2, 4, "white"))
+    assert tile.color is COLOR
+    assert tile - Dir.LEFT == Tile(3, 4, COLOR)
+
+def test_board_width() -> None:
+    """Boards wider than the tile hashes allow are rejected."""
+    Board(screen = None, nb_lines = 12, nb_cols = MAX_WIDTH, tile_size = 0)
+    with pytest.raises(IntRangeError):
+        Board(screen = None, nb_lines = 12, nb_cols = MAX_WIDTH + 1,
+              tile_size = 0)
@@ -0,0 +1,103 @@
+# ruff: noqa: D100,S101,S311
+
+# Standard
+import random
+
+# Third party
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# First party
+from project.engine import Engine # noqa: E402
+from project.vector_env import ( # noqa: E402
+    ACTIONS,
+    BODY,
+    FRUIT,
+    HEAD,
+    VectorSnakeEnv,
+)
+
+WIDTH = 12
+HEIGHT = 10
+NB_GAMES = 4
+NB_STEPS = 500
+
+def load_game(env: VectorSnakeEnv, i: int, engine: Engine) -> None:
+    """Put the game of an engine in a slot of the environment."""
+    tiles = list(engine.snake.tiles) # Head first
+    n = len(tiles)
+    env._occ[i] = False
+    for k, tile in enumerate(tiles):
+        cell = tile.y * WIDTH + tile.x
+        env._body[i, n - 1 - k] = cell
+        env._occ[i, cell] = True
+    env._head_ptr[i] = n - 1
+    env._length[i] = n
+    env._hx[i], env._hy[i] = tiles[0].x, tiles[0].y
+    env._dir[i] = ACTIONS.index(engine.snake.dir)
+    env._ticks[i] = engine.state.tick
+    load_fruit(env, i, engine)
+
+def load_fruit(env: VectorSnakeEnv, i: int, engine: Engine) -> None:
+    """Put the fruit of an engine in a slot of the environment."""
+    x, y = engine.state.fruit
+    env._fruit[i] = y * WIDTH + x
+
+def board(engine: Engine) -> np.ndarray:
+    """Observation of the game of an engine, as the environment makes it."""
+    obs = np.zeros((HEIGHT, WIDTH), dtype = np.int8)
+    for tile in engine.snake.tiles:
+        obs[tile.y, tile.x] = BODY
+    x, y = engine.state.fruit
+    obs[y, x] = FRUIT
+    head = engine.snake.head
+    obs[head.y, head.x] = HEAD
+    return obs
+
+@pytest.mark.parametrize("gameover_on_exit", [False, True])
+@pytest.mark.parametrize("seed", [0, 1, 42])
+def test_step_parity(seed: int, gameover_on_exit: bool) -> None:
+    """Games stepped by the environment follow the rules of the engine."""
+    rng = random.Random(seed)
+    engines = [Engine(WIDTH, HEIGHT, gameover_on_exit = gameover_on_exit)
+               for _ in range(NB_GAMES)]
+    env = VectorSnakeEnv(NB_GAMES, WIDTH, HEIGHT,
+                         gameover_on_exit = gameover_on_exit)
+    env.reset(seed)
+    for i, engine in enumerate(engines):
+        engine.reset(seed * NB_GAMES + i)
+        load_game(env, i, engine)
+
+    nb_ended = nb_eaten = 0
+    for _ in range(NB_STEPS):
+        actions = np.array([rng.randrange(-3, len(ACTIONS))
+                            for _ in range(NB_GAMES)])
+        _, rewards, done = env.step(actions)
+        for i, engine in enumerate(engines):
+            action = ACTIONS[actions[i]] if actions[i] >= 0 else None
+            state, reward, engine_done = engine.step(action)
+            assert rewards[i] == reward
+            assert done[i] == engine_done
+            if engine_done:
+                assert env.final_scores[i] == state.score
+                assert env.final_ticks[i] == state.tick
+                nb_ended += 1
+                engine.reset()
+                load_game(env, i, engine)
+            elif reward > 0:
+                nb_eaten += 1
+                load_fruit(env, i, engine) # Fruits are drawn differently
+            assert env.scores[i] == engine.snake.score
+            assert (env.observe()[i] == board(engine)).all()
+
+    # Both kinds of ticks happened
+    assert nb_ended > 0
+    assert nb_eaten > 0
+
+def test_reset_same_seed() -> None:
+    """Resetting with the same seed gives the same games."""
+    env = VectorSnakeEnv(NB_GAMES, WIDTH, HEIGHT)
+    first = env.reset(7)
+    assert (env.reset(7) == first).all()
+    assert (env.scores == 0).all()